@@ -1,4 +1,3 @@
-import asyncio
 """
 Dataverse Web API authentication and client management.
 
@@ -6,15 +5,88 @@ Provides OAuth2 authentication using client credentials flow for service-to-serv
 authentication with Dataverse Web API.
 """
 
-from typing import Optional, Dict, Any, List
+import asyncio
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import AsyncIterator, Optional, Dict, Any, List
 import httpx
 from azure.identity import ClientSecretCredential
 
+from dataverse._client import get_dv_client
+from dataverse.client import SCHEMA_TTL_S
+from dataverse._json import loads
+from dataverse.auth import dv_token_async
 from utils.config import get_config
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Entities per EntityDefinitions page (odata.maxpagesize)
+ENTITY_DEFINITIONS_PAGE_SIZE = 500
+
+# EntityDefinitions properties used to build table summaries
+ENTITY_DEFINITION_FIELDS = "LogicalName,DisplayName,Description,IsCustomEntity"
+
+# Last single-page EntityDefinitions listing per org, revalidated with If-None-Match
+ENTITY_DEFINITIONS_CACHE_FILE = Path.home() / ".cache" / "life-cockpit" / "entitydefs.json"
+
+# Headers common to every Dataverse Web API call made here (all GETs, so no Content-Type)
+_HEADERS_BASE = MappingProxyType({
+    'Accept': 'application/json',
+    'OData-MaxVersion': '4.0',
+    'OData-Version': '4.0'
+})
+
+# In-process memo of get_entity_definitions, keyed by (dataverse_url, impersonate_user_id);
+# entries are (expires_at, tables) and live as long as the other table-list caches
+_entity_definitions: Dict[tuple, tuple] = {}
+
+
+def clear_entity_definitions_cache() -> None:
+    """Forget memoized table listings (--refresh-metadata)."""
+    _entity_definitions.clear()
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """The process-wide Dataverse client shared with dataverse.client (one connection pool)."""
+    return get_dv_client()
+
+
+@dataclass(slots=True)
+class TableSummary:
+    """One user table from EntityDefinitions"""
+    name: str
+    display_name: str
+    description: str
+    entity_type: str  # "Custom" or "Standard"
+
+
+def _read_definitions_cache() -> Dict[str, Any]:
+    try:
+        return loads(ENTITY_DEFINITIONS_CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_definitions_cache(dataverse_url: str, etag: str, tables: List[TableSummary]) -> None:
+    """Persist one org's listing and its ETag atomically; best effort."""
+    try:
+        data = _read_definitions_cache()
+        data[dataverse_url] = {"etag": etag, "tables": [asdict(t) for t in tables]}
+        ENTITY_DEFINITIONS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=ENTITY_DEFINITIONS_CACHE_FILE.parent, prefix=".entitydefs.", suffix=".tmp", delete=False
+        ) as tmp:
+            json.dump(data, tmp)
+        os.replace(tmp.name, ENTITY_DEFINITIONS_CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Could not write EntityDefinitions cache: {e}")
+
 
 class DataverseAuthManager:
     """Manages Dataverse Web API authentication and client creation."""
@@ -53,141 +125,139 @@ class DataverseAuthManager:
         return self._dataverse_url
     
     async def get_token(self, impersonate_user_id: Optional[str] = None) -> str:
-        """Get access token for Dataverse API."""
+        """Get access token for Dataverse API (the process-wide dataverse.auth token)."""
         try:
-            credential = self.get_credential()
-            dataverse_url = self.get_dataverse_url()
-            token_scope = f"{dataverse_url}/.default"
-            
-            logger.info(f"Using token scope: {token_scope}")
-            token = credential.get_token(token_scope)
+            token = await dv_token_async()
             
             if impersonate_user_id:
                 logger.info(f"Impersonating user: {impersonate_user_id}")
             
-            return token.token
+            return token
         except Exception as e:
             logger.error(f"Failed to get Dataverse token: {e}")
             raise
     
+    async def _headers(self, impersonate_user_id: Optional[str] = None) -> Dict[str, str]:
+        """Request headers with a (cached) bearer token and optional impersonation."""
+        headers = _HEADERS_BASE | {'Authorization': f'Bearer {await self.get_token(impersonate_user_id)}'}
+        if impersonate_user_id:
+            headers['MSCRMCallerID'] = impersonate_user_id
+        return headers
+    
     async def test_connection(self, impersonate_user_id: Optional[str] = None) -> bool:
         """Test Dataverse API connection using WhoAmI endpoint."""
         try:
-            token = await self.get_token(impersonate_user_id)
-            dataverse_url = self.get_dataverse_url()
-            api_url = f"{dataverse_url}/api/data/v9.2/WhoAmI"
-            
-            headers = {
-                'Authorization': f'Bearer {token}',
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'OData-MaxVersion': '4.0',
-                'OData-Version': '4.0'
-            }
-            
-            if impersonate_user_id:
-                headers['MSCRMCallerID'] = impersonate_user_id
+            headers = await self._headers(impersonate_user_id)
+            api_url = f"{self.get_dataverse_url()}/api/data/v9.2/WhoAmI"
             
             logger.info(f"Testing Dataverse connection: {api_url}")
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(api_url, headers=headers)
+            response = await _get_http_client().get(api_url, headers=headers, timeout=30.0)
+            
+            if response.status_code == 200:
+                data = loads(response.content)
+                user_id = data.get('UserId', 'Unknown')
+                business_unit_id = data.get('BusinessUnitId', 'Unknown')
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    user_id = data.get('UserId', 'Unknown')
-                    business_unit_id = data.get('BusinessUnitId', 'Unknown')
-                    
-                    logger.info("✅ Dataverse connection successful!")
-                    logger.info(f"   User ID: {user_id}")
-                    logger.info(f"   Business Unit ID: {business_unit_id}")
-                    return True
-                else:
-                    logger.error(f"Dataverse connection failed: {response.status_code} - {response.text}")
-                    return False
+                logger.info("✅ Dataverse connection successful!")
+                logger.info(f"   User ID: {user_id}")
+                logger.info(f"   Business Unit ID: {business_unit_id}")
+                return True
+            else:
+                logger.error(f"Dataverse connection failed: {response.status_code} - {response.text}")
+                return False
                     
         except Exception as e:
             logger.error(f"Dataverse connection test failed: {e}")
             return False
     
-    async def get_entity_definitions(self, impersonate_user_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get all entity definitions from Dataverse."""
+    @staticmethod
+    def _parse_entity(entity: Dict[str, Any]) -> Optional[TableSummary]:
+        """Convert an EntityDefinitions item to a table summary, or None for system entities."""
+        logical_name = entity.get('LogicalName') or ''
+        if not logical_name or logical_name.startswith('_'):
+            return None
+        return TableSummary(
+            logical_name,
+            ((entity.get('DisplayName') or {}).get('UserLocalizedLabel') or {}).get('Label') or '',
+            ((entity.get('Description') or {}).get('UserLocalizedLabel') or {}).get('Label') or '',
+            "Custom" if entity.get('IsCustomEntity') else "Standard",
+        )
+    
+    async def iter_entity_definitions(self, impersonate_user_id: Optional[str] = None) -> AsyncIterator[TableSummary]:
+        """Yield user entity definitions as each page arrives, following @odata.nextLink."""
+        headers = await self._headers(impersonate_user_id)
+        headers['Prefer'] = f'odata.maxpagesize={ENTITY_DEFINITIONS_PAGE_SIZE}'
+        dataverse_url = self.get_dataverse_url()
+        # Only the fields _parse_entity reads; private (system) entities are dropped server-side
+        api_url: Optional[str] = (
+            f"{dataverse_url}/api/data/v9.2/EntityDefinitions"
+            f"?$select={ENTITY_DEFINITION_FIELDS}&$filter=IsPrivate eq false"
+        )
+        
+        cached = _read_definitions_cache().get(dataverse_url) or {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        
+        client = _get_http_client()
+        first_page = True
+        logger.info(f"Calling Dataverse Web API: {api_url}")
+        pending: Optional[asyncio.Task] = asyncio.create_task(client.get(api_url, headers=headers))
         try:
-            token = await self.get_token(impersonate_user_id)
-            dataverse_url = self.get_dataverse_url()
-            api_url = f"{dataverse_url}/api/data/v9.2/EntityDefinitions"
-            
-            headers = {
-                'Authorization': f'Bearer {token}',
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'OData-MaxVersion': '4.0',
-                'OData-Version': '4.0',
-                'Prefer': 'return=representation,odata.include-annotations="*"'
-            }
-            
-            if impersonate_user_id:
-                headers['MSCRMCallerID'] = impersonate_user_id
-            
-            logger.info(f"Calling Dataverse Web API: {api_url}")
-            
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.get(api_url, headers=headers)
+            while pending is not None:
+                response = await pending
+                pending = None
+                
+                if response.status_code == 304 and first_page:
+                    logger.info("EntityDefinitions not modified; using cached listing")
+                    for table in cached.get('tables', []):
+                        yield TableSummary(**table)
+                    return
                 
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        entities = data.get('value', [])
-                        
-                        if not entities:
-                            logger.warning("No entities found in response")
-                            return []
-                        
-                        # Filter for user-created entities (not system entities)
-                        user_entities = []
-                        for entity in entities:
-                            try:
-                                logical_name = entity.get('LogicalName', '')
-                                if not logical_name or logical_name.startswith('_'):
-                                    continue
-                                    
-                                display_name_obj = entity.get('DisplayName', {})
-                                display_name = ''
-                                if isinstance(display_name_obj, dict):
-                                    user_label = display_name_obj.get('UserLocalizedLabel', {})
-                                    if isinstance(user_label, dict):
-                                        display_name = user_label.get('Label', '')
-                                
-                                description_obj = entity.get('Description', {})
-                                description = ''
-                                if isinstance(description_obj, dict):
-                                    desc_label = description_obj.get('UserLocalizedLabel', {})
-                                    if isinstance(desc_label, dict):
-                                        description = desc_label.get('Label', '')
-                                
-                                entity_type = "Custom" if entity.get('IsCustomEntity', False) else "Standard"
-                                
-                                user_entities.append({
-                                    "name": logical_name,
-                                    "display_name": display_name,
-                                    "description": description,
-                                    "entity_type": entity_type
-                                })
-                            except Exception as e:
-                                logger.warning(f"Error processing entity: {e}")
-                                continue
-                        
-                        logger.info(f"Found {len(user_entities)} user entities in Dataverse")
-                        return user_entities
-                        
-                    except Exception as e:
-                        logger.error(f"JSON parsing error: {e}")
-                        logger.error(f"Response length: {len(response.text)}")
-                        logger.error(f"Response preview: {response.text[:500]}")
-                        return []
-                else:
+                if response.status_code != 200:
                     logger.error(f"Dataverse API call failed: {response.status_code} - {response.text}")
-                    return []
+                    return
+                
+                # Reduce the page to small summaries and drop the raw body and parsed
+                # document before yielding, so only one page is ever held in full
+                etag = response.headers.get('ETag')
+                data = loads(response.content)
+                del response
+                api_url = data.get('@odata.nextLink')
+                headers.pop('If-None-Match', None)
+                if api_url:
+                    # Fetch the next page while this one is parsed and consumed
+                    logger.info(f"Calling Dataverse Web API: {api_url}")
+                    pending = asyncio.create_task(client.get(api_url, headers=headers))
+                tables = [t for entity in data.get('value', []) if (t := self._parse_entity(entity)) is not None]
+                del data
+                
+                # Only a complete single-page listing can be revalidated with one ETag
+                if first_page and not api_url and etag:
+                    _save_definitions_cache(dataverse_url, etag, tables)
+                first_page = False
+                
+                for table in tables:
+                    yield table
+        finally:
+            if pending is not None:
+                pending.cancel()
+    
+    async def get_entity_definitions(self, impersonate_user_id: Optional[str] = None) -> List[TableSummary]:
+        """Get all entity definitions from Dataverse."""
+        key = (self.get_dataverse_url(), impersonate_user_id)
+        cached = _entity_definitions.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return list(cached[1])
+        try:
+            user_entities = [table async for table in self.iter_entity_definitions(impersonate_user_id)]
+            if not user_entities:
+                logger.warning("No entities found in response")
+                return []
+            
+            logger.info(f"Found {len(user_entities)} user entities in Dataverse")
+            _entity_definitions[key] = (time.monotonic() + SCHEMA_TTL_S, user_entities)
+            return list(user_entities)
                     
         except Exception as e:
             logger.error(f"Failed to get Dataverse entity definitions: {e}")
@@ -6,9 +6,15 @@ Provides OAuth2 authentication using client credentials flow for service-to-serv
 authentication with Microsoft Graph API.
 """
 
+import time
+from functools import lru_cache
 from typing import Optional
+import httpx
 from azure.identity import ClientSecretCredential
-from msgraph import GraphServiceClient
+from kiota_authentication_azure.azure_identity_authentication_provider import AzureIdentityAuthenticationProvider
+from msgraph import GraphRequestAdapter, GraphServiceClient
+from msgraph.graph_request_adapter import options as graph_request_options
+from msgraph_core import GraphClientFactory
 
 from utils.config import get_config
 from utils.logger import get_logger
@@ -16,6 +22,13 @@ from utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+# How long a successful/failed connection probe is reused before re-probing
+CONNECTION_TTL_S = 60.0
+
+# Connection pool for the shared Graph HTTP client
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=16)
+
+
 class GraphAuthManager:
     """Manages Microsoft Graph API authentication and client creation."""
     
@@ -23,6 +36,9 @@ class GraphAuthManager:
         self.config = get_config()
         self._credential: Optional[ClientSecretCredential] = None
         self._client: Optional[GraphServiceClient] = None
+        self._connection_ok: Optional[bool] = None
+        self._connection_checked_at = 0.0
+        self._connection_lock = asyncio.Lock()
     
     def _create_credential(self) -> ClientSecretCredential:
         """Create Azure credential for authentication."""
@@ -38,22 +54,39 @@ class GraphAuthManager:
             logger.error(f"Failed to create Azure credential: {e}")
             raise
     
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client (with Graph middleware), closed on the shared loop at exit."""
+        from utils.aio import on_shutdown
+        
+        http_client = GraphClientFactory.create_with_default_middleware(
+            client=httpx.AsyncClient(limits=HTTP_LIMITS),
+            options=graph_request_options,
+        )
+        on_shutdown(http_client.aclose)
+        return http_client
+    
     def _create_client(self, credential: ClientSecretCredential) -> GraphServiceClient:
         """Create Graph service client with the provided credential."""
         try:
-            client = GraphServiceClient(credentials=credential)
+            auth_provider = AzureIdentityAuthenticationProvider(credential)
+            adapter = GraphRequestAdapter(auth_provider, client=self._create_http_client())
+            client = GraphServiceClient(request_adapter=adapter)
             logger.info("Graph service client created successfully")
             return client
         except Exception as e:
             logger.error(f"Failed to create Graph service client: {e}")
             raise
     
+    def get_credential(self) -> ClientSecretCredential:
+        """Get or create the Azure credential (no network access)."""
+        if self._credential is None:
+            self._credential = self._create_credential()
+        return self._credential
+    
     def get_client(self) -> GraphServiceClient:
         """Get or create Graph service client with authentication."""
         if self._client is None:
-            if self._credential is None:
-                self._credential = self._create_credential()
-            self._client = self._create_client(self._credential)
+            self._client = self._create_client(self.get_credential())
         return self._client
     
     async def test_basic_auth(self) -> bool:
@@ -132,6 +165,22 @@ class GraphAuthManager:
             logger.error(f"❌ Graph API connection failed with unexpected error: {e}")
             return False
     
+    async def ensure_connected(self) -> bool:
+        """
+        Return the cached connection probe result, probing Graph at most once per TTL.
+        
+        Concurrent callers share a single in-flight test_connection() call.
+        """
+        if self._connection_ok is not None and time.monotonic() - self._connection_checked_at < CONNECTION_TTL_S:
+            return self._connection_ok
+        async with self._connection_lock:
+            # Another coroutine may have refreshed the result while we waited
+            if self._connection_ok is not None and time.monotonic() - self._connection_checked_at < CONNECTION_TTL_S:
+                return self._connection_ok
+            self._connection_ok = await self.test_connection()
+            self._connection_checked_at = time.monotonic()
+            return self._connection_ok
+    
     async def get_current_user(self) -> Optional[dict]:
         """Get current user information (note: limited with client credentials flow)."""
         try:
@@ -158,9 +207,10 @@ class GraphAuthManager:
             client = self.get_client()
             
             # Get the credential to access token info
-            if self._credential:
+            credential = self.get_credential()
+            if credential:
                 # Try to get a fresh token
-                token = self._credential.get_token("https://graph.microsoft.com/.default")
+                token = credential.get_token("https://graph.microsoft.com/.default")
                 logger.info(f"✅ Token acquired successfully")
                 logger.info(f"   Token expires: {token.expires_on}")
                 
@@ -210,16 +260,10 @@ class GraphAuthManager:
             return False
 
 
-# Global instance for easy access
-_auth_manager: Optional[GraphAuthManager] = None
-
-
+@lru_cache(maxsize=1)
 def get_auth_manager() -> GraphAuthManager:
-    """Get the global authentication manager instance."""
-    global _auth_manager
-    if _auth_manager is None:
-        _auth_manager = GraphAuthManager()
-    return _auth_manager
+    """Get the global authentication manager instance (one per process)."""
+    return GraphAuthManager()
 
 
 async def test_graph_connection() -> bool:
@@ -267,4 +311,5 @@ async def main():
         logger.error('💡 Check your Azure credentials in .env file')
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    from utils.aio import run
+    run(main())
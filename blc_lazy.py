@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Lazy module loading for the Life Cockpit CLI.
+
+Defers executing heavy modules (Azure SDKs, httpx, Pydantic models) until one of
+their attributes is first accessed, so a CLI invocation only pays the import cost
+of the branch it actually runs.
+
+Set BLC_LAZY_EAGER=1 to import everything up front (fail-fast import errors for
+production workers).
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+from types import ModuleType
+
+
+def eager_imports() -> bool:
+    """Return True when lazy loading is disabled via BLC_LAZY_EAGER."""
+    return os.getenv("BLC_LAZY_EAGER", "").lower() in ("1", "true", "yes")
+
+
+def lazy_module(name: str) -> ModuleType:
+    """
+    Return module `name` without executing it until first attribute access.
+
+    Already-imported modules are returned as-is. The module is registered in
+    sys.modules immediately, so later `import name` statements share it.
+    """
+    if name in sys.modules or eager_imports():
+        return importlib.import_module(name)
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
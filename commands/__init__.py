@@ -0,0 +1,34 @@
+"""
+Life Cockpit CLI commands.
+
+Each module holds one top-level `blc.py` command; blc.COMMANDS maps command
+names to these modules so only the invoked command is imported.
+"""
+
+import functools
+
+# Shared console for rich output (the same one utils.cli reports errors on)
+from utils.cli import console
+
+
+def requires_graph(coro):
+    """
+    Decorate an async command helper that needs a connected Graph client.
+
+    Sets up logging, checks the connection (cached by ensure_connected()) and
+    exits with an error if it fails; the helper receives the auth manager as its
+    first argument.
+    """
+    @functools.wraps(coro)
+    async def wrapper(*args, **kwargs):
+        import typer
+        from auth.graph import get_auth_manager
+        from utils.logger import setup_logging
+        
+        setup_logging(log_level="INFO")
+        auth_manager = get_auth_manager()
+        if not await auth_manager.ensure_connected():
+            console.print("❌ [red]Graph API authentication failed![/red]")
+            raise typer.Exit(1)
+        return await coro(auth_manager, *args, **kwargs)
+    return wrapper
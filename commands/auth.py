@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Authentication management commands.
+"""
+
+import typer
+
+from auth.graph import get_auth_manager
+from commands import console
+from utils.cli import unknown_action
+from utils.logger import setup_logging
+
+
+async def _auth_test() -> None:
+    console.print("[bold]Testing Microsoft Graph API authentication...[/bold]")
+    auth_manager = get_auth_manager()
+    
+    # Test basic authentication
+    basic_success = await auth_manager.test_basic_auth()
+    if basic_success:
+        console.print("✅ [green]Basic authentication successful![/green]")
+        
+        # Test API access
+        api_success = await auth_manager.test_connection()
+        if api_success:
+            console.print("🎉 [green]Full authentication and API test completed successfully![/green]")
+        else:
+            console.print("⚠️ [yellow]Authentication works but API access needs permissions[/yellow]")
+    else:
+        console.print("❌ [red]Basic authentication failed![/red]")
+        raise typer.Exit(1)
+
+
+async def _auth_status() -> None:
+    console.print("[bold]Checking authentication status...[/bold]")
+    auth_manager = get_auth_manager()
+    
+    try:
+        # Get token info
+        credential = auth_manager.get_credential()
+        token = credential.get_token("https://graph.microsoft.com/.default")
+        
+        console.print(f"✅ [green]Token acquired successfully[/green]")
+        console.print(f"   Expires: {token.expires_on}")
+        console.print(f"   Scope: https://graph.microsoft.com/.default")
+        
+    except Exception as e:
+        console.print(f"❌ [red]Authentication error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+AUTH_ACTIONS = {
+    "test": _auth_test,
+    "status": _auth_status,
+}
+
+
+async def auth_cmd(
+    action: str = typer.Argument(..., help="Action to perform: test, status")
+):
+    """Authentication management commands."""
+    setup_logging(log_level="INFO")
+    
+    handler = AUTH_ACTIONS.get(action)
+    if handler is None:
+        unknown_action(action, AUTH_ACTIONS)
+    await handler()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Configuration inspection commands.
+"""
+
+import os
+
+import typer
+
+from commands import console
+
+
+def config_cmd(
+    action: str = typer.Argument(..., help="Action: check"),
+):
+    """Configuration inspection commands."""
+    from utils.config import load_config
+    load_config()  # ensure normalization
+    if action == "check":
+        console.print("[bold]Effective environment variables (sensitive values hidden):[/bold]")
+        def mask(val: str | None) -> str:
+            if not val:
+                return "<unset>"
+            return val[:3] + "***" if len(val) > 3 else "***"
+        pairs = [
+            ("AAD_CLIENT_ID", os.getenv("AAD_CLIENT_ID")),
+            ("AAD_TENANT_ID", os.getenv("AAD_TENANT_ID")),
+            ("AAD_CLIENT_SECRET", os.getenv("AAD_CLIENT_SECRET")),
+            ("AZURE_CLIENT_ID", os.getenv("AZURE_CLIENT_ID")),
+            ("AZURE_TENANT_ID", os.getenv("AZURE_TENANT_ID")),
+            ("AZURE_CLIENT_SECRET", os.getenv("AZURE_CLIENT_SECRET")),
+            ("DATAVERSE_URL", os.getenv("DATAVERSE_URL")),
+        ]
+        for k, v in pairs:
+            console.print(f"  {k}: {mask(v)}")
+    else:
+        console.print(f"[red]❌ Unknown action: {action}[/red]")
+        console.print("Available: check")
+        raise typer.Exit(1)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Basic Dataverse CRUD operations (`dataverse` and its `dv` alias).
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import typer
+
+from commands import console
+from utils.cli import unknown_action
+
+
+@lru_cache(maxsize=None)
+def _dv():
+    """Load config and import the Dataverse dev layer once per process."""
+    from utils.config import load_config
+    load_config()
+    
+    import dataverse.dev
+    return dataverse.dev
+
+
+async def _list_tables(as_user: Optional[str] = None) -> None:
+    """Print Dataverse tables as each API page arrives."""
+    from dataverse.list_tables import iter_dataverse_tables
+    
+    console.print("[bold]Listing Dataverse tables...[/bold]")
+    count = 0
+    async for table in iter_dataverse_tables(as_user):
+        console.print(f"  • {table.display_name} ({table.name})")
+        count += 1
+    if not count:
+        console.print("⚠️ [yellow]No tables found or connection failed[/yellow]")
+        raise typer.Exit(1)
+    console.print(f"📊 [green]Found {count} tables[/green]")
+
+
+@dataclass
+class DataverseArgs:
+    """Arguments shared by the dataverse operation handlers."""
+    logical_name: Optional[str] = None
+    record_id: Optional[str] = None
+    data_file: Optional[str] = None
+    select: Optional[str] = None
+    expand: Optional[str] = None
+    filter: Optional[str] = None
+    top: int = 10
+    count_only: bool = False
+    subject: Optional[str] = None
+    body_file: Optional[str] = None
+    template: Optional[str] = None
+    as_user: Optional[str] = None
+
+
+def _require(*values: Optional[str], message: str) -> None:
+    if not all(values):
+        console.print(f"[red]❌ {message}[/red]")
+        raise typer.Exit(1)
+
+
+def _load_json(path: str) -> dict:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+async def _entity_set(logical_name: str) -> str:
+    """Resolve a table's entity set; one metadata request also caches the usual suspects"""
+    dv = _dv()
+    await dv.warmup_entity_sets((*dv.WELL_KNOWN_TABLES, logical_name))
+    return await dv.entity_set(logical_name)
+
+
+async def _op_list(args: DataverseArgs) -> None:
+    await _list_tables(args.as_user)
+
+
+async def _op_probe(args: DataverseArgs) -> None:
+    results = await _dv().probe()
+    console.print("🔍 [bold]Dataverse Connection Probe:[/bold]")
+    for test, result in results.items():
+        console.print(f"   {test}: {result}")
+
+
+async def _op_whoami(args: DataverseArgs) -> None:
+    result = await _dv().whoami(args.as_user)
+    console.print(f"👤 [green]User Info:[/green]")
+    console.print(f"   User ID: {result.get('UserId')}")
+    console.print(f"   Business Unit ID: {result.get('BusinessUnitId')}")
+    console.print(f"   Organization ID: {result.get('OrganizationId')}")
+
+
+async def _op_all(args: DataverseArgs) -> None:
+    """Connection test, WhoAmI and table listing in one round of concurrent calls."""
+    from dataverse.list_tables import get_dataverse_tables, test_dataverse_connection
+    
+    connected, me, tables = await asyncio.gather(
+        test_dataverse_connection(args.as_user),
+        _dv().whoami(args.as_user),
+        get_dataverse_tables(args.as_user),
+        return_exceptions=True,
+    )
+    if connected is not True:
+        console.print("❌ [red]Dataverse connection failed[/red]")
+        raise typer.Exit(1)
+    console.print("✅ [green]Dataverse connection successful[/green]")
+    if isinstance(me, Exception):
+        console.print(f"⚠️ [yellow]WhoAmI failed: {me}[/yellow]")
+    else:
+        console.print(f"👤 User ID: {me.get('UserId')}")
+    if isinstance(tables, Exception) or not tables:
+        console.print("⚠️ [yellow]No tables found[/yellow]")
+    else:
+        console.print(f"📊 [green]Found {len(tables)} tables[/green]")
+
+
+async def _op_entity_def(args: DataverseArgs) -> None:
+    _require(args.logical_name, message="Logical name required")
+    result = await _dv().entity_def(args.logical_name)
+    console.print(f"📋 [green]Entity Definition for {args.logical_name}:[/green]")
+    console.print(f"   Entity Set: {result.get('EntitySetName')}")
+    console.print(f"   Primary ID: {result.get('PrimaryIdAttribute')}")
+    console.print(f"   Primary Name: {result.get('PrimaryNameAttribute')}")
+
+
+async def _op_get(args: DataverseArgs) -> None:
+    _require(args.logical_name, args.record_id, message="Logical name and record ID required")
+    result = await _dv().get(await _entity_set(args.logical_name), args.record_id, args.select, args.expand)
+    console.print(f"📄 [green]Record:[/green]")
+    console.print(json.dumps(result, indent=2))
+
+
+async def _op_query(args: DataverseArgs) -> None:
+    _require(args.logical_name, message="Logical name required")
+    result = await _dv().query(await _entity_set(args.logical_name), args.filter, args.select, args.top,
+                               count_only=args.count_only)
+    console.print(f"🔍 [green]Query Results:[/green]")
+    if args.count_only:
+        console.print(f"   Count: {result['@odata.count']:,}")
+        return
+    console.print(f"   Count: {result.get('@odata.count', 'unknown')}")
+    console.print(f"   Records: {len(result.get('value', []))}")
+    for record in result.get('value', []):
+        console.print(f"   • {record}")
+
+
+async def _op_create(args: DataverseArgs) -> None:
+    _require(args.logical_name, args.data_file, message="Logical name and data file required")
+    data = _load_json(args.data_file)
+    result = await _dv().create(await _entity_set(args.logical_name), data, impersonate=args.as_user)
+    console.print(f"✅ [green]Created record with ID: {result['id']}[/green]")
+
+
+async def _op_update(args: DataverseArgs) -> None:
+    _require(args.logical_name, args.record_id, args.data_file, message="Logical name, record ID, and data file required")
+    data = _load_json(args.data_file)
+    await _dv().update(await _entity_set(args.logical_name), args.record_id, data, impersonate=args.as_user)
+    console.print(f"✅ [green]Updated record {args.record_id}[/green]")
+
+
+async def _op_delete(args: DataverseArgs) -> None:
+    _require(args.logical_name, args.record_id, message="Logical name and record ID required")
+    await _dv().delete(await _entity_set(args.logical_name), args.record_id, impersonate=args.as_user)
+    console.print(f"✅ [green]Deleted record {args.record_id}[/green]")
+
+
+async def _op_note(args: DataverseArgs) -> None:
+    _require(args.logical_name, args.record_id, args.subject, message="Logical name, record ID, and subject required")
+
+    # Determine note body: template > body_file
+    if args.template:
+        try:
+            from utils.templates import load_template_by_name, render_template
+            ctx = {}
+            if args.data_file:
+                with open(args.data_file, 'r', encoding='utf-8') as df:
+                    ctx = json.load(df)
+            tmpl = load_template_by_name(args.template)
+            notetext = render_template(tmpl, ctx)
+        except Exception as e:
+            console.print(f"[red]❌ Template rendering failed: {e}[/red]")
+            raise typer.Exit(1)
+    else:
+        _require(args.body_file, message="Provide either --template or --body-file for note body")
+        with open(args.body_file, 'r', encoding='utf-8') as f:
+            notetext = f.read()
+
+    await _entity_set(args.logical_name)
+    result = await _dv().create_note(args.logical_name, args.record_id, args.subject, notetext, impersonate=args.as_user)
+    console.print(f"📝 [green]Created note with ID: {result['id']}[/green]")
+
+
+OPERATIONS = {
+    "list": _op_list,
+    "whoami": _op_whoami,
+    "entity-def": _op_entity_def,
+    "get": _op_get,
+    "query": _op_query,
+    "create": _op_create,
+    "update": _op_update,
+    "delete": _op_delete,
+    "note": _op_note,
+    "probe": _op_probe,
+    "all": _op_all,
+}
+
+
+async def dataverse_cmd(
+    operation: str = typer.Argument(..., help="Operation: list, whoami, entity-def, get, query, create, update, delete, note, probe, all"),
+    logical_name: Optional[str] = typer.Argument(None, help="Logical name"),
+    record_id: Optional[str] = typer.Argument(None, help="Record ID (GUID)"),
+    data_file: Optional[str] = typer.Option(None, "--data-file", help="JSON file with data"),
+    select: Optional[str] = typer.Option(None, "--select", help="OData $select"),
+    expand: Optional[str] = typer.Option(None, "--expand", help="OData $expand"),
+    filter: Optional[str] = typer.Option(None, "--filter", help="OData $filter"),
+    top: int = typer.Option(10, "--top", help="OData $top"),
+    count_only: bool = typer.Option(False, "--count-only", help="query: return only the matching row count"),
+    subject: Optional[str] = typer.Option(None, "--subject", help="Note subject"),
+    body_file: Optional[str] = typer.Option(None, "--body-file", help="Note body file"),
+    template: Optional[str] = typer.Option(None, "--template", help="Template name for note body (uses --data-file as context)"),
+    as_user: Optional[str] = typer.Option(None, "--as-user", help="Impersonate user (systemuserid)"),
+    refresh_metadata: bool = typer.Option(False, "--refresh-metadata", help="Clear cached entity metadata first"),
+):
+    """Basic Dataverse CRUD operations"""
+    handler = OPERATIONS.get(operation)
+    if handler is None:
+        unknown_action(operation, OPERATIONS, kind="operation")
+    if refresh_metadata:
+        _dv().clear_metadata_cache()
+    
+    await handler(DataverseArgs(
+        logical_name=logical_name,
+        record_id=record_id,
+        data_file=data_file,
+        select=select,
+        expand=expand,
+        filter=filter,
+        top=top,
+        count_only=count_only,
+        subject=subject,
+        body_file=body_file,
+        template=template,
+        as_user=as_user,
+    ))
+
+
+async def dv_cmd(
+    operation: str = typer.Argument(..., help="Alias of dataverse command"),
+    logical_name: Optional[str] = typer.Argument(None),
+    record_id: Optional[str] = typer.Argument(None),
+    data_file: Optional[str] = typer.Option(None, "--data-file"),
+    select: Optional[str] = typer.Option(None, "--select"),
+    expand: Optional[str] = typer.Option(None, "--expand"),
+    filter: Optional[str] = typer.Option(None, "--filter"),
+    top: int = typer.Option(10, "--top"),
+    count_only: bool = typer.Option(False, "--count-only"),
+    subject: Optional[str] = typer.Option(None, "--subject"),
+    body_file: Optional[str] = typer.Option(None, "--body-file"),
+    template: Optional[str] = typer.Option(None, "--template"),
+    as_user: Optional[str] = typer.Option(None, "--as-user"),
+    refresh_metadata: bool = typer.Option(False, "--refresh-metadata"),
+):
+    """Alias for dataverse command."""
+    return await dataverse_cmd(
+        operation=operation,
+        logical_name=logical_name,
+        record_id=record_id,
+        data_file=data_file,
+        select=select,
+        expand=expand,
+        filter=filter,
+        top=top,
+        count_only=count_only,
+        subject=subject,
+        body_file=body_file,
+        template=template,
+        as_user=as_user,
+        refresh_metadata=refresh_metadata,
+    )
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Azure Functions testing.
+"""
+
+import asyncio
+import functools
+import json
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import typer
+
+from blc_lazy import lazy_module
+from commands import console
+from utils.cli import unknown_action
+
+# Heavy Azure modules only execute when the action branch using them runs
+azure_functions = lazy_module("life_cockpit_azure.functions")
+azure_message_processor = lazy_module("life_cockpit_azure.message_processor")
+azure_dynamics_processor = lazy_module("life_cockpit_azure.dynamics_message_processor")
+
+
+# Actions that take input, mapped to their interactive prompts: (key, prompt, default)
+PROMPTS = {
+    "test-webhook": [("entity", "Entity type", "accounts"), ("operation", "Operation", "Create")],
+    "send-email": [("to", "Recipient email", None), ("subject", "Email subject", None), ("body", "Email body", None)],
+    "execute-task": [("task", "Task to execute", "daily_backup")],
+}
+
+
+def _prompt_params(action: str) -> Dict[str, Any]:
+    """Collect an action's inputs interactively."""
+    params = {}
+    for key, text, default in PROMPTS[action]:
+        params[key] = typer.prompt(text, default=default) if default is not None else typer.prompt(text)
+    return params
+
+
+def _missing_key(action: str, payload: Dict[str, Any]) -> Optional[str]:
+    """Return the first required input (one with no prompt default) absent from a payload."""
+    for key, _text, default in PROMPTS[action]:
+        if default is None and key not in payload:
+            return key
+    return None
+
+
+def _read_params(action: str, params: Optional[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Resolve the payload(s) for an input-taking action.
+    
+    --params wins; otherwise piped stdin is read as JSONL (one payload per line);
+    otherwise fall back to interactive prompts. Returns the valid payloads and an
+    error message for each rejected one, so one bad line doesn't sink the batch.
+    """
+    if params is None and sys.stdin.isatty():
+        return [_prompt_params(action)], []
+    
+    lines = [("--params", params)] if params is not None else [(f"line {n}", line) for n, line in enumerate(sys.stdin, 1)]
+    payloads, errors = [], []
+    for where, text in lines:
+        if not text.strip():
+            continue
+        try:
+            payload = json.loads(text)
+        except json.JSONDecodeError as e:
+            errors.append(f"{where}: invalid JSON payload: {e}")
+            continue
+        if not isinstance(payload, dict):
+            errors.append(f"{where}: payload must be a JSON object")
+            continue
+        missing = _missing_key(action, payload)
+        if missing is not None:
+            errors.append(f"{where}: missing required key '{missing}'")
+            continue
+        payloads.append(payload)
+    return payloads, errors
+
+
+async def _run_action(action: str, params: Dict[str, Any]) -> None:
+    """Run one input-taking action and print its outcome."""
+    from utils import create_run_id, Classification
+    manager = azure_functions.functions_manager
+    
+    if action == "test-webhook":
+        run_id = create_run_id("test-webhook", Classification.BUSINESS)
+        test_data = params.get("data", {"accountid": "test-123", "name": "Test Account"})
+        result = await manager.process_dataverse_webhook(
+            params.get("entity", "accounts"), params.get("operation", "Create"), test_data, run_id
+        )
+        label = "Webhook test completed"
+    elif action == "send-email":
+        run_id = create_run_id("send-email", Classification.BUSINESS)
+        result = await manager.send_email(params["to"], params["subject"], params["body"], run_id=run_id)
+        label = "Email test completed"
+    else:  # execute-task
+        run_id = create_run_id("execute-task", Classification.PERSONAL)
+        result = await manager.execute_scheduled_task(params.get("task", "daily_backup"), run_id)
+        label = "Task execution completed"
+    
+    console.print(f"✅ [green]{label}[/green]")
+    console.print(f"Run ID: {run_id}")
+    console.print(f"Result: {result}")
+
+
+async def _run_batch(action: str, params: Optional[str]) -> None:
+    """Run an input-taking action once per payload."""
+    payloads, errors = _read_params(action, params)
+    for error in errors:
+        console.print(f"❌ [red]{error}[/red]")
+    if not payloads and not errors:
+        console.print(f"❌ [red]No {action} payloads on stdin; pass --params or pipe JSONL[/red]")
+        raise typer.Exit(1)
+    
+    # Independent payloads run concurrently; one failure doesn't cancel the rest
+    results = await asyncio.gather(*(_run_action(action, p) for p in payloads), return_exceptions=True)
+    failures = [r for r in results if isinstance(r, BaseException)]
+    for error in failures:
+        console.print(f"❌ [red]{action} failed: {error}[/red]")
+    if failures or errors:
+        raise typer.Exit(1)
+
+
+async def _test_processor(label: str, processor_cli: Callable[[], Any], action: str, params: Optional[str]) -> None:
+    """Run a message processor's test pass and print its counts."""
+    console.print(f"[bold]Testing {label}...[/bold]")
+    result = await processor_cli().test_processing()
+    
+    if result.get('success', False):
+        console.print(f"✅ [green]{label.capitalize()} test completed[/green]")
+        console.print(f"Processed: {result.get('processed_count', 0)}")
+        console.print(f"Success: {result.get('success_count', 0)}")
+        console.print(f"Failed: {result.get('failed_count', 0)}")
+        console.print(f"Run ID: {result.get('run_id', 'N/A')}")
+    else:
+        console.print(f"⚠️ [yellow]{label.capitalize()} test requires approval[/yellow]")
+        console.print(f"Error: {result.get('error', 'Unknown error')}")
+        console.print(f"Run ID: {result.get('run_id', 'N/A')}")
+        console.print("Use 'python blc.py guardrails approve' to approve the operation")
+
+
+ACTIONS = {
+    **dict.fromkeys(PROMPTS, _run_batch),
+    "test-message-processor": functools.partial(
+        _test_processor, "message processor", lambda: azure_message_processor.message_processor_cli
+    ),
+    "test-dynamics-processor": functools.partial(
+        _test_processor, "Dynamics message processor", lambda: azure_dynamics_processor.dynamics_message_processor_cli
+    ),
+}
+
+
+async def functions_cmd(
+    action: str = typer.Argument(..., help="Action to perform: test-webhook, send-email, execute-task, test-message-processor, test-dynamics-processor"),
+    params: Optional[str] = typer.Option(None, "--params", help="JSON payload with the action inputs (skips prompts); pipe JSONL on stdin to run a batch"),
+):
+    """Azure Functions testing."""
+    handler = ACTIONS.get(action)
+    if handler is None:
+        unknown_action(action, ACTIONS)
+    
+    await handler(action, params)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Microsoft Graph API operations.
+"""
+
+import asyncio
+
+import typer
+
+from commands import console, requires_graph
+from utils.cli import unknown_action
+
+USERS_PREVIEW = 10
+USERS_PAGE_SIZE = 999  # Graph maximum for /users
+USER_FIELDS = ["displayName", "userPrincipalName"]
+ORG_FIELDS = ["id", "displayName", "businessPhones"]
+
+
+def _users_config(top: int):
+    """Request configuration for /users limited to `top` rows and the displayed fields."""
+    from kiota_abstractions.base_request_configuration import RequestConfiguration
+    from msgraph.generated.users.users_request_builder import UsersRequestBuilder
+    
+    return RequestConfiguration(
+        query_parameters=UsersRequestBuilder.UsersRequestBuilderGetQueryParameters(
+            top=top, select=USER_FIELDS
+        )
+    )
+
+
+async def iter_users(client, page_size: int = USERS_PAGE_SIZE):
+    """Yield every user, one page at a time, following @odata.nextLink."""
+    page = await client.users.get(request_configuration=_users_config(page_size))
+    while page:
+        for user in page.value or []:
+            yield user
+        if not page.odata_next_link:
+            break
+        page = await client.users.with_url(page.odata_next_link).get()
+
+
+async def fetch_users_preview(client, top: int = USERS_PREVIEW):
+    """
+    Fetch the first `top` users (only the displayed fields) and the tenant user count concurrently.
+
+    Returns (users, total); total is None when the count endpoint is unavailable.
+    """
+    from kiota_abstractions.base_request_configuration import RequestConfiguration
+    from msgraph.generated.users.count.count_request_builder import CountRequestBuilder
+
+    # $count is an advanced query and requires eventual consistency
+    count_config = RequestConfiguration(
+        query_parameters=CountRequestBuilder.CountRequestBuilderGetQueryParameters()
+    )
+    count_config.headers.add("ConsistencyLevel", "eventual")
+
+    page, total = await asyncio.gather(
+        client.users.get(request_configuration=_users_config(top)),
+        client.users.count.get(request_configuration=count_config),
+        return_exceptions=True,
+    )
+    if isinstance(page, BaseException):
+        raise page
+    users = page.value if page and page.value else []
+    return users, total if isinstance(total, int) else None
+
+
+@requires_graph
+async def _graph_users(auth_manager, all_users: bool = False):
+    console.print("[bold]Fetching users from Microsoft Graph...[/bold]")
+    
+    try:
+        client = auth_manager.get_client()
+        if all_users:
+            count = 0
+            async for user in iter_users(client):
+                console.print(f"  • {user.display_name} ({user.user_principal_name})")
+                count += 1
+            if count:
+                console.print(f"👥 [green]Found {count} users[/green]")
+            else:
+                console.print("⚠️ [yellow]No users found[/yellow]")
+            return
+        
+        users, total = await fetch_users_preview(client)
+        
+        if users:
+            console.print(f"👥 [green]Found {total if total is not None else len(users)} users:[/green]")
+            for user in users:
+                console.print(f"  • {user.display_name} ({user.user_principal_name})")
+            if total is not None and total > len(users):
+                console.print(f"  ... and {total - len(users)} more")
+        else:
+            console.print("⚠️ [yellow]No users found[/yellow]")
+            
+    except Exception as e:
+        console.print(f"❌ [red]Error fetching users: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@requires_graph
+async def _graph_org(auth_manager, **_):
+    console.print("[bold]Fetching organization info from Microsoft Graph...[/bold]")
+    
+    try:
+        from kiota_abstractions.base_request_configuration import RequestConfiguration
+        from msgraph.generated.organization.organization_request_builder import OrganizationRequestBuilder
+        
+        client = auth_manager.get_client()
+        org = await client.organization.get(request_configuration=RequestConfiguration(
+            query_parameters=OrganizationRequestBuilder.OrganizationRequestBuilderGetQueryParameters(
+                top=1, select=ORG_FIELDS
+            )
+        ))
+        
+        if org and org.value:
+            org_info = org.value[0]
+            name, org_id = org_info.display_name, org_info.id
+            phones = getattr(org_info, 'business_phones', None)
+            console.print(f"🏢 [green]Organization: {name}[/green]")
+            console.print(f"   ID: {org_id}")
+            if phones:
+                console.print(f"   Phone: {phones[0]}")
+        else:
+            console.print("⚠️ [yellow]No organization info found[/yellow]")
+            
+    except Exception as e:
+        console.print(f"❌ [red]Error fetching organization: {e}[/red]")
+        raise typer.Exit(1)
+
+
+GRAPH_ACTIONS = {
+    "users": _graph_users,
+    "org": _graph_org,
+}
+
+
+async def graph_cmd(
+    action: str = typer.Argument(..., help="Action to perform: users, org"),
+    all_users: bool = typer.Option(False, "--all", help="users: list every user instead of the first 10"),
+):
+    """Microsoft Graph API operations."""
+    handler = GRAPH_ACTIONS.get(action)
+    if handler is None:
+        unknown_action(action, GRAPH_ACTIONS)
+    await handler(all_users=all_users)
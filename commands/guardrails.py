@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Safety guardrails management.
+"""
+
+import typer
+
+from commands import console
+
+
+def guardrails_cmd(
+    action: str = typer.Argument(..., help="Action to perform: list, approve, status")
+):
+    """Safety guardrails management."""
+    
+    from utils.guardrails import list_runs, approve_run, get_run_status
+    
+    if action == "list":
+        console.print("[bold]Active Runs:[/bold]")
+        runs = list_runs()
+        
+        if not runs:
+            console.print("No active runs found")
+            return
+        
+        for run_id, run_data in runs.items():
+            status_color = "green" if run_data.get('status') == 'completed' else "yellow"
+            console.print(f"  • {run_id}")
+            console.print(f"    Operation: {run_data['operation']}")
+            console.print(f"    Classification: {run_data['classification']}")
+            console.print(f"    Status: [{status_color}]{run_data.get('status', 'unknown')}[/{status_color}]")
+            console.print(f"    Created: {run_data['created_at']}")
+            console.print()
+    
+    elif action == "approve":
+        run_id = typer.prompt("Enter run ID to approve")
+        success = approve_run(run_id)
+        
+        if success:
+            console.print(f"✅ [green]Run {run_id} approved[/green]")
+        else:
+            console.print(f"❌ [red]Failed to approve run {run_id}[/red]")
+    
+    elif action == "status":
+        run_id = typer.prompt("Enter run ID to check status")
+        status = get_run_status(run_id)
+        
+        if status:
+            console.print(f"[bold]Run Status: {run_id}[/bold]")
+            console.print(f"  Operation: {status['operation']}")
+            console.print(f"  Classification: {status['classification']}")
+            console.print(f"  Status: {status.get('status', 'unknown')}")
+            console.print(f"  Created: {status['created_at']}")
+            if 'completed_at' in status:
+                console.print(f"  Completed: {status['completed_at']}")
+        else:
+            console.print(f"❌ [red]Run {run_id} not found[/red]")
+    
+    else:
+        console.print(f"❌ [red]Unknown action: {action}[/red]")
+        console.print("Available actions: list, approve, status")
+        raise typer.Exit(1)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Logic Apps workflow management.
+"""
+
+import typer
+
+from commands import console
+
+
+async def logic_apps_cmd(
+    action: str = typer.Argument(..., help="Action to perform: list, create, delete")
+):
+    """Logic Apps workflow management."""
+    
+    from life_cockpit_azure.logic_apps import logic_apps_cli
+    
+    if action == "list":
+        console.print("[bold]Logic Apps Workflows:[/bold]")
+        workflows = await logic_apps_cli.list_workflows()
+        
+        if not workflows:
+            console.print("No Logic Apps workflows found")
+            return
+        
+        for workflow in workflows:
+            console.print(f"  • {workflow['name']}")
+            console.print(f"    State: {workflow['state']}")
+            console.print(f"    Location: {workflow['location']}")
+            console.print()
+    
+    elif action == "create":
+        workflow_type = typer.prompt("Workflow type", choices=["webhook", "email", "scheduled"])
+        name = typer.prompt("Workflow name")
+        function_url = typer.prompt("Azure Function URL")
+        
+        if workflow_type == "webhook":
+            result = await logic_apps_cli.create_webhook_listener(name, function_url)
+        elif workflow_type == "email":
+            result = await logic_apps_cli.create_email_automation(name, function_url)
+        elif workflow_type == "scheduled":
+            schedule = typer.prompt("Schedule (cron format)", default="0 0 * * *")
+            result = await logic_apps_cli.create_scheduled_task(name, function_url, schedule)
+        
+        console.print(f"✅ [green]Created Logic App: {name}[/green]")
+    
+    elif action == "delete":
+        name = typer.prompt("Workflow name to delete")
+        success = await logic_apps_cli.delete_workflow(name)
+        
+        if success:
+            console.print(f"✅ [green]Deleted Logic App: {name}[/green]")
+        else:
+            console.print(f"❌ [red]Failed to delete Logic App: {name}[/red]")
+    
+    else:
+        console.print(f"❌ [red]Unknown action: {action}[/red]")
+        console.print("Available actions: list, create, delete")
+        raise typer.Exit(1)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Local sandbox mode management.
+"""
+
+import os
+import tempfile
+
+import typer
+
+from commands import console
+from utils.sandbox import SANDBOX_ENV_FILE
+
+
+def _set_sandbox(flag: bool) -> None:
+    """Persist BLC_LOCAL_SANDBOX atomically, then mirror it into os.environ."""
+    value = "true" if flag else "false"
+    SANDBOX_ENV_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(
+        "w", dir=SANDBOX_ENV_FILE.parent, prefix=".sandbox.", suffix=".tmp", delete=False
+    )
+    try:
+        with tmp:
+            tmp.write(f"BLC_LOCAL_SANDBOX={value}\n")
+        os.replace(tmp.name, SANDBOX_ENV_FILE)
+    except Exception:
+        # Don't leave the half-written temp file behind in ~/.blc
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+        raise
+    os.environ["BLC_LOCAL_SANDBOX"] = value
+
+
+async def sandbox_cmd(
+    action: str = typer.Argument(..., help="Action to perform: enable, disable, reset, export, import")
+):
+    """Local sandbox mode management."""
+    
+    if action == "enable":
+        _set_sandbox(True)
+        console.print("✅ [green]Sandbox mode enabled[/green]")
+        console.print("All operations will use mock services")
+        return
+    
+    if action == "disable":
+        _set_sandbox(False)
+        console.print("✅ [green]Sandbox mode disabled[/green]")
+        console.print("All operations will use real services")
+        return
+    
+    from utils.sandbox import sandbox_manager
+    
+    if action == "reset":
+        await sandbox_manager.reset_data()
+        console.print("✅ [green]Sandbox data reset[/green]")
+    
+    elif action == "export":
+        filepath = typer.prompt("Export file path", default="sandbox_data.json")
+        await sandbox_manager.export_data(filepath)
+        console.print(f"✅ [green]Sandbox data exported to {filepath}[/green]")
+    
+    elif action == "import":
+        filepath = typer.prompt("Import file path")
+        await sandbox_manager.import_data(filepath)
+        console.print(f"✅ [green]Sandbox data imported from {filepath}[/green]")
+    
+    else:
+        console.print(f"❌ [red]Unknown action: {action}[/red]")
+        console.print("Available actions: enable, disable, reset, export, import")
+        raise typer.Exit(1)
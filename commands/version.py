@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Version command.
+"""
+
+from rich.panel import Panel
+
+from commands import console
+from utils.version import app_version
+
+
+def version_cmd():
+    """Show Life Cockpit version (rich output; `blc.py version` alone takes the fast path)."""
+    console.print(Panel(
+        f"[bold blue]Life Cockpit[/bold blue] v{app_version()}\n"
+        f"Microsoft 365 Automation Framework",
+        title="🚀 Life Cockpit"
+    ))
@@ -5,121 +5,174 @@ Create test scheduled messages for the dashboard
 
 import asyncio
 import os
+from dataclasses import dataclass, fields
 from datetime import datetime, timedelta
+from typing import Optional
 from utils.sandbox import get_sandbox_dataverse
 
+CREATE_CONCURRENCY = 10
+
+@dataclass(slots=True)
+class ScheduledMessage:
+    """One scheduled_messages row; channel-specific fields default to None"""
+    session_id: str
+    client_id: str
+    message_type: str
+    body: str
+    template: str
+    send_time: str
+    status: str
+    recipient: Optional[str] = None
+    subject: Optional[str] = None
+    channel_id: Optional[str] = None
+    chat_id: Optional[str] = None
+    
+    def as_record(self) -> dict:
+        """Record payload without the unset (None) fields"""
+        return {
+            f.name: value for f in fields(self)
+            if (value := getattr(self, f.name)) is not None
+        }
+
+async def create_records(dataverse, table_name, records):
+    """
+    Create records with one batch call; if the batch is rejected, fall back to
+    concurrent per-record creates (bounded by a semaphore) so valid rows still land.
+    Returns one result per record: the created record or the exception raised.
+    """
+    try:
+        return await dataverse.batch_create_records(table_name, records)
+    except Exception as e:
+        print(f"⚠️ Batch create failed ({e}), creating records individually...")
+    
+    sem = asyncio.Semaphore(CREATE_CONCURRENCY)
+    
+    async def _create(record):
+        async with sem:
+            return await dataverse.create_record(table_name, record)
+    
+    return await asyncio.gather(*(_create(r) for r in records), return_exceptions=True)
+
 async def create_test_messages():
     """Create test scheduled messages in sandbox"""
     
     # Initialize sandbox dataverse
     dataverse = get_sandbox_dataverse()
     
+    # One reference moment for every timestamp in this run
+    now = datetime.utcnow()
+    
+    def iso(hours: int = 0, minutes: int = 0) -> str:
+        return (now + timedelta(hours=hours, minutes=minutes)).isoformat()
+    
     # Test messages for different channels
     test_messages = [
         # Email messages
-        {
-            'session_id': 'session-email-1',
-            'client_id': 'client-1',
-            'message_type': 'email',
-            'recipient': 'client1@example.com',
-            'subject': 'Session Follow-up',
-            'body': 'Thank you for your session today. Here are your next steps...',
-            'template': 'session_followup',
-            'send_time': (datetime.utcnow() + timedelta(hours=1)).isoformat(),
-            'status': 'revised'
-        },
-        {
-            'session_id': 'session-email-2',
-            'client_id': 'client-2',
-            'message_type': 'email',
-            'recipient': 'client2@example.com',
-            'subject': 'Appointment Reminder',
-            'body': 'This is a reminder of your upcoming appointment tomorrow at 2 PM.',
-            'template': 'appointment_reminder',
-            'send_time': (datetime.utcnow() + timedelta(hours=2)).isoformat(),
-            'status': 'revised'
-        },
-        {
-            'session_id': 'session-email-3',
-            'client_id': 'client-3',
-            'message_type': 'email',
-            'recipient': 'client3@example.com',
-            'subject': 'Welcome to Our Service',
-            'body': 'Welcome! We\'re excited to have you on board.',
-            'template': 'welcome',
-            'send_time': datetime.utcnow().isoformat(),
-            'status': 'sent'
-        },
+        ScheduledMessage(
+            session_id='session-email-1',
+            client_id='client-1',
+            message_type='email',
+            recipient='client1@example.com',
+            subject='Session Follow-up',
+            body='Thank you for your session today. Here are your next steps...',
+            template='session_followup',
+            send_time=iso(1),
+            status='revised'
+        ),
+        ScheduledMessage(
+            session_id='session-email-2',
+            client_id='client-2',
+            message_type='email',
+            recipient='client2@example.com',
+            subject='Appointment Reminder',
+            body='This is a reminder of your upcoming appointment tomorrow at 2 PM.',
+            template='appointment_reminder',
+            send_time=iso(2),
+            status='revised'
+        ),
+        ScheduledMessage(
+            session_id='session-email-3',
+            client_id='client-3',
+            message_type='email',
+            recipient='client3@example.com',
+            subject='Welcome to Our Service',
+            body='Welcome! We\'re excited to have you on board.',
+            template='welcome',
+            send_time=iso(),
+            status='sent'
+        ),
         
         # SMS messages
-        {
-            'session_id': 'session-sms-1',
-            'client_id': 'client-4',
-            'message_type': 'sms',
-            'recipient': '+1234567890',
-            'body': 'Your appointment is confirmed for tomorrow at 2 PM.',
-            'template': 'sms_confirmation',
-            'send_time': (datetime.utcnow() + timedelta(hours=3)).isoformat(),
-            'status': 'revised'
-        },
-        {
-            'session_id': 'session-sms-2',
-            'client_id': 'client-5',
-            'message_type': 'sms',
-            'recipient': '+1987654321',
-            'body': 'Quick reminder: Your session starts in 30 minutes.',
-            'template': 'sms_reminder',
-            'send_time': datetime.utcnow().isoformat(),
-            'status': 'failed'
-        },
+        ScheduledMessage(
+            session_id='session-sms-1',
+            client_id='client-4',
+            message_type='sms',
+            recipient='+1234567890',
+            body='Your appointment is confirmed for tomorrow at 2 PM.',
+            template='sms_confirmation',
+            send_time=iso(3),
+            status='revised'
+        ),
+        ScheduledMessage(
+            session_id='session-sms-2',
+            client_id='client-5',
+            message_type='sms',
+            recipient='+1987654321',
+            body='Quick reminder: Your session starts in 30 minutes.',
+            template='sms_reminder',
+            send_time=iso(),
+            status='failed'
+        ),
         
         # Teams messages
-        {
-            'session_id': 'session-teams-1',
-            'client_id': 'client-6',
-            'message_type': 'teams',
-            'channel_id': 'general',
-            'body': 'New client onboarding completed. Please review the case.',
-            'template': 'teams_notification',
-            'send_time': (datetime.utcnow() + timedelta(minutes=30)).isoformat(),
-            'status': 'revised'
-        },
+        ScheduledMessage(
+            session_id='session-teams-1',
+            client_id='client-6',
+            message_type='teams',
+            channel_id='general',
+            body='New client onboarding completed. Please review the case.',
+            template='teams_notification',
+            send_time=iso(minutes=30),
+            status='revised'
+        ),
         
         # Telegram messages
-        {
-            'session_id': 'session-telegram-1',
-            'client_id': 'client-7',
-            'message_type': 'telegram',
-            'chat_id': '123456789',
-            'body': 'Your session notes are ready. Check your email for details.',
-            'template': 'telegram_notification',
-            'send_time': (datetime.utcnow() + timedelta(hours=4)).isoformat(),
-            'status': 'revised'
-        },
+        ScheduledMessage(
+            session_id='session-telegram-1',
+            client_id='client-7',
+            message_type='telegram',
+            chat_id='123456789',
+            body='Your session notes are ready. Check your email for details.',
+            template='telegram_notification',
+            send_time=iso(4),
+            status='revised'
+        ),
         
         # WhatsApp messages
-        {
-            'session_id': 'session-whatsapp-1',
-            'client_id': 'client-8',
-            'message_type': 'whatsapp',
-            'recipient': '+1555123456',
-            'body': 'Hi! Your appointment has been rescheduled to 3 PM today.',
-            'template': 'whatsapp_reschedule',
-            'send_time': (datetime.utcnow() + timedelta(hours=5)).isoformat(),
-            'status': 'revised'
-        }
+        ScheduledMessage(
+            session_id='session-whatsapp-1',
+            client_id='client-8',
+            message_type='whatsapp',
+            recipient='+1555123456',
+            body='Hi! Your appointment has been rescheduled to 3 PM today.',
+            template='whatsapp_reschedule',
+            send_time=iso(5),
+            status='revised'
+        )
     ]
     
     print("📨 Creating test scheduled messages...")
     
     created_count = 0
-    for message in test_messages:
-        try:
-            await dataverse.create_record('scheduled_messages', message)
-            created_count += 1
-            print(f"✅ Created {message['message_type']} message for {message.get('recipient', message.get('chat_id', 'N/A'))}")
-        except Exception as e:
-            print(f"❌ Failed to create message: {e}")
+    results = await create_records(
+        dataverse, 'scheduled_messages', [m.as_record() for m in test_messages]
+    )
+    for message, result in zip(test_messages, results):
+        if isinstance(result, Exception):
+            print(f"❌ Failed to create message: {result}")
+            continue
+        created_count += 1
+        print(f"✅ Created {message.message_type} message for {message.recipient or message.chat_id or 'N/A'}")
     
     print(f"\n🎉 Created {created_count} test messages!")
     
@@ -134,7 +187,7 @@ async def create_test_messages():
             'subject': 'Welcome to Our Service',
             'body': 'Welcome! We\'re excited to have you on board.',
             'status': 'sent',
-            'sent_at': datetime.utcnow().isoformat(),
+            'sent_at': iso(),
             'provider': 'graph',
             'message_id_external': 'graph_email_123456'
         },
@@ -144,7 +197,7 @@ async def create_test_messages():
             'recipient': '+1987654321',
             'body': 'Quick reminder: Your session starts in 30 minutes.',
             'status': 'failed',
-            'sent_at': datetime.utcnow().isoformat(),
+            'sent_at': iso(),
             'provider': 'respond',
             'message_id_external': 'respond_sms_789012',
             'error_message': 'Invalid phone number format'
@@ -152,16 +205,17 @@ async def create_test_messages():
     ]
     
     log_count = 0
-    for log in test_logs:
-        try:
-            await dataverse.create_record('messages_log', log)
-            log_count += 1
-            print(f"✅ Created log entry for {log['message_type']} message")
-        except Exception as e:
-            print(f"❌ Failed to create log: {e}")
+    results = await create_records(dataverse, 'messages_log', test_logs)
+    for log, result in zip(test_logs, results):
+        if isinstance(result, Exception):
+            print(f"❌ Failed to create log: {result}")
+            continue
+        log_count += 1
+        print(f"✅ Created log entry for {log['message_type']} message")
     
     print(f"\n🎉 Created {log_count} test log entries!")
     print("\n🚀 Ready to test the dashboard!")
 
 if __name__ == "__main__":
-    asyncio.run(create_test_messages())
+    from utils.aio import run
+    run(create_test_messages())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Shared async Dataverse HTTP client
+One pooled HTTP/2 AsyncClient per process, authenticated with the cached dv_token();
+DataverseClient, the DVPool leases and DataverseAuthManager all send through it
+"""
+import httpx
+
+from .auth import dv_token, dv_token_async
+
+DV_HEADERS = {
+    "OData-MaxVersion": "4.0",
+    "OData-Version": "4.0",
+    "Accept": "application/json",
+    "Prefer": 'odata.include-annotations="*"',
+}
+
+_client: httpx.AsyncClient | None = None
+
+class _DvTokenAuth(httpx.Auth):
+    """Attach the current (cached) Dataverse bearer token to every request"""
+    def sync_auth_flow(self, request: httpx.Request):
+        request.headers["Authorization"] = f"Bearer {dv_token()}"
+        yield request
+
+    async def async_auth_flow(self, request: httpx.Request):
+        # A token refresh must not block the event loop
+        request.headers["Authorization"] = f"Bearer {await dv_token_async()}"
+        yield request
+
+def get_dv_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        from utils.aio import on_shutdown
+        from .client import get_base_url
+        _client = httpx.AsyncClient(
+            base_url=get_base_url(),
+            headers=DV_HEADERS,
+            auth=_DvTokenAuth(),
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+        on_shutdown(close_dv_client)
+    return _client
+
+async def close_dv_client() -> None:
+    """Close the shared client (for shutdown/cleanup)"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
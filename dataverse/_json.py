@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Dataverse JSON codec
+orjson when installed (decodes response bytes directly), stdlib json otherwise
+"""
+import json
+from dataclasses import asdict, is_dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+def _json_default(value):
+    """Serialize datetimes like orjson's OPT_NAIVE_UTC | OPT_UTC_Z, and dataclasses as dicts"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat().replace("+00:00", "Z")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(payload: Any) -> str:
+    """Encode a request body (or any JSON-able value)"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z).decode()
+    return json.dumps(payload, default=_json_default)
+
+def loads(content: bytes) -> Any:
+    """Decode a response body from raw bytes"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
@@ -3,30 +3,54 @@
 Dataverse Authentication
 Simple azure-identity based token acquisition
 """
+import asyncio
 import os
+import threading
+import time
+from azure.core.credentials import AccessToken
 from azure.identity import ClientSecretCredential
 
-def dv_token() -> str:
-    """Get Dataverse access token"""
-    # Prefer AAD_*; fall back to AZURE_* for local compatibility
+TOKEN_REFRESH_MARGIN_S = 300  # refresh this long before expires_on
+
+_cred: ClientSecretCredential | None = None
+_scope: str = ""
+_token: AccessToken | None = None
+_lock = threading.Lock()
+
+def _resolve_env() -> tuple[str, str, str, str]:
+    """Resolve (tenant_id, client_id, client_secret, scope); prefer AAD_*, fall back to AZURE_*"""
     tenant_id = os.getenv("AAD_TENANT_ID") or os.getenv("AZURE_TENANT_ID")
     client_id = os.getenv("AAD_CLIENT_ID") or os.getenv("AZURE_CLIENT_ID")
     client_secret = os.getenv("AAD_CLIENT_SECRET") or os.getenv("AZURE_CLIENT_SECRET")
     if not (tenant_id and client_id and client_secret):
-        missing = [k for k, v in {
-            "AAD_TENANT_ID": os.getenv("AAD_TENANT_ID"),
-            "AAD_CLIENT_ID": os.getenv("AAD_CLIENT_ID"),
-            "AAD_CLIENT_SECRET": os.getenv("AAD_CLIENT_SECRET"),
-            "AZURE_TENANT_ID": os.getenv("AZURE_TENANT_ID"),
-            "AZURE_CLIENT_ID": os.getenv("AZURE_CLIENT_ID"),
-            "AZURE_CLIENT_SECRET": os.getenv("AZURE_CLIENT_SECRET"),
-        }.items() if v is None]
+        names = ("AAD_TENANT_ID", "AAD_CLIENT_ID", "AAD_CLIENT_SECRET",
+                 "AZURE_TENANT_ID", "AZURE_CLIENT_ID", "AZURE_CLIENT_SECRET")
+        missing = [k for k in names if os.getenv(k) is None]
         raise KeyError(f"Missing required AAD/AZURE env vars for Dataverse auth: {', '.join(missing)}")
+    scope = f"{os.environ['DATAVERSE_URL'].rstrip('/')}/.default"
+    return tenant_id, client_id, client_secret, scope
+
+def dv_token() -> str:
+    """Get Dataverse access token (credential and env resolved once, token cached until near expiry)"""
+    global _cred, _scope, _token
+    token = _token
+    if token is not None and time.time() < token.expires_on - TOKEN_REFRESH_MARGIN_S:
+        return token.token  # hot path: no lock, no env or scope work
+    with _lock:
+        if _cred is None:
+            tenant_id, client_id, client_secret, _scope = _resolve_env()
+            _cred = ClientSecretCredential(
+                tenant_id=tenant_id,
+                client_id=client_id,
+                client_secret=client_secret,
+            )
+        if _token is None or time.time() >= _token.expires_on - TOKEN_REFRESH_MARGIN_S:
+            _token = _cred.get_token(_scope)
+        return _token.token
 
-    cred = ClientSecretCredential(
-        tenant_id=tenant_id,
-        client_id=client_id,
-        client_secret=client_secret,
-    )
-    resource = os.environ["DATAVERSE_URL"].rstrip("/")
-    return cred.get_token(f"{resource}/.default").token
+async def dv_token_async() -> str:
+    """dv_token() for coroutines: a cached token returns at once, a refresh runs in a worker thread"""
+    token = _token
+    if token is not None and time.time() < token.expires_on - TOKEN_REFRESH_MARGIN_S:
+        return token.token
+    return await asyncio.to_thread(dv_token)
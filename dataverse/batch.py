@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Dataverse Batch Layer
+Package several Web API operations into one $batch (multipart/mixed) request
+"""
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from itertools import groupby
+
+from ._json import dumps, loads
+from .client import get_base_url, get_pool
+from .circuit_breaker import dataverse_breaker
+from .retry import with_retry
+
+MAX_BATCH_OPERATIONS = 1000  # Dataverse limit per $batch request
+
+Op = tuple[str, str, dict | None]  # (method, url relative to the Web API root, JSON body or None)
+
+def _http_part(method: str, url: str, payload: dict | None, content_id: int | None = None) -> str:
+    """Render one application/http part of a batch body"""
+    lines = ["Content-Type: application/http", "Content-Transfer-Encoding: binary"]
+    if content_id is not None:
+        lines.append(f"Content-ID: {content_id}")
+    lines += ["", f"{method} {url} HTTP/1.1"]
+    if payload is not None:
+        lines += ["Content-Type: application/json; type=entry", "", dumps(payload)]
+    else:
+        lines += ["Accept: application/json", ""]
+    return "\r\n".join(lines)
+
+def batch_body(ops: list[Op]) -> tuple[str, str]:
+    """Build a $batch body; returns (boundary, body)
+
+    GETs become standalone parts; each run of consecutive writes is wrapped in one
+    transactional changeset. Responses come back in the same order as ops.
+    """
+    base_url = get_base_url()
+    batch_boundary = f"batch_{uuid.uuid4()}"
+    parts: list[str] = []
+    for is_read, group in groupby(ops, key=lambda op: op[0] == "GET"):
+        if is_read:
+            for method, url, _ in group:
+                parts += [f"--{batch_boundary}", _http_part(method, f"{base_url}/{url}", None)]
+            continue
+        changeset_boundary = f"changeset_{uuid.uuid4()}"
+        parts += [f"--{batch_boundary}", f"Content-Type: multipart/mixed; boundary={changeset_boundary}", ""]
+        for content_id, (method, url, payload) in enumerate(group, start=1):
+            parts += [f"--{changeset_boundary}", _http_part(method, f"{base_url}/{url}", payload, content_id)]
+        parts.append(f"--{changeset_boundary}--")
+    parts += [f"--{batch_boundary}--", ""]
+    return batch_boundary, "\r\n".join(parts)
+
+def parse_batch_response(content_type: str, content: bytes) -> list[tuple[int, dict, bytes]]:
+    """Split a multipart $batch response into (status, headers, body) per operation"""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + content
+    )
+    results = []
+    for part in message.walk():
+        if part.get_content_type() != "application/http":
+            continue
+        raw = part.get_payload(decode=True) or b""
+        head, _, body = raw.partition(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("utf-8", "replace").split("\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip()] = value.strip()
+        results.append((status, headers, body.strip()))
+    return results
+
+def _entity_id(headers: dict) -> str:
+    """Extract the record GUID from an OData-EntityId header"""
+    oid = headers.get("OData-EntityId", "")
+    if oid.endswith(")"):
+        return oid[oid.rfind("(") + 1:-1]
+    return "unknown"
+
+def check_parts(parts: list[tuple[int, dict, bytes]]) -> list[tuple[int, dict, bytes]]:
+    """Raise on the first failed operation in a parsed $batch response"""
+    for status, _, body in parts:
+        if status >= 400:
+            raise RuntimeError(f"batch operation failed ({status}): {body.decode('utf-8', 'replace')}")
+    return parts
+
+async def _send(ops: list[Op], impersonate: str | None = None) -> list[tuple[int, dict, bytes]]:
+    """POST one $batch request over the pooled client and return its parsed parts"""
+    boundary, body = batch_body(ops)
+    async def _op():
+        async with get_pool(impersonate).acquire() as c:
+            r = await c.post(
+                "/$batch",
+                content=body.encode("utf-8"),
+                headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+            )
+        r.raise_for_status()
+        return parse_batch_response(r.headers["Content-Type"], r.content)
+    # A write changeset is retried only where the server cannot have committed it
+    return check_parts(await with_retry(_op, idempotent=all(method == "GET" for method, _, _ in ops)))
+
+def part_result(headers: dict, body: bytes) -> dict:
+    """JSON body of one operation; {"id": ...} for bodiless creates, {} otherwise"""
+    if body:
+        return loads(body)
+    if "OData-EntityId" in headers:
+        return {"id": _entity_id(headers)}
+    return {}
+
+@dataverse_breaker
+async def batch(ops: list[Op], *, impersonate: str | None = None) -> list[dict]:
+    """Run several operations in $batch requests of up to 1000; one result dict per op, in order"""
+    results: list[dict] = []
+    for start in range(0, len(ops), MAX_BATCH_OPERATIONS):
+        for _, headers, body in await _send(ops[start:start + MAX_BATCH_OPERATIONS], impersonate):
+            results.append(part_result(headers, body))
+    return results
+
+@dataverse_breaker
+async def batch_create_records(entity_set_name: str, records: list[dict], *,
+                               impersonate: str | None = None) -> list[dict]:
+    """Create records with one $batch request per 1000; each chunk is one transactional changeset"""
+    created: list[dict] = []
+    for start in range(0, len(records), MAX_BATCH_OPERATIONS):
+        ops = [("POST", entity_set_name, record) for record in records[start:start + MAX_BATCH_OPERATIONS]]
+        created += [{"id": _entity_id(headers)} for _, headers, _ in await _send(ops, impersonate)]
+    return created
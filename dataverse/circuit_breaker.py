@@ -4,10 +4,12 @@ Circuit Breaker for Dataverse calls
 """
 from __future__ import annotations
 
+import asyncio
+import functools
 import time
 from enum import Enum
 from typing import Callable, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 
 import httpx
 import structlog
@@ -19,49 +21,92 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"
 
 
+# Internal state codes; int compares are cheaper than Enum __eq__ on the per-call path
+_CLOSED, _OPEN, _HALF_OPEN = 0, 1, 2
+_STATES = (CircuitState.CLOSED, CircuitState.OPEN, CircuitState.HALF_OPEN)
+
+
+# Errors that count as a failed call
+TRIP_ERRORS = (httpx.HTTPError, asyncio.TimeoutError)
+
+_log = structlog.get_logger(__name__)
+
+
 class CircuitBreaker:
-    def __init__(self, failure_threshold: int = 5, recovery_timeout_s: int = 30):
+    def __init__(self, failure_threshold: int = 5, recovery_timeout_s: float = 30.0):
         self.failure_threshold = failure_threshold
-        self.recovery_timeout = timedelta(seconds=recovery_timeout_s)
+        self.recovery_timeout_s = float(recovery_timeout_s)
         self.failure_count = 0
-        self.last_failure_time: Optional[datetime] = None
-        self.state = CircuitState.CLOSED
-        self.logger = structlog.get_logger(__name__)
+        self._last_failure = 0.0  # time.monotonic() of the last failure, 0.0 if none
+        self._state = _CLOSED
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state as a CircuitState (for logging and inspection)"""
+        return _STATES[self._state]
+
+    @state.setter
+    def state(self, value: CircuitState) -> None:
+        self._state = _STATES.index(value)
+
+    @property
+    def last_failure_time(self) -> Optional[datetime]:
+        """Wall-clock time of the last failure (for logging only)"""
+        if not self._last_failure:
+            return None
+        return datetime.fromtimestamp(time.time() - (time.monotonic() - self._last_failure))
+
+    def _before_call(self) -> None:
+        """Fail fast while OPEN; move to HALF_OPEN once the recovery window has passed"""
+        if self._state == _OPEN:
+            if self._last_failure and time.monotonic() - self._last_failure >= self.recovery_timeout_s:
+                self._state = _HALF_OPEN
+                _log.info("dv_circuit_half_open")
+            else:
+                raise httpx.TransportError("Circuit OPEN - failing fast")
 
     def __call__(self, fn: Callable[..., Any]) -> Callable[..., Any]:
-        def wrapper(*args, **kwargs) -> Any:
-            now = datetime.now()
-            if self.state == CircuitState.OPEN:
-                if self.last_failure_time and now - self.last_failure_time >= self.recovery_timeout:
-                    self.state = CircuitState.HALF_OPEN
-                    self.logger.info("dv_circuit_half_open")
-                else:
-                    raise httpx.TransportError("Circuit OPEN - failing fast")
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def awrapper(*args, **kwargs) -> Any:
+                self._before_call()
+                try:
+                    result = await fn(*args, **kwargs)
+                except TRIP_ERRORS:
+                    self._on_failure()
+                    raise
+                self._on_success()
+                return result
 
+            return awrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs) -> Any:
+            self._before_call()
             try:
                 result = fn(*args, **kwargs)
-                self._on_success()
-                return result
-            except httpx.HTTPError as exc:
+            except TRIP_ERRORS:
                 self._on_failure()
                 raise
+            self._on_success()
+            return result
 
         return wrapper
 
     def _on_success(self) -> None:
-        if self.state != CircuitState.CLOSED:
-            self.logger.info("dv_circuit_closed")
-        self.state = CircuitState.CLOSED
+        if self._state != _CLOSED:
+            _log.info("dv_circuit_closed")
+            self._state = _CLOSED
         self.failure_count = 0
-        self.last_failure_time = None
+        self._last_failure = 0.0
 
     def _on_failure(self) -> None:
         self.failure_count += 1
-        self.last_failure_time = datetime.now()
+        self._last_failure = time.monotonic()
         if self.failure_count >= self.failure_threshold:
-            if self.state != CircuitState.OPEN:
-                self.logger.warning("dv_circuit_open", failures=self.failure_count)
-            self.state = CircuitState.OPEN
+            if self._state != _OPEN:
+                _log.warning("dv_circuit_open", failures=self.failure_count)
+            self._state = _OPEN
 
 
 # Singleton breaker for Dataverse
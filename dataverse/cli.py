@@ -4,489 +4,598 @@ Dataverse CLI Commands
 Command-line interface for Dataverse operations
 """
 
-import asyncio
+import sys
 import typer
-from typing import Optional
+from contextlib import aclosing
+from typing import AsyncIterator, Optional
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
 
-from dataverse.operations import dataverse_operations
+from dataverse._json import dumps
+from dataverse.operations import STREAM_PAGE_SIZE, ClientRow, get_operations
+from utils.aio import run
+from utils.cli import unknown_action
 
 console = Console()
 app = typer.Typer(name="dataverse", help="Dataverse operations")
 
+# Column layouts (header, style, width) for each result table. Columns whose cells
+# are already clipped by _truncate/_short_id/_timestamp get a fixed width, which
+# spares Rich from measuring every cell; width None columns are sized to content.
+TABLE_LIST_COLUMNS = (
+    ("Name", "cyan", None),
+    ("Display Name", "green", None),
+    ("Row Count", "yellow", None),
+    ("Custom", "magenta", 6),
+    ("Description", "white", 53),
+)
+SCHEMA_COLUMNS = (
+    ("Column", "cyan", None),
+    ("Type", "green", None),
+    ("Required", "yellow", 8),
+    ("Description", "white", 53),
+)
+CLIENT_COLUMNS = (
+    ("ID", "cyan", 11),
+    ("Type", "green", 7),
+    ("Name", "yellow", 33),
+    ("Email", "white", 28),
+    ("Phone", "magenta", 18),
+    ("Location", "blue", 23),
+)
+SESSION_COLUMNS = (
+    ("ID", "cyan", 11),
+    ("Subject", "yellow", 33),
+    ("Start Time", "green", 19),
+    ("End Time", "green", 19),
+    ("Status", "magenta", None),
+    ("Location", "blue", 23),
+)
+MESSAGE_COLUMNS = (
+    ("ID", "cyan", 11),
+    ("Client", "yellow", 23),
+    ("Email", "white", 28),
+    ("Subject", "green", 33),
+    ("Type", "magenta", None),
+    ("Status", "blue", None),
+    ("Scheduled", "cyan", 19),
+    ("Sent", "green", 4),
+)
+MESSAGE_LOG_COLUMNS = (
+    ("ID", "cyan", 11),
+    ("Message ID", "yellow", 11),
+    ("Type", "magenta", None),
+    ("Recipient", "white", 28),
+    ("Subject", "green", 33),
+    ("Provider", "blue", None),
+    ("Status", "cyan", None),
+    ("Created", "green", 19),
+)
+
+OUTPUT_FORMATS = ("table", "json", "ndjson")
+
+OUTPUT_OPTION = typer.Option("table", "--output", "-o", help="Output format: table, json, ndjson")
+
+def _check_output(output: str) -> None:
+    """Reject unknown --output values before any request is made"""
+    if output not in OUTPUT_FORMATS:
+        console.print(f"[red]❌ Unknown output format: {output}[/red]")
+        console.print(f"Available formats: {', '.join(OUTPUT_FORMATS)}")
+        raise typer.Exit(1)
+
+def _write_json(rows: list, output: str) -> None:
+    """Write rows straight to stdout, bypassing Rich: one JSON array, or one object per line"""
+    if output == "json":
+        sys.stdout.write(dumps(rows) + "\n")
+    else:
+        sys.stdout.write("".join(dumps(row) + "\n" for row in rows))
+
+async def _stream_ndjson(rows: AsyncIterator, limit: int) -> None:
+    """Write up to limit rows as NDJSON as they arrive, instead of after the last page"""
+    async with aclosing(rows):
+        count = 0
+        async for row in rows:
+            if count == limit:
+                break
+            sys.stdout.write(dumps(row) + "\n")
+            count += 1
+
+def _new_table(title: str, columns: tuple[tuple[str, str, Optional[int]], ...]) -> Table:
+    """Build an empty Rich table with the given column layout"""
+    table = Table(title=title)
+    for header, style, width in columns:
+        table.add_column(header, style=style, width=width, no_wrap=width is not None)
+    return table
+
 # ============================================================================
 # TABLE OPERATIONS
 # ============================================================================
 
+def _truncate(text: Optional[str], width: int = 50) -> str:
+    """Clip long values for table cells (None renders as empty)"""
+    text = text or ""
+    return text if len(text) <= width else text[:width] + "..."
+
+def _short_id(value) -> str:
+    """First 8 characters of an ID"""
+    return str(value or "")[:8] + "..."
+
+def _timestamp(value) -> str:
+    """ISO timestamp trimmed to seconds, or N/A"""
+    return str(value)[:19] if value else 'N/A'
+
+async def _tables_list(table_name: Optional[str]):
+    console.print("[bold blue]📋 Listing all tables...[/bold blue]")
+    
+    try:
+        tables = await get_operations().list_tables(include_counts=True)
+        
+        # Create table
+        table = _new_table("Dataverse Tables", TABLE_LIST_COLUMNS)
+        
+        rows = [
+            (t['name'], t['display_name'], str(t['row_count']),
+             "Yes" if t['is_custom'] else "No", _truncate(t['description']))
+            for t in tables
+        ]
+        for row in rows:
+            table.add_row(*row)
+        
+        console.print(table)
+        console.print(f"[green]✅ Found {len(tables)} tables[/green]")
+        
+    except Exception as e:
+        console.print(f"[red]❌ Error listing tables: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+async def _tables_schema(table_name: Optional[str]):
+    if not table_name:
+        console.print("[red]❌ Table name required for schema action[/red]")
+        raise typer.Exit(1)
+    
+    console.print(f"[bold blue]🔍 Getting schema for table: {table_name}[/bold blue]")
+    
+    try:
+        schema = await get_operations().get_table_schema(table_name)
+        
+        # Create table for columns
+        table = _new_table(f"Schema for {table_name}", SCHEMA_COLUMNS)
+        
+        columns = schema.get('columns', [])
+        rows = [
+            (c.get('name', ''), c.get('type', ''),
+             "Yes" if c.get('required', False) else "No", _truncate(c.get('description', '')))
+            for c in columns
+        ]
+        for row in rows:
+            table.add_row(*row)
+        
+        console.print(table)
+        console.print(f"[green]✅ Schema retrieved with {len(columns)} columns[/green]")
+        
+    except Exception as e:
+        console.print(f"[red]❌ Error getting schema: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+async def _tables_count(table_name: Optional[str]):
+    if not table_name:
+        console.print("[red]❌ Table name required for count action[/red]")
+        raise typer.Exit(1)
+    
+    console.print(f"[bold blue]📊 Getting row count for table: {table_name}[/bold blue]")
+    
+    try:
+        count = await get_operations().get_table_count(table_name)
+        console.print(f"[green]✅ Table {table_name} has {count:,} rows[/green]")
+        
+    except Exception as e:
+        console.print(f"[red]❌ Error getting count: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+_TABLES_ACTIONS = {
+    "list": _tables_list,
+    "schema": _tables_schema,
+    "count": _tables_count,
+}
+
 @app.command()
 def tables(
     action: str = typer.Argument(..., help="Action: list, schema, count"),
     table_name: Optional[str] = typer.Argument(None, help="Table name for schema/count")
 ):
     """Table discovery and schema operations"""
+    handler = _TABLES_ACTIONS.get(action)
+    if handler is None:
+        unknown_action(action, _TABLES_ACTIONS)
     
-    async def run_tables():
-        if action == "list":
-            console.print("[bold blue]📋 Listing all tables...[/bold blue]")
-            
-            try:
-                tables = await dataverse_operations.list_tables()
-                
-                # Create table
-                table = Table(title="Dataverse Tables")
-                table.add_column("Name", style="cyan")
-                table.add_column("Display Name", style="green")
-                table.add_column("Row Count", style="yellow")
-                table.add_column("Custom", style="magenta")
-                table.add_column("Description", style="white")
-                
-                for t in tables:
-                    table.add_row(
-                        t['name'],
-                        t['display_name'],
-                        str(t['row_count']),
-                        "Yes" if t['is_custom'] else "No",
-                        t['description'][:50] + "..." if len(t['description']) > 50 else t['description']
-                    )
-                
-                console.print(table)
-                console.print(f"[green]✅ Found {len(tables)} tables[/green]")
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error listing tables: {str(e)}[/red]")
-                raise typer.Exit(1)
+    run(handler(table_name))
+
+# ============================================================================
+# CLIENT OPERATIONS
+# ============================================================================
+
+def _client_row(client: ClientRow) -> tuple[str, ...]:
+    """Table cells for one client (account or contact)"""
+    location = f"{client.city or ''}, {client.state or ''}".strip(', ')
+    return (
+        _short_id(client.id),
+        client.type.title(),
+        _truncate(client.name, 30),
+        _truncate(client.email, 25),
+        _truncate(client.phone, 15),
+        _truncate(location, 20),
+    )
+
+def _render_client_table(title: str, clients: list[ClientRow]) -> None:
+    """Print clients (from list or search) as one table"""
+    table = _new_table(title, CLIENT_COLUMNS)
+    for client in clients:
+        table.add_row(*_client_row(client))
+    console.print(table)
+
+async def _clients_list(query: Optional[str], limit: int, output: str):
+    if output == "table":
+        console.print("[bold blue]👥 Listing clients...[/bold blue]")
+    
+    try:
+        clients = await get_operations().list_clients(limit=limit)
+        if output != "table":
+            return _write_json(clients, output)
         
-        elif action == "schema":
-            if not table_name:
-                console.print("[red]❌ Table name required for schema action[/red]")
-                raise typer.Exit(1)
-            
-            console.print(f"[bold blue]🔍 Getting schema for table: {table_name}[/bold blue]")
-            
-            try:
-                schema = await dataverse_operations.get_table_schema(table_name)
-                
-                # Create table for columns
-                table = Table(title=f"Schema for {table_name}")
-                table.add_column("Column", style="cyan")
-                table.add_column("Type", style="green")
-                table.add_column("Required", style="yellow")
-                table.add_column("Description", style="white")
-                
-                for column in schema.get('columns', []):
-                    table.add_row(
-                        column.get('name', ''),
-                        column.get('type', ''),
-                        "Yes" if column.get('required', False) else "No",
-                        column.get('description', '')[:50] + "..." if len(column.get('description', '')) > 50 else column.get('description', '')
-                    )
-                
-                console.print(table)
-                console.print(f"[green]✅ Schema retrieved with {len(schema.get('columns', []))} columns[/green]")
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error getting schema: {str(e)}[/red]")
-                raise typer.Exit(1)
+        _render_client_table(f"Clients (showing {len(clients)})", clients)
+        console.print(f"[green]✅ Found {len(clients)} clients[/green]")
+    
+    except Exception as e:
+        console.print(f"[red]❌ Error listing clients: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+async def _clients_search(query: Optional[str], limit: int, output: str):
+    if not query:
+        console.print("[red]❌ Search query required[/red]")
+        raise typer.Exit(1)
+    
+    if output == "table":
+        console.print(f"[bold blue]🔍 Searching clients for: {query}[/bold blue]")
+    
+    try:
+        results = await get_operations().search_clients(query, limit=limit)
+        if output != "table":
+            return _write_json(results, output)
         
-        elif action == "count":
-            if not table_name:
-                console.print("[red]❌ Table name required for count action[/red]")
-                raise typer.Exit(1)
-            
-            console.print(f"[bold blue]📊 Getting row count for table: {table_name}[/bold blue]")
-            
-            try:
-                count = await dataverse_operations.get_table_count(table_name)
-                console.print(f"[green]✅ Table {table_name} has {count:,} rows[/green]")
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error getting count: {str(e)}[/red]")
-                raise typer.Exit(1)
+        _render_client_table(f"Search Results for '{query}' (showing {len(results)})", results)
+        console.print(f"[green]✅ Found {len(results)} matching clients[/green]")
+    
+    except Exception as e:
+        console.print(f"[red]❌ Error searching clients: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+async def _clients_details(query: Optional[str], limit: int, output: str):
+    if not query:
+        console.print("[red]❌ Client ID required[/red]")
+        raise typer.Exit(1)
+    
+    console.print(f"[bold blue]👤 Getting client details for: {query}[/bold blue]")
+    
+    try:
+        client = await get_operations().get_client_details(query)
         
+        if client:
+            # Create detailed view
+            data = client['data']
+            client_type = client['type'].title()
+            name = data.get('name') or f"{data.get('firstname', '')} {data.get('lastname', '')}".strip()
+            
+            panel = Panel(
+                f"[bold]{client_type} Details[/bold]\n\n"
+                f"ID: {data.get('accountid') or data.get('contactid')}\n"
+                f"Name: {name}\n"
+                f"Email: {data.get('emailaddress1', 'N/A')}\n"
+                f"Phone: {data.get('telephone1', 'N/A')}\n"
+                f"Address: {data.get('address1_line1', 'N/A')}\n"
+                f"City: {data.get('address1_city', 'N/A')}\n"
+                f"State: {data.get('address1_stateorprovince', 'N/A')}\n"
+                f"Status: {data.get('statuscode', 'N/A')}\n"
+                f"Created: {data.get('createdon', 'N/A')}\n"
+                f"Modified: {data.get('modifiedon', 'N/A')}",
+                title=f"{client_type} Information",
+                border_style="green"
+            )
+            console.print(panel)
         else:
-            console.print(f"[red]❌ Unknown action: {action}[/red]")
-            console.print("Available actions: list, schema, count")
-            raise typer.Exit(1)
+            console.print(f"[yellow]⚠️ Client not found: {query}[/yellow]")
     
-    asyncio.run(run_tables())
+    except Exception as e:
+        console.print(f"[red]❌ Error getting client details: {str(e)}[/red]")
+        raise typer.Exit(1)
 
-# ============================================================================
-# CLIENT OPERATIONS
-# ============================================================================
+async def _clients_stats(query: Optional[str], limit: int, output: str):
+    console.print("[bold blue]📊 Getting client statistics...[/bold blue]")
+    
+    try:
+        stats = await get_operations().get_client_statistics()
+        
+        # Create statistics panel
+        panel = Panel(
+            f"[bold]Client Statistics[/bold]\n\n"
+            f"Total Clients: {stats['total_clients']:,}\n"
+            f"Total Accounts: {stats['total_accounts']:,}\n"
+            f"Total Contacts: {stats['total_contacts']:,}\n\n"
+            f"[bold]Account Statuses:[/bold]\n" + 
+            "\n".join([f"  {status}: {count:,}" for status, count in stats['account_statuses'].items()]) + "\n\n"
+            f"[bold]Contact Statuses:[/bold]\n" + 
+            "\n".join([f"  {status}: {count:,}" for status, count in stats['contact_statuses'].items()]),
+            title="Client Analytics",
+            border_style="blue"
+        )
+        console.print(panel)
+    
+    except Exception as e:
+        console.print(f"[red]❌ Error getting client statistics: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+_CLIENTS_ACTIONS = {
+    "list": _clients_list,
+    "search": _clients_search,
+    "details": _clients_details,
+    "stats": _clients_stats,
+}
 
 @app.command()
 def clients(
     action: str = typer.Argument(..., help="Action: list, search, details, stats"),
     query: Optional[str] = typer.Argument(None, help="Search query or client ID"),
-    limit: int = typer.Option(50, "--limit", "-l", help="Limit results")
+    limit: int = typer.Option(50, "--limit", "-l", help="Limit results"),
+    output: str = OUTPUT_OPTION
 ):
     """Client/Contact operations"""
+    _check_output(output)
     
-    async def run_clients():
-        if action == "list":
-            console.print("[bold blue]👥 Listing clients...[/bold blue]")
-            
-            try:
-                clients = await dataverse_operations.list_clients(limit=limit)
-                
-                # Create table
-                table = Table(title=f"Clients (showing {len(clients)})")
-                table.add_column("ID", style="cyan")
-                table.add_column("Type", style="green")
-                table.add_column("Name", style="yellow")
-                table.add_column("Email", style="white")
-                table.add_column("Phone", style="magenta")
-                table.add_column("Location", style="blue")
-                
-                for client in clients:
-                    location = f"{client.get('city', '')}, {client.get('state', '')}".strip(', ')
-                    table.add_row(
-                        client['id'][:8] + "...",
-                        client['type'].title(),
-                        client['name'][:30] + "..." if len(client['name']) > 30 else client['name'],
-                        client.get('email', '')[:25] + "..." if len(client.get('email', '')) > 25 else client.get('email', ''),
-                        client.get('phone', '')[:15] + "..." if len(client.get('phone', '')) > 15 else client.get('phone', ''),
-                        location[:20] + "..." if len(location) > 20 else location
-                    )
-                
-                console.print(table)
-                console.print(f"[green]✅ Found {len(clients)} clients[/green]")
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error listing clients: {str(e)}[/red]")
-                raise typer.Exit(1)
+    handler = _CLIENTS_ACTIONS.get(action)
+    if handler is None:
+        unknown_action(action, _CLIENTS_ACTIONS)
+    
+    run(handler(query, limit, output))
+
+# ============================================================================
+# SESSION OPERATIONS
+# ============================================================================
+
+def _session_row(session: dict) -> tuple[str, ...]:
+    """Table cells for one appointment"""
+    return (
+        _short_id(session.get('appointmentid')),
+        _truncate(session.get('subject'), 30),
+        _timestamp(session.get('starttime')),
+        _timestamp(session.get('endtime')),
+        str(session.get('statuscode', 'N/A')),
+        _truncate(session.get('location'), 20),
+    )
+
+async def _sessions_list(session_id: Optional[str], limit: int, output: str):
+    if output == "table":
+        console.print("[bold blue]📅 Listing sessions...[/bold blue]")
+    
+    try:
+        if output == "ndjson":
+            return await _stream_ndjson(
+                get_operations().stream_sessions(page_size=min(limit, STREAM_PAGE_SIZE)), limit)
+        sessions = await get_operations().list_sessions(limit=limit)
+        if output != "table":
+            return _write_json(sessions, output)
         
-        elif action == "search":
-            if not query:
-                console.print("[red]❌ Search query required[/red]")
-                raise typer.Exit(1)
-            
-            console.print(f"[bold blue]🔍 Searching clients for: {query}[/bold blue]")
-            
-            try:
-                results = await dataverse_operations.search_clients(query, limit=limit)
-                
-                # Create table
-                table = Table(title=f"Search Results for '{query}' (showing {len(results)})")
-                table.add_column("ID", style="cyan")
-                table.add_column("Type", style="green")
-                table.add_column("Name", style="yellow")
-                table.add_column("Email", style="white")
-                table.add_column("Phone", style="magenta")
-                table.add_column("Location", style="blue")
-                
-                for client in results:
-                    location = f"{client.get('city', '')}, {client.get('state', '')}".strip(', ')
-                    table.add_row(
-                        client['id'][:8] + "...",
-                        client['type'].title(),
-                        client['name'][:30] + "..." if len(client['name']) > 30 else client['name'],
-                        client.get('email', '')[:25] + "..." if len(client.get('email', '')) > 25 else client.get('email', ''),
-                        client.get('phone', '')[:15] + "..." if len(client.get('phone', '')) > 15 else client.get('phone', ''),
-                        location[:20] + "..." if len(location) > 20 else location
-                    )
-                
-                console.print(table)
-                console.print(f"[green]✅ Found {len(results)} matching clients[/green]")
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error searching clients: {str(e)}[/red]")
-                raise typer.Exit(1)
+        # Create table
+        table = _new_table(f"Sessions (showing {len(sessions)})", SESSION_COLUMNS)
         
-        elif action == "details":
-            if not query:
-                console.print("[red]❌ Client ID required[/red]")
-                raise typer.Exit(1)
-            
-            console.print(f"[bold blue]👤 Getting client details for: {query}[/bold blue]")
-            
-            try:
-                client = await dataverse_operations.get_client_details(query)
-                
-                if client:
-                    # Create detailed view
-                    data = client['data']
-                    client_type = client['type'].title()
-                    
-                    panel = Panel(
-                        f"[bold]{client_type} Details[/bold]\n\n"
-                        f"ID: {data.get('accountid') or data.get('contactid')}\n"
-                        f"Name: {data.get('name') or f'{data.get('firstname', '')} {data.get('lastname', '')}'.strip()}\n"
-                        f"Email: {data.get('emailaddress1', 'N/A')}\n"
-                        f"Phone: {data.get('telephone1', 'N/A')}\n"
-                        f"Address: {data.get('address1_line1', 'N/A')}\n"
-                        f"City: {data.get('address1_city', 'N/A')}\n"
-                        f"State: {data.get('address1_stateorprovince', 'N/A')}\n"
-                        f"Status: {data.get('statuscode', 'N/A')}\n"
-                        f"Created: {data.get('createdon', 'N/A')}\n"
-                        f"Modified: {data.get('modifiedon', 'N/A')}",
-                        title=f"{client_type} Information",
-                        border_style="green"
-                    )
-                    console.print(panel)
-                else:
-                    console.print(f"[yellow]⚠️ Client not found: {query}[/yellow]")
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error getting client details: {str(e)}[/red]")
-                raise typer.Exit(1)
+        for session in sessions:
+            table.add_row(*_session_row(session))
         
-        elif action == "stats":
-            console.print("[bold blue]📊 Getting client statistics...[/bold blue]")
-            
-            try:
-                stats = await dataverse_operations.get_client_statistics()
-                
-                # Create statistics panel
-                panel = Panel(
-                    f"[bold]Client Statistics[/bold]\n\n"
-                    f"Total Clients: {stats['total_clients']:,}\n"
-                    f"Total Accounts: {stats['total_accounts']:,}\n"
-                    f"Total Contacts: {stats['total_contacts']:,}\n\n"
-                    f"[bold]Account Statuses:[/bold]\n" + 
-                    "\n".join([f"  {status}: {count:,}" for status, count in stats['account_statuses'].items()]) + "\n\n"
-                    f"[bold]Contact Statuses:[/bold]\n" + 
-                    "\n".join([f"  {status}: {count:,}" for status, count in stats['contact_statuses'].items()]),
-                    title="Client Analytics",
-                    border_style="blue"
-                )
-                console.print(panel)
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error getting client statistics: {str(e)}[/red]")
-                raise typer.Exit(1)
+        console.print(table)
+        console.print(f"[green]✅ Found {len(sessions)} sessions[/green]")
+    
+    except Exception as e:
+        console.print(f"[red]❌ Error listing sessions: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+async def _sessions_details(session_id: Optional[str], limit: int, output: str):
+    if not session_id:
+        console.print("[red]❌ Session ID required[/red]")
+        raise typer.Exit(1)
+    
+    console.print(f"[bold blue]📅 Getting session details for: {session_id}[/bold blue]")
+    
+    try:
+        session = await get_operations().get_session_details(session_id)
         
+        if session:
+            # Create detailed view
+            panel = Panel(
+                f"[bold]Session Details[/bold]\n\n"
+                f"ID: {session.get('appointmentid')}\n"
+                f"Subject: {session.get('subject', 'N/A')}\n"
+                f"Start Time: {session.get('starttime', 'N/A')}\n"
+                f"End Time: {session.get('endtime', 'N/A')}\n"
+                f"Status: {session.get('statuscode', 'N/A')}\n"
+                f"Location: {session.get('location', 'N/A')}\n"
+                f"Description: {session.get('description', 'N/A')[:100]}...\n"
+                f"Created: {session.get('createdon', 'N/A')}\n"
+                f"Modified: {session.get('modifiedon', 'N/A')}",
+                title="Session Information",
+                border_style="green"
+            )
+            console.print(panel)
         else:
-            console.print(f"[red]❌ Unknown action: {action}[/red]")
-            console.print("Available actions: list, search, details, stats")
-            raise typer.Exit(1)
+            console.print(f"[yellow]⚠️ Session not found: {session_id}[/yellow]")
     
-    asyncio.run(run_clients())
+    except Exception as e:
+        console.print(f"[red]❌ Error getting session details: {str(e)}[/red]")
+        raise typer.Exit(1)
 
-# ============================================================================
-# SESSION OPERATIONS
-# ============================================================================
+async def _sessions_stats(session_id: Optional[str], limit: int, output: str):
+    console.print("[bold blue]📊 Getting session statistics...[/bold blue]")
+    
+    try:
+        stats = await get_operations().get_session_statistics()
+        
+        # Create statistics panel
+        panel = Panel(
+            f"[bold]Session Statistics[/bold]\n\n"
+            f"Total Sessions: {stats['total_sessions']:,}\n"
+            f"Recent Sessions (2024): {stats['recent_sessions']:,}\n\n"
+            f"[bold]Status Breakdown:[/bold]\n" + 
+            "\n".join([f"  {status}: {count:,}" for status, count in stats['status_breakdown'].items()]),
+            title="Session Analytics",
+            border_style="blue"
+        )
+        console.print(panel)
+    
+    except Exception as e:
+        console.print(f"[red]❌ Error getting session statistics: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+_SESSIONS_ACTIONS = {
+    "list": _sessions_list,
+    "details": _sessions_details,
+    "stats": _sessions_stats,
+}
 
 @app.command()
 def sessions(
     action: str = typer.Argument(..., help="Action: list, details, stats"),
     session_id: Optional[str] = typer.Argument(None, help="Session ID for details"),
-    limit: int = typer.Option(50, "--limit", "-l", help="Limit results")
+    limit: int = typer.Option(50, "--limit", "-l", help="Limit results"),
+    output: str = OUTPUT_OPTION
 ):
     """Session/Appointment operations"""
+    _check_output(output)
     
-    async def run_sessions():
-        if action == "list":
-            console.print("[bold blue]📅 Listing sessions...[/bold blue]")
-            
-            try:
-                sessions = await dataverse_operations.list_sessions(limit=limit)
-                
-                # Create table
-                table = Table(title=f"Sessions (showing {len(sessions)})")
-                table.add_column("ID", style="cyan")
-                table.add_column("Subject", style="yellow")
-                table.add_column("Start Time", style="green")
-                table.add_column("End Time", style="green")
-                table.add_column("Status", style="magenta")
-                table.add_column("Location", style="blue")
-                
-                for session in sessions:
-                    table.add_row(
-                        session['appointmentid'][:8] + "...",
-                        session.get('subject', '')[:30] + "..." if len(session.get('subject', '')) > 30 else session.get('subject', ''),
-                        str(session.get('starttime', ''))[:19] if session.get('starttime') else 'N/A',
-                        str(session.get('endtime', ''))[:19] if session.get('endtime') else 'N/A',
-                        str(session.get('statuscode', 'N/A')),
-                        session.get('location', '')[:20] + "..." if len(session.get('location', '')) > 20 else session.get('location', '')
-                    )
-                
-                console.print(table)
-                console.print(f"[green]✅ Found {len(sessions)} sessions[/green]")
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error listing sessions: {str(e)}[/red]")
-                raise typer.Exit(1)
-        
-        elif action == "details":
-            if not session_id:
-                console.print("[red]❌ Session ID required[/red]")
-                raise typer.Exit(1)
-            
-            console.print(f"[bold blue]📅 Getting session details for: {session_id}[/bold blue]")
-            
-            try:
-                session = await dataverse_operations.get_session_details(session_id)
-                
-                if session:
-                    # Create detailed view
-                    panel = Panel(
-                        f"[bold]Session Details[/bold]\n\n"
-                        f"ID: {session.get('appointmentid')}\n"
-                        f"Subject: {session.get('subject', 'N/A')}\n"
-                        f"Start Time: {session.get('starttime', 'N/A')}\n"
-                        f"End Time: {session.get('endtime', 'N/A')}\n"
-                        f"Status: {session.get('statuscode', 'N/A')}\n"
-                        f"Location: {session.get('location', 'N/A')}\n"
-                        f"Description: {session.get('description', 'N/A')[:100]}...\n"
-                        f"Created: {session.get('createdon', 'N/A')}\n"
-                        f"Modified: {session.get('modifiedon', 'N/A')}",
-                        title="Session Information",
-                        border_style="green"
-                    )
-                    console.print(panel)
-                else:
-                    console.print(f"[yellow]⚠️ Session not found: {session_id}[/yellow]")
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error getting session details: {str(e)}[/red]")
-                raise typer.Exit(1)
-        
-        elif action == "stats":
-            console.print("[bold blue]📊 Getting session statistics...[/bold blue]")
-            
-            try:
-                stats = await dataverse_operations.get_session_statistics()
-                
-                # Create statistics panel
-                panel = Panel(
-                    f"[bold]Session Statistics[/bold]\n\n"
-                    f"Total Sessions: {stats['total_sessions']:,}\n"
-                    f"Recent Sessions (2024): {stats['recent_sessions']:,}\n\n"
-                    f"[bold]Status Breakdown:[/bold]\n" + 
-                    "\n".join([f"  {status}: {count:,}" for status, count in stats['status_breakdown'].items()]),
-                    title="Session Analytics",
-                    border_style="blue"
-                )
-                console.print(panel)
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error getting session statistics: {str(e)}[/red]")
-                raise typer.Exit(1)
-        
-        else:
-            console.print(f"[red]❌ Unknown action: {action}[/red]")
-            console.print("Available actions: list, details, stats")
-            raise typer.Exit(1)
+    handler = _SESSIONS_ACTIONS.get(action)
+    if handler is None:
+        unknown_action(action, _SESSIONS_ACTIONS)
     
-    asyncio.run(run_sessions())
+    run(handler(session_id, limit, output))
 
 # ============================================================================
 # MESSAGE OPERATIONS
 # ============================================================================
 
+def _message_row(message: dict) -> tuple[str, ...]:
+    """Table cells for one scheduled message"""
+    return (
+        _short_id(message.get('MessageID')),
+        _truncate(message.get('ClientName'), 20),
+        _truncate(message.get('Email'), 25),
+        _truncate(message.get('MessageSubject'), 30),
+        message.get('MessageType', 'N/A'),
+        str(message.get('MessageStatus', 'N/A')),
+        _timestamp(message.get('ScheduledTimestamp')),
+        "Yes" if message.get('Sent') else "No",
+    )
+
+def _log_row(log: dict) -> tuple[str, ...]:
+    """Table cells for one message log entry"""
+    return (
+        _short_id(log.get('id')),
+        _short_id(log.get('message_id')),
+        log.get('message_type', 'N/A'),
+        _truncate(log.get('recipient'), 25),
+        _truncate(log.get('subject'), 30),
+        log.get('provider', 'N/A'),
+        log.get('status', 'N/A'),
+        _timestamp(log.get('created_at')),
+    )
+
+async def _messages_list(limit: int, output: str):
+    if output == "table":
+        console.print("[bold blue]📧 Listing scheduled messages...[/bold blue]")
+    
+    try:
+        if output == "ndjson":
+            return await _stream_ndjson(
+                get_operations().stream_scheduled_messages(page_size=min(limit, STREAM_PAGE_SIZE)), limit)
+        messages = await get_operations().list_scheduled_messages(limit=limit)
+        if output != "table":
+            return _write_json(messages, output)
+        
+        # Create table
+        table = _new_table(f"Scheduled Messages (showing {len(messages)})", MESSAGE_COLUMNS)
+        
+        for message in messages:
+            table.add_row(*_message_row(message))
+        
+        console.print(table)
+        console.print(f"[green]✅ Found {len(messages)} scheduled messages[/green]")
+    
+    except Exception as e:
+        console.print(f"[red]❌ Error listing messages: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+async def _messages_logs(limit: int, output: str):
+    if output == "table":
+        console.print("[bold blue]📋 Listing message logs...[/bold blue]")
+    
+    try:
+        logs = await get_operations().get_message_logs(limit=limit)
+        if output != "table":
+            return _write_json(logs, output)
+        
+        # Create table
+        table = _new_table(f"Message Logs (showing {len(logs)})", MESSAGE_LOG_COLUMNS)
+        
+        for log in logs:
+            table.add_row(*_log_row(log))
+        
+        console.print(table)
+        console.print(f"[green]✅ Found {len(logs)} message logs[/green]")
+    
+    except Exception as e:
+        console.print(f"[red]❌ Error listing message logs: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+async def _messages_stats(limit: int, output: str):
+    console.print("[bold blue]📊 Getting message statistics...[/bold blue]")
+    
+    try:
+        stats = await get_operations().get_message_statistics()
+        
+        # Create statistics panel
+        panel = Panel(
+            f"[bold]Message Statistics[/bold]\n\n"
+            f"Total Scheduled: {stats['total_scheduled']:,}\n"
+            f"Total Sent: {stats['total_sent']:,}\n"
+            f"Total Failed: {stats['total_failed']:,}\n\n"
+            f"[bold]Status Breakdown:[/bold]\n" + 
+            "\n".join([f"  {status}: {count:,}" for status, count in stats['status_breakdown'].items()]),
+            title="Message Analytics",
+            border_style="blue"
+        )
+        console.print(panel)
+    
+    except Exception as e:
+        console.print(f"[red]❌ Error getting message statistics: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+_MESSAGES_ACTIONS = {
+    "list": _messages_list,
+    "logs": _messages_logs,
+    "stats": _messages_stats,
+}
+
 @app.command()
 def messages(
     action: str = typer.Argument(..., help="Action: list, logs, stats"),
-    limit: int = typer.Option(50, "--limit", "-l", help="Limit results")
+    limit: int = typer.Option(50, "--limit", "-l", help="Limit results"),
+    output: str = OUTPUT_OPTION
 ):
     """Message operations"""
+    _check_output(output)
     
-    async def run_messages():
-        if action == "list":
-            console.print("[bold blue]📧 Listing scheduled messages...[/bold blue]")
-            
-            try:
-                messages = await dataverse_operations.list_scheduled_messages(limit=limit)
-                
-                # Create table
-                table = Table(title=f"Scheduled Messages (showing {len(messages)})")
-                table.add_column("ID", style="cyan")
-                table.add_column("Client", style="yellow")
-                table.add_column("Email", style="white")
-                table.add_column("Subject", style="green")
-                table.add_column("Type", style="magenta")
-                table.add_column("Status", style="blue")
-                table.add_column("Scheduled", style="cyan")
-                table.add_column("Sent", style="green")
-                
-                for message in messages:
-                    table.add_row(
-                        message.get('MessageID', '')[:8] + "...",
-                        message.get('ClientName', '')[:20] + "..." if len(message.get('ClientName', '')) > 20 else message.get('ClientName', ''),
-                        message.get('Email', '')[:25] + "..." if len(message.get('Email', '')) > 25 else message.get('Email', ''),
-                        message.get('MessageSubject', '')[:30] + "..." if len(message.get('MessageSubject', '')) > 30 else message.get('MessageSubject', ''),
-                        message.get('MessageType', 'N/A'),
-                        str(message.get('MessageStatus', 'N/A')),
-                        str(message.get('ScheduledTimestamp', ''))[:19] if message.get('ScheduledTimestamp') else 'N/A',
-                        "Yes" if message.get('Sent') else "No"
-                    )
-                
-                console.print(table)
-                console.print(f"[green]✅ Found {len(messages)} scheduled messages[/green]")
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error listing messages: {str(e)}[/red]")
-                raise typer.Exit(1)
-        
-        elif action == "logs":
-            console.print("[bold blue]📋 Listing message logs...[/bold blue]")
-            
-            try:
-                logs = await dataverse_operations.get_message_logs(limit=limit)
-                
-                # Create table
-                table = Table(title=f"Message Logs (showing {len(logs)})")
-                table.add_column("ID", style="cyan")
-                table.add_column("Message ID", style="yellow")
-                table.add_column("Type", style="magenta")
-                table.add_column("Recipient", style="white")
-                table.add_column("Subject", style="green")
-                table.add_column("Provider", style="blue")
-                table.add_column("Status", style="cyan")
-                table.add_column("Created", style="green")
-                
-                for log in logs:
-                    table.add_row(
-                        str(log.get('id', ''))[:8] + "...",
-                        log.get('message_id', '')[:8] + "...",
-                        log.get('message_type', 'N/A'),
-                        log.get('recipient', '')[:25] + "..." if len(log.get('recipient', '')) > 25 else log.get('recipient', ''),
-                        log.get('subject', '')[:30] + "..." if len(log.get('subject', '')) > 30 else log.get('subject', ''),
-                        log.get('provider', 'N/A'),
-                        log.get('status', 'N/A'),
-                        str(log.get('created_at', ''))[:19] if log.get('created_at') else 'N/A'
-                    )
-                
-                console.print(table)
-                console.print(f"[green]✅ Found {len(logs)} message logs[/green]")
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error listing message logs: {str(e)}[/red]")
-                raise typer.Exit(1)
-        
-        elif action == "stats":
-            console.print("[bold blue]📊 Getting message statistics...[/bold blue]")
-            
-            try:
-                stats = await dataverse_operations.get_message_statistics()
-                
-                # Create statistics panel
-                panel = Panel(
-                    f"[bold]Message Statistics[/bold]\n\n"
-                    f"Total Scheduled: {stats['total_scheduled']:,}\n"
-                    f"Total Sent: {stats['total_sent']:,}\n"
-                    f"Total Failed: {stats['total_failed']:,}\n\n"
-                    f"[bold]Status Breakdown:[/bold]\n" + 
-                    "\n".join([f"  {status}: {count:,}" for status, count in stats['status_breakdown'].items()]),
-                    title="Message Analytics",
-                    border_style="blue"
-                )
-                console.print(panel)
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error getting message statistics: {str(e)}[/red]")
-                raise typer.Exit(1)
-        
-        else:
-            console.print(f"[red]❌ Unknown action: {action}[/red]")
-            console.print("Available actions: list, logs, stats")
-            raise typer.Exit(1)
+    handler = _MESSAGES_ACTIONS.get(action)
+    if handler is None:
+        unknown_action(action, _MESSAGES_ACTIONS)
     
-    asyncio.run(run_messages())
+    run(handler(limit, output))
 
 if __name__ == "__main__":
     app()
@@ -1,60 +1,424 @@
 #!/usr/bin/env python3
 """
 Dataverse HTTP Client
-Simple httpx client with proper headers and impersonation
+Simple httpx client with proper headers and impersonation, plus the async
+DataverseClient used by dataverse.operations
 """
+import asyncio
+import functools
 import os
+import tempfile
+import time
+import uuid
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from pathlib import Path
 import httpx
-from typing import Dict, Optional
-from .auth import dv_token
+import structlog
+from typing import Any, AsyncIterator, Dict, List, Optional
+from ._client import get_dv_client
+from ._json import dumps, loads
+from .circuit_breaker import dataverse_breaker
+from .rate_limit import dataverse_limiter
+
+SCHEMA_TTL_S = 900.0  # table lists/schemas served without a refetch for this long
+SCHEMA_GRACE_S = 3600.0  # after the TTL, served stale for this long while a background refresh runs
+SCHEMA_REFRESH_DRAIN_S = 10.0  # at exit, wait this long for background refreshes before cancelling them
+SCHEMA_CACHE_FILE = Path.home() / ".cache" / "life-cockpit" / "dataverse_schema.json"
+
+_schema_cache: Dict[str, Any] | None = None  # "org|method|args" -> [fetched_at (epoch s), value], loaded from disk on first use
+_schema_refreshes: Dict[str, asyncio.Task] = {}
+_logger = structlog.get_logger(__name__)
+
+@lru_cache(maxsize=8)
+def _web_api_root(dataverse_url: str) -> str:
+    return f"{dataverse_url.rstrip('/')}/api/data/v9.2"
 
 def get_base_url() -> str:
-    """Get the Dataverse base URL"""
-    return f"{os.environ['DATAVERSE_URL'].rstrip('/')}/api/data/v9.2"
-
-def dv_client(impersonate_user_id: str | None = None) -> httpx.Client:
-    """Create httpx client with Dataverse headers"""
-    headers = {
-        "Authorization": f"Bearer {dv_token()}",
-        "OData-MaxVersion": "4.0",
-        "OData-Version": "4.0",
-        "Accept": "application/json",
-        "Content-Type": "application/json; charset=utf-8",
-        "Prefer": 'return=representation,odata.include-annotations="*"',
-    }
+    """Get the Dataverse base URL (built once per DATAVERSE_URL value)"""
+    return _web_api_root(os.environ['DATAVERSE_URL'])
+
+def odata_literal(value: str) -> str:
+    """Quote a string for an OData $filter expression (embedded ' doubled)"""
+    return "'" + value.replace("'", "''") + "'"
+
+def record_key(record_id: str) -> str:
+    """Normalize a primary-key GUID for a record URL; raises ValueError for anything else"""
+    return str(uuid.UUID(record_id))
+
+class _ScopedClient:
+    """View of the shared client that adds one impersonation key's headers to every request"""
+
+    def __init__(self, client: httpx.AsyncClient, headers: Dict[str, str]):
+        self._client = client
+        self._headers = headers
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    async def request(self, method: str, url: str, *, headers: Optional[Dict[str, str]] = None,
+                      **kwargs: Any) -> httpx.Response:
+        return await self._client.request(method, url, headers={**self._headers, **(headers or {})}, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def stream(self, method: str, url: str, *, headers: Optional[Dict[str, str]] = None, **kwargs: Any):
+        return self._client.stream(method, url, headers={**self._headers, **(headers or {})}, **kwargs)
+
+    async def aclose(self) -> None:
+        """No-op: the shared client is closed by dataverse._client.close_dv_client at shutdown"""
+
+def dv_client(impersonate_user_id: str | None = None) -> _ScopedClient:
+    """Dev-layer view of the shared Dataverse client (writes return the record; optional impersonation)"""
+    headers = {"Prefer": 'return=representation,odata.include-annotations="*"'}
     if impersonate_user_id:
         headers["MSCRMCallerID"] = impersonate_user_id
-    return httpx.Client(
-        base_url=get_base_url(),
-        headers=headers,
-        timeout=httpx.Timeout(15.0, connect=5.0),
-        http2=True,
-        limits=httpx.Limits(
-            max_keepalive_connections=5,
-            max_connections=10,
-            keepalive_expiry=30,
-        ),
-    )
-
-# Simple connection pool: cache clients by impersonation id (None for default)
-_pooled_clients: Dict[Optional[str], httpx.Client] = {}
-
-def get_pooled_client(impersonate_user_id: Optional[str] = None) -> httpx.Client:
-    """Return a pooled httpx.Client for reuse across requests."""
-    global _pooled_clients
-    key = impersonate_user_id
-    client = _pooled_clients.get(key)
-    if client is None or client.is_closed:
-        _pooled_clients[key] = dv_client(impersonate_user_id)
-    return _pooled_clients[key]
-
-def close_pooled_clients() -> None:
+    return _ScopedClient(get_dv_client(), headers)
+
+POOL_MAX_SIZE = 10  # most requests one impersonation key may have in flight
+
+class DVPool:
+    """Bounded pool of client leases for one impersonation key, bound to one event loop
+
+    Every lease sends through the one shared HTTP/2 client (and its connection pool and
+    token); the pool only caps how many requests a key has in flight. Leases are created
+    lazily up to max_size and then reused; once all are checked out, acquire() waits.
+    Leases open no connections of their own, so there is nothing to create ahead of use.
+    """
+
+    def __init__(self, impersonate_user_id: Optional[str] = None, max_size: int = POOL_MAX_SIZE):
+        self.impersonate_user_id = impersonate_user_id
+        self.max_size = max_size
+        self.loop = asyncio.get_running_loop()
+        self._idle: asyncio.Queue[_ScopedClient] = asyncio.Queue()
+        self._clients: List[_ScopedClient] = []
+
+    def _new_client(self) -> _ScopedClient:
+        client = dv_client(self.impersonate_user_id)
+        self._clients.append(client)
+        return client
+
+    async def _get(self) -> _ScopedClient:
+        try:
+            return self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            if len(self._clients) < self.max_size:
+                return self._new_client()
+            return await self._idle.get()
+
+    def release(self, client: _ScopedClient) -> None:
+        """Return a lease to the pool; leases on a closed client are dropped"""
+        if client.is_closed:
+            if client in self._clients:
+                self._clients.remove(client)
+        else:
+            self._idle.put_nowait(client)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[_ScopedClient]:
+        """Check out a lease for the duration of the block"""
+        client = await self._get()
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    async def aclose(self) -> None:
+        """Close and forget every lease the pool has created"""
+        for client in self._clients:
+            try:
+                if not client.is_closed:
+                    await client.aclose()
+            except Exception:
+                pass
+        self._clients.clear()
+        self._idle = asyncio.Queue()
+
+# One pool per impersonation id (None for the app user), recreated if the running loop changes
+_pools: Dict[Optional[str], DVPool] = {}
+
+def get_pool(impersonate_user_id: Optional[str] = None) -> DVPool:
+    """Return the client pool for an impersonation id on the running event loop"""
+    pool = _pools.get(impersonate_user_id)
+    if pool is None or pool.loop is not asyncio.get_running_loop():
+        if not _pools:
+            from utils.aio import on_shutdown
+            on_shutdown(close_pools)
+        pool = _pools[impersonate_user_id] = DVPool(impersonate_user_id)
+    return pool
+
+async def close_pools() -> None:
     """Close all pooled clients (for shutdown/cleanup)."""
-    global _pooled_clients
-    for client in _pooled_clients.values():
+    for pool in _pools.values():
+        await pool.aclose()
+    _pools.clear()
+
+def _load_schema_cache() -> Dict[str, Any]:
+    global _schema_cache
+    if _schema_cache is None:
         try:
-            if not client.is_closed:
-                client.close()
-        except Exception:
-            pass
-    _pooled_clients.clear()
+            _schema_cache = loads(SCHEMA_CACHE_FILE.read_bytes())
+        except (OSError, ValueError):
+            _schema_cache = {}
+    return _schema_cache
+
+def _save_schema_cache() -> None:
+    """Persist the schema cache atomically; best effort"""
+    try:
+        SCHEMA_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=SCHEMA_CACHE_FILE.parent, prefix=".dataverse_schema.", suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(dumps(_schema_cache))
+        os.replace(tmp.name, SCHEMA_CACHE_FILE)
+    except OSError as exc:
+        _logger.warning("dv_schema_cache_write_failed", error=str(exc))
+
+def clear_schema_cache() -> None:
+    """Drop cached table lists and schemas, in memory and on disk"""
+    global _schema_cache
+    _schema_cache = {}
+    _save_schema_cache()
+
+def _stale_while_revalidate(fn):
+    """Cache a DataverseClient metadata method per environment and arguments, in memory and on disk
+
+    Fresh for SCHEMA_TTL_S; for SCHEMA_GRACE_S after that the stale value is returned
+    while one background task refetches it; older entries are refetched inline.
+    Failures are not cached.
+    """
+    @functools.wraps(fn)
+    async def wrapper(self, *args):
+        key = "|".join([os.environ.get("DATAVERSE_URL", "").rstrip("/"), fn.__name__, *args])
+        cache = _load_schema_cache()
+
+        async def refresh():
+            value = await fn(self, *args)
+            cache[key] = [time.time(), value]
+            _save_schema_cache()
+            return value
+
+        hit = cache.get(key)
+        if hit is None:
+            return await refresh()
+        age = time.time() - hit[0]
+        if age >= SCHEMA_TTL_S + SCHEMA_GRACE_S:
+            return await refresh()
+        if age >= SCHEMA_TTL_S and key not in _schema_refreshes:
+            if not _schema_refreshes:
+                _register_refresh_drain()
+            task = asyncio.create_task(refresh())
+            _schema_refreshes[key] = task
+            task.add_done_callback(functools.partial(_refresh_done, key))
+        return hit[1]
+    return wrapper
+
+_refresh_drain_registered = False
+
+def _register_refresh_drain() -> None:
+    """Have the shared loop finish pending refreshes at exit (one-shot CLI runs end right after a stale hit)"""
+    global _refresh_drain_registered
+    if not _refresh_drain_registered:
+        from utils.aio import on_shutdown
+        get_dv_client()  # create the shared client first: shutdown hooks run in reverse, so it closes after the drain
+        on_shutdown(drain_schema_refreshes)
+        _refresh_drain_registered = True
+
+async def drain_schema_refreshes() -> None:
+    """Wait up to SCHEMA_REFRESH_DRAIN_S for background schema refreshes, then cancel the rest"""
+    loop = asyncio.get_running_loop()
+    tasks = [t for t in _schema_refreshes.values() if t.get_loop() is loop]
+    if not tasks:
+        return
+    _, pending = await asyncio.wait(tasks, timeout=SCHEMA_REFRESH_DRAIN_S)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+def _refresh_done(key: str, task: asyncio.Task) -> None:
+    _schema_refreshes.pop(key, None)
+    if not task.cancelled() and task.exception() is not None:
+        _logger.warning("dv_schema_refresh_failed", key=key, error=str(task.exception()))
+
+class DataverseClient:
+    """Async Dataverse Web API access over the shared pooled client"""
+
+    def __init__(self):
+        self._entity_sets: Dict[str, str] = {}  # logical name -> EntitySetName
+
+    async def entity_set(self, table_name: str) -> str:
+        """Resolve a table's logical name to its EntitySetName (cached)"""
+        if table_name not in self._entity_sets:
+            c = get_dv_client()
+            r = await c.get(
+                f"/EntityDefinitions(LogicalName={odata_literal(table_name)})",
+                params={"$select": "EntitySetName"},
+            )
+            r.raise_for_status()
+            self._entity_sets[table_name] = loads(r.content)["EntitySetName"]
+        return self._entity_sets[table_name]
+
+    @dataverse_breaker
+    @dataverse_limiter
+    async def execute_query(self, table_name: str, params: Optional[Dict[str, Any]] = None,
+                            aliases: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Run an OData query ($select/$filter/$orderby/$top/$apply...) against a table and return its rows
+
+        aliases binds string values to @name parameter aliases used in the query
+        (e.g. {"term": ...} for "contains(name,@term)"), quoted for OData.
+        """
+        set_name = await self.entity_set(table_name)
+        params = dict(params or {})
+        for name, value in (aliases or {}).items():
+            params[f"@{name}"] = odata_literal(value)
+        c = get_dv_client()
+        r = await c.get(f"/{set_name}", params=params)
+        r.raise_for_status()
+        return loads(r.content).get("value", [])
+
+    @dataverse_breaker
+    @dataverse_limiter
+    async def execute_batch(self, queries: List[tuple[str, Dict[str, Any]]],
+                            aliases: Optional[Dict[str, str]] = None) -> List[List[Dict[str, Any]]]:
+        """Run several (table, params) queries in one $batch request; returns each query's rows, in order
+
+        aliases are bound into every query, as in execute_query.
+        """
+        from .batch import batch_body, check_parts, parse_batch_response, part_result
+        bound = {f"@{name}": odata_literal(value) for name, value in (aliases or {}).items()}
+        ops = []
+        for table_name, params in queries:
+            set_name = await self.entity_set(table_name)
+            params = {**params, **bound}
+            ops.append(("GET", f"{set_name}?{httpx.QueryParams(params)}" if params else set_name, None))
+        boundary, body = batch_body(ops)
+        c = get_dv_client()
+        r = await c.post(
+            "/$batch",
+            content=body.encode("utf-8"),
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+        r.raise_for_status()
+        parts = check_parts(parse_batch_response(r.headers["Content-Type"], r.content))
+        return [part_result(headers, part_body).get("value", []) for _, headers, part_body in parts]
+
+    @dataverse_breaker
+    @dataverse_limiter
+    async def dataverse_search(self, search_term: str, entities: List[str], top: int = 50) -> List[Dict[str, Any]]:
+        """Query the Dataverse Search index across several tables; returns scored hits, best first
+
+        Each hit carries @search.entityname and @search.objectid plus the table's
+        Quick Find columns. Requires Dataverse Search to be enabled for the environment.
+        """
+        c = get_dv_client()
+        r = await c.post(
+            f"{os.environ['DATAVERSE_URL'].rstrip('/')}/api/search/v1.0/query",
+            content=dumps({"search": search_term, "entities": entities, "top": top}),
+            headers={"Content-Type": "application/json"},
+        )
+        r.raise_for_status()
+        return loads(r.content).get("value", [])
+
+    @dataverse_breaker
+    @dataverse_limiter
+    async def retrieve_total_record_count(self, table_names: List[str]) -> Dict[str, int]:
+        """Snapshot row counts for several tables in one RetrieveTotalRecordCount call"""
+        c = get_dv_client()
+        r = await c.get(
+            "/RetrieveTotalRecordCount(EntityNames=@p1)",
+            params={"@p1": dumps(list(table_names))},
+        )
+        r.raise_for_status()
+        collection = loads(r.content)["EntityRecordCountCollection"]
+        return dict(zip(collection["Keys"], collection["Values"]))
+
+    @dataverse_breaker
+    @dataverse_limiter
+    async def get_record(self, table_name: str, record_id: str, select: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get a single row by primary key, or None if it does not exist"""
+        set_name = await self.entity_set(table_name)
+        c = get_dv_client()
+        r = await c.get(f"/{set_name}({record_key(record_id)})", params={"$select": select} if select else {})
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return loads(r.content)
+
+    async def list_tables(self) -> List[Dict[str, Any]]:
+        """List table definitions (logical name, display name, description, custom flag)"""
+        tables = await self._table_definitions()
+        for table in tables:
+            self._entity_sets[table["name"]] = table["entity_set"]
+        return [{k: v for k, v in table.items() if k != "entity_set"} for table in tables]
+
+    @_stale_while_revalidate
+    @dataverse_breaker
+    @dataverse_limiter
+    async def _table_definitions(self) -> List[Dict[str, Any]]:
+        c = get_dv_client()
+        r = await c.get(
+            "/EntityDefinitions",
+            params={"$select": "LogicalName,EntitySetName,DisplayName,Description,IsCustomEntity"},
+        )
+        r.raise_for_status()
+        tables = []
+        for entity in loads(r.content).get("value", []):
+            tables.append({
+                "name": entity["LogicalName"],
+                "entity_set": entity.get("EntitySetName") or entity["LogicalName"],
+                "display_name": _label(entity.get("DisplayName")) or entity["LogicalName"],
+                "description": _label(entity.get("Description")),
+                "is_custom": entity.get("IsCustomEntity", False),
+            })
+        return tables
+
+    @_stale_while_revalidate
+    @dataverse_breaker
+    @dataverse_limiter
+    async def get_table_schema(self, table_name: str) -> Dict[str, Any]:
+        """Get a table's columns (name, type, required, description)"""
+        c = get_dv_client()
+        r = await c.get(
+            f"/EntityDefinitions(LogicalName={odata_literal(table_name)})",
+            params={
+                "$select": "LogicalName,EntitySetName",
+                "$expand": "Attributes($select=LogicalName,AttributeType,RequiredLevel,Description)",
+            },
+        )
+        r.raise_for_status()
+        data = loads(r.content)
+        return {
+            "name": data.get("LogicalName", table_name),
+            "entity_set": data.get("EntitySetName"),
+            "columns": [
+                {
+                    "name": attr.get("LogicalName", ""),
+                    "type": attr.get("AttributeType", ""),
+                    "required": (attr.get("RequiredLevel") or {}).get("Value") in ("ApplicationRequired", "SystemRequired"),
+                    "description": _label(attr.get("Description")),
+                }
+                for attr in data.get("Attributes", [])
+            ],
+        }
+
+def _label(label_obj: Any) -> str:
+    """Extract the user-localized text from a Dataverse Label object"""
+    if isinstance(label_obj, dict):
+        user_label = label_obj.get("UserLocalizedLabel")
+        if isinstance(user_label, dict):
+            return user_label.get("Label") or ""
+    return ""
+
+_dataverse_client: Optional[DataverseClient] = None
+
+def get_dataverse_client() -> DataverseClient:
+    """Return the shared DataverseClient"""
+    global _dataverse_client
+    if _dataverse_client is None:
+        _dataverse_client = DataverseClient()
+    return _dataverse_client
@@ -3,175 +3,255 @@
 Dataverse Dev Layer
 Basic CRUD operations for Dataverse with proper OData handling
 """
+import asyncio
+import functools
+import json
+import os
+import tempfile
 import time
+from pathlib import Path
 import httpx
 from typing import Callable, Any
 import structlog
-from .client import dv_client, get_pooled_client
+from ._json import loads
+from .client import clear_schema_cache, get_pool, odata_literal
 from .circuit_breaker import dataverse_breaker
+from .retry import with_retry
 
-_entity_cache: dict[str, str] = {}  # logical -> EntitySetName
+WHOAMI_TTL_S = 300.0
+ENTITY_DEF_TTL_S = 3600.0  # metadata rarely changes
+ENTITY_SET_CACHE_FILE = Path.home() / ".cache" / "life-cockpit" / "entity_sets.json"
+
+_entity_cache: dict[str, str | None] | None = None  # logical -> EntitySetName (None: not found), loaded from disk on first use
 _logger = structlog.get_logger(__name__)
 
-def _with_retry(fn: Callable[[], Any], max_retries: int = 3, backoff_factor: float = 2.0) -> Any:
-    """Execute callable with exponential backoff retry for transient errors."""
-    last_exc: Exception | None = None
-    for attempt in range(max_retries):
-        try:
-            start = time.time()
-            result = fn()
-            duration = time.time() - start
-            _logger.info("dv_call_success", attempt=attempt + 1, duration_ms=int(duration * 1000))
-            return result
-        except (httpx.TimeoutException, httpx.ConnectError) as exc:
-            last_exc = exc
-            _logger.warning("dv_call_transient_error", attempt=attempt + 1, error=str(exc))
-        except httpx.HTTPStatusError as exc:
-            # Retry only on 5xx
-            if exc.response is not None and 500 <= exc.response.status_code < 600:
-                last_exc = exc
-                _logger.warning("dv_call_5xx", attempt=attempt + 1, status_code=exc.response.status_code)
-            else:
-                _logger.error("dv_call_http_error", status_code=exc.response.status_code if exc.response else None)
-                raise
-        if attempt < max_retries - 1:
-            wait_s = backoff_factor ** attempt
-            _logger.info("dv_call_retry", next_backoff_s=wait_s)
-            time.sleep(wait_s)
-    assert last_exc is not None
-    _logger.error("dv_call_failed", error=str(last_exc))
-    raise last_exc
-
-@dataverse_breaker
-def whoami(impersonate: str | None = None) -> dict:
+def _ttl_cache(ttl_s: float):
+    """Memoize an async function per arguments for ttl_s seconds (failures are not cached)"""
+    def decorator(fn):
+        cache: dict[tuple, tuple[float, Any]] = {}
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            hit = cache.get(key)
+            if hit is not None and hit[0] > time.monotonic():
+                return hit[1]
+            value = await fn(*args, **kwargs)
+            cache[key] = (time.monotonic() + ttl_s, value)
+            return value
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+def _org_key() -> str:
+    """Entity sets are cached per Dataverse environment"""
+    return os.environ.get("DATAVERSE_URL", "").rstrip("/")
+
+def _read_entity_sets() -> dict:
+    try:
+        return loads(ENTITY_SET_CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+def _load_entity_cache() -> dict[str, str | None]:
+    global _entity_cache
+    if _entity_cache is None:
+        _entity_cache = dict(_read_entity_sets().get(_org_key(), {}))
+    return _entity_cache
+
+def _save_entity_cache() -> None:
+    """Persist the entity-set cache atomically; best effort"""
+    try:
+        data = _read_entity_sets()
+        data[_org_key()] = _entity_cache
+        ENTITY_SET_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=ENTITY_SET_CACHE_FILE.parent, prefix=".entity_sets.", suffix=".tmp", delete=False
+        ) as tmp:
+            json.dump(data, tmp)
+        os.replace(tmp.name, ENTITY_SET_CACHE_FILE)
+    except OSError as exc:
+        _logger.warning("dv_entity_cache_write_failed", error=str(exc))
+
+def clear_metadata_cache() -> None:
+    """Drop cached whoami/entity/schema metadata, in memory and on disk"""
+    global _entity_cache
+    from auth.dataverse import clear_entity_definitions_cache
+    clear_entity_definitions_cache()
+    clear_schema_cache()
+    whoami.cache_clear()
+    entity_def.cache_clear()
+    _entity_cache = {}
+    _save_entity_cache()
+
+# (path, params, json body, impersonated user) built by each @_dv_call function
+_Request = tuple[str, dict | None, dict | None, str | None]
+
+def _json_body(r: httpx.Response) -> Any:
+    return loads(r.content)
+
+def _no_body(r: httpx.Response) -> None:
+    return None
+
+def _created_id(r: httpx.Response) -> dict:
+    """{"id": <guid>} from the OData-EntityId header of a create"""
+    oid = r.headers.get("OData-EntityId", "")
+    if oid.endswith(")"):
+        return {"id": oid[oid.rfind("(") + 1:-1]}
+    return {"id": "unknown"}
+
+def _aggregate_count(r: httpx.Response) -> dict:
+    """{"@odata.count": N} from an aggregate($count as count) response"""
+    rows = loads(r.content).get("value", [])
+    return {"@odata.count": rows[0].get("count", 0) if rows else 0}
+
+def _dv_call(method: str, extract: Callable[[httpx.Response], Any] = _json_body):
+    """Turn a request builder into a pooled, retried, circuit-broken Dataverse call
+
+    The decorated function only builds the request (a _Request tuple); the resulting
+    coroutine function sends it and returns extract(response).
+    """
+    def decorator(build: Callable[..., _Request]):
+        async def _send(path: str, params: dict | None, body: dict | None, impersonate: str | None) -> Any:
+            async with get_pool(impersonate).acquire() as c:
+                r = await c.request(method, path, params=params, json=body)
+            r.raise_for_status()
+            return extract(r)
+
+        @dataverse_breaker
+        @functools.wraps(build)
+        async def call(*args, **kwargs) -> Any:
+            return await with_retry(functools.partial(_send, *build(*args, **kwargs)), idempotent=method != "POST")
+        return call
+    return decorator
+
+@_ttl_cache(WHOAMI_TTL_S)
+@_dv_call("GET")
+def whoami(impersonate: str | None = None) -> _Request:
     """Get current user info"""
-    def _op():
-        c = get_pooled_client(impersonate)
-        r = c.get("/WhoAmI")
-        r.raise_for_status()
-        return r.json()
-    return _with_retry(_op)
-
-@dataverse_breaker
-def entity_def(logical_name: str) -> dict:
+    return "/WhoAmI", None, None, impersonate
+
+@_ttl_cache(ENTITY_DEF_TTL_S)
+@_dv_call("GET")
+def entity_def(logical_name: str) -> _Request:
     """Get entity definition for logical name"""
-    def _op():
-        c = get_pooled_client()
-        r = c.get(
-            f"/EntityDefinitions(LogicalName='{logical_name}')",
-            params={"$select": "EntitySetName,PrimaryIdAttribute,PrimaryNameAttribute"},
-        )
-        r.raise_for_status()
-        return r.json()
-    return _with_retry(_op)
-
-def entity_set(logical_name: str) -> str:
-    """Get EntitySetName for logical name (cached)"""
-    if logical_name not in _entity_cache:
-        _entity_cache[logical_name] = entity_def(logical_name)["EntitySetName"]
-    return _entity_cache[logical_name]
-
-@dataverse_breaker
-def get(entity_set_name: str, id: str, select: str | None = None, expand: str | None = None) -> dict:
+    params = {"$select": "EntitySetName,PrimaryIdAttribute,PrimaryNameAttribute"}
+    return f"/EntityDefinitions(LogicalName={odata_literal(logical_name)})", params, None, None
+
+async def entity_set(logical_name: str) -> str:
+    """Get EntitySetName for logical name (cached in memory and in ENTITY_SET_CACHE_FILE)"""
+    cache = _load_entity_cache()
+    if cache.get(logical_name) is None:
+        set_name = (await entity_def(logical_name)).get("EntitySetName")
+        if not set_name:
+            raise RuntimeError(f"no EntitySetName for table: {logical_name}")
+        cache[logical_name] = set_name
+        _save_entity_cache()
+    return cache[logical_name]
+
+WELL_KNOWN_TABLES = ("account", "contact", "appointment", "annotation", "systemuser")
+
+@_dv_call("GET")
+def _entity_sets_for(logical_names: list[str]) -> _Request:
+    params = {
+        "$select": "LogicalName,EntitySetName",
+        "$filter": " or ".join(f"LogicalName eq {odata_literal(n)}" for n in logical_names),
+    }
+    return "/EntityDefinitions", params, None, None
+
+async def warmup_entity_sets(logical_names: list[str] | tuple[str, ...] = WELL_KNOWN_TABLES) -> None:
+    """Resolve every uncached EntitySetName in one metadata request
+
+    Names the org doesn't have are cached as None so a typo isn't re-requested on
+    every run; entity_set() still looks those up directly (and reports the error).
+    """
+    cache = _load_entity_cache()
+    missing = sorted({n for n in logical_names if n and n not in cache})
+    if not missing:
+        return
+    cache.update(dict.fromkeys(missing))
+    for definition in (await _entity_sets_for(missing)).get("value", []):
+        if definition.get("EntitySetName"):
+            cache[definition["LogicalName"]] = definition["EntitySetName"]
+    _save_entity_cache()
+
+@_dv_call("GET")
+def get(entity_set_name: str, id: str, select: str | None = None, expand: str | None = None) -> _Request:
     """Get single record by ID"""
     params = {}
     if select:
         params["$select"] = select
     if expand:
         params["$expand"] = expand
-    def _op():
-        c = get_pooled_client()
-        r = c.get(f"/{entity_set_name}({id})", params=params)
-        r.raise_for_status()
-        return r.json()
-    return _with_retry(_op)
-
-@dataverse_breaker
-def query(entity_set_name: str, filter: str = "", select: str = "", top: int = 10) -> dict:
-    """Query records with OData parameters"""
+    return f"/{entity_set_name}({id})", params, None, None
+
+@_dv_call("GET")
+def _query_rows(entity_set_name: str, params: dict) -> _Request:
+    return f"/{entity_set_name}", params, None, None
+
+@_dv_call("GET", _aggregate_count)
+def _query_count(entity_set_name: str, params: dict) -> _Request:
+    return f"/{entity_set_name}", params, None, None
+
+async def query(entity_set_name: str, filter: str = "", select: str = "", top: int = 10,
+                count_only: bool = False) -> dict:
+    """Query records with OData parameters; count_only returns just {"@odata.count": N}"""
+    if count_only:
+        # Server-side aggregate: one {"count": N} row, no record bodies
+        aggregate = "aggregate($count as count)"
+        return await _query_count(entity_set_name, {"$apply": f"filter({filter})/{aggregate}" if filter else aggregate})
     params = {"$top": top, "$count": "true"}  # ✅ $count=true included
     if filter:
         params["$filter"] = filter
     if select:
         params["$select"] = select
-    def _op():
-        c = get_pooled_client()
-        r = c.get(f"/{entity_set_name}", params=params)
-        r.raise_for_status()
-        return r.json()  # ✅ @odata.count will be in the response
-    return _with_retry(_op)
-
-@dataverse_breaker
-def create(entity_set_name: str, payload: dict, *, impersonate: str | None = None) -> dict:
+    return await _query_rows(entity_set_name, params)  # ✅ @odata.count will be in the response
+
+@_dv_call("POST", _created_id)
+def create(entity_set_name: str, payload: dict, *, impersonate: str | None = None) -> _Request:
     """Create new record"""
-    def _op():
-        c = get_pooled_client(impersonate)
-        r = c.post(f"/{entity_set_name}", json=payload)
-        r.raise_for_status()
-        oid = r.headers.get("OData-EntityId", "")
-        if oid.endswith(")"):
-            gid = oid[oid.rfind("(") + 1:-1]
-            return {"id": gid}
-        return {"id": "unknown"}
-    return _with_retry(_op)
-
-@dataverse_breaker
-def update(entity_set_name: str, id: str, payload: dict, *, impersonate: str | None = None) -> None:
+    return f"/{entity_set_name}", None, payload, impersonate
+
+@_dv_call("PATCH", _no_body)
+def update(entity_set_name: str, id: str, payload: dict, *, impersonate: str | None = None) -> _Request:
     """Update existing record"""
-    def _op():
-        c = get_pooled_client(impersonate)
-        r = c.patch(f"/{entity_set_name}({id})", json=payload)
-        r.raise_for_status()
-    return _with_retry(_op)
-
-@dataverse_breaker
-def delete(entity_set_name: str, id: str, *, impersonate: str | None = None) -> None:
+    return f"/{entity_set_name}({id})", None, payload, impersonate
+
+@_dv_call("DELETE", _no_body)
+def delete(entity_set_name: str, id: str, *, impersonate: str | None = None) -> _Request:
     """Delete record"""
-    def _op():
-        c = get_pooled_client(impersonate)
-        r = c.delete(f"/{entity_set_name}({id})")
-        r.raise_for_status()
-    return _with_retry(_op)
-
-@dataverse_breaker
-def create_note(regarding_logical: str, regarding_id: str, subject: str, notetext: str, *,
-                impersonate: str | None = None) -> dict:
+    return f"/{entity_set_name}({id})", None, None, impersonate
+
+async def create_note(regarding_logical: str, regarding_id: str, subject: str, notetext: str, *,
+                      impersonate: str | None = None) -> dict:
     """Create note attached to record"""
-    set_name = entity_set(regarding_logical)
+    set_name = await entity_set(regarding_logical)
     payload = {
         "subject": subject,
         "notetext": notetext,
         f"objectid_{regarding_logical}@odata.bind": f"/{set_name}({regarding_id})",  # ✅ Correct binding
     }
-    def _op():
-        c = get_pooled_client(impersonate)
-        r = c.post("/annotations", json=payload)
-        r.raise_for_status()
-        oid = r.headers.get("OData-EntityId", "")
-        if oid.endswith(")"):
-            gid = oid[oid.rfind("(") + 1:-1]
-            return {"id": gid}
-        return {"id": "unknown"}
-    return _with_retry(_op)
-
-def find_user_systemuserid(upn_or_domainname: str) -> str:
+    return await create("annotations", payload, impersonate=impersonate)
+
+_USER_FILTER = "(userprincipalname eq {q} or domainname eq {q})"
+
+async def find_user_systemuserid(upn_or_domainname: str) -> str:
     """Find systemuserid by domain name or UPN"""
-    data = query("systemusers",
-                 filter=f"(userprincipalname eq '{upn_or_domainname}' or domainname eq '{upn_or_domainname}')",
-                 select="systemuserid", top=1)
+    data = await query("systemusers",
+                       filter=_USER_FILTER.format(q=odata_literal(upn_or_domainname)),
+                       select="systemuserid", top=1)
     vals = data.get("value", [])
     if not vals:
         raise RuntimeError(f"user not found: {upn_or_domainname}")
     return vals[0]["systemuserid"]
 
-def probe() -> dict:
+async def probe() -> dict:
     """Smoke test the Dataverse connection"""
     results = {}
     
     # Test token
     try:
-        from .auth import dv_token
-        token = dv_token()
+        from .auth import dv_token_async
+        await dv_token_async()
         results["token"] = "✅ Valid token acquired"
     except Exception as e:
         results["token"] = f"❌ Token error: {e}"
@@ -179,20 +259,20 @@ def probe() -> dict:
     
     # Test WhoAmI
     try:
-        whoami_result = whoami()
+        whoami_result = await whoami()
         results["whoami"] = f"✅ App user: {whoami_result.get('UserId')}"
     except Exception as e:
         results["whoami"] = f"❌ WhoAmI error: {e}"
     
     # Test metadata
     try:
-        with dv_client() as c:
-            headers = {"Accept": "application/xml"}
-            # Use a higher per-request timeout for metadata, which can be large
-            metadata_timeout = httpx.Timeout(60.0, connect=10.0, read=60.0)
-            r = c.get("/$metadata", headers=headers, timeout=metadata_timeout)
-            r.raise_for_status()
-            results["metadata"] = "✅ Metadata accessible"
+        headers = {"Accept": "application/xml"}
+        metadata_timeout = httpx.Timeout(60.0, connect=10.0, read=60.0)
+        # The EDMX document runs to several MB; the status line is all the probe needs
+        async with get_pool().acquire() as c:
+            async with c.stream("GET", "/$metadata", headers=headers, timeout=metadata_timeout) as r:
+                r.raise_for_status()
+        results["metadata"] = "✅ Metadata accessible"
     except Exception as e:
         results["metadata"] = f"❌ Metadata error: {e}"
     
@@ -6,62 +6,85 @@ Provides functionality to list and manage Dataverse tables/entities.
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
+import sys
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional
 
-from auth.dataverse import DataverseAuthManager
+from auth.dataverse import DataverseAuthManager, TableSummary
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _auth_manager() -> DataverseAuthManager:
+    """One DataverseAuthManager (credential, resolved URL) shared by every helper here."""
+    return DataverseAuthManager()
+
+
 async def test_dataverse_connection(impersonate_user_id: Optional[str] = None) -> bool:
     """Test Dataverse connection using WhoAmI endpoint."""
     try:
-        auth_manager = DataverseAuthManager()
+        auth_manager = _auth_manager()
         return await auth_manager.test_connection(impersonate_user_id)
     except Exception as e:
         logger.error(f"Dataverse connection test failed: {e}")
         return False
 
 
-async def get_dataverse_tables(impersonate_user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+async def get_dataverse_tables(impersonate_user_id: Optional[str] = None) -> List[TableSummary]:
     """Get all Dataverse tables/entities."""
     try:
-        auth_manager = DataverseAuthManager()
+        auth_manager = _auth_manager()
         return await auth_manager.get_entity_definitions(impersonate_user_id)
     except Exception as e:
         logger.error(f"Failed to get Dataverse tables: {e}")
         return []
 
 
+async def iter_dataverse_tables(impersonate_user_id: Optional[str] = None) -> AsyncIterator[TableSummary]:
+    """Yield Dataverse tables/entities as each API page arrives."""
+    try:
+        auth_manager = _auth_manager()
+        async for table in auth_manager.iter_entity_definitions(impersonate_user_id):
+            yield table
+    except Exception as e:
+        logger.error(f"Failed to get Dataverse tables: {e}")
+
+
 async def list_dataverse_tables(impersonate_user_id: Optional[str] = None) -> bool:
     """List Dataverse tables with formatted output."""
-    tables = await get_dataverse_tables(impersonate_user_id)
-    
-    if tables:
-        print(f"📊 Found {len(tables)} user entities in Dataverse:")
-        custom_entities = [t for t in tables if t['entity_type'] == 'Custom']
-        standard_entities = [t for t in tables if t['entity_type'] == 'Standard']
-        
-        if custom_entities:
-            print(f"\n🔧 Custom Entities ({len(custom_entities)}):")
-            for table in custom_entities[:10]:  # Show first 10
-                print(f"  • {table['display_name']} ({table['name']})")
-            if len(custom_entities) > 10:
-                print(f"  ... and {len(custom_entities) - 10} more")
-        
-        if standard_entities:
-            print(f"\n📋 Standard Entities ({len(standard_entities)}):")
-            for table in standard_entities[:5]:  # Show first 5
-                print(f"  • {table['display_name']} ({table['name']})")
-            if len(standard_entities) > 5:
-                print(f"  ... and {len(standard_entities) - 5} more")
-        
-        print(f"\n💡 Total: {len(tables)} entities available")
-        return True
-    else:
+    return print_dataverse_tables(await get_dataverse_tables(impersonate_user_id))
+
+
+def print_dataverse_tables(tables: List[TableSummary]) -> bool:
+    """Print already-fetched tables grouped by entity type; False if there are none."""
+    if not tables:
         print("⚠️ No tables found or connection failed")
         return False
+    
+    custom_entities: List[TableSummary] = []
+    standard_entities: List[TableSummary] = []
+    for t in tables:
+        (custom_entities if t.entity_type == 'Custom' else standard_entities).append(t)
+    
+    # Build the whole listing and write it once
+    lines = [f"📊 Found {len(tables)} user entities in Dataverse:"]
+    if custom_entities:
+        lines.append(f"\n🔧 Custom Entities ({len(custom_entities)}):")
+        lines.extend(f"  • {t.display_name} ({t.name})" for t in custom_entities[:10])  # Show first 10
+        if len(custom_entities) > 10:
+            lines.append(f"  ... and {len(custom_entities) - 10} more")
+    
+    if standard_entities:
+        lines.append(f"\n📋 Standard Entities ({len(standard_entities)}):")
+        lines.extend(f"  • {t.display_name} ({t.name})" for t in standard_entities[:5])  # Show first 5
+        if len(standard_entities) > 5:
+            lines.append(f"  ... and {len(standard_entities) - 5} more")
+    
+    lines.append(f"\n💡 Total: {len(tables)} entities available")
+    sys.stdout.write("\n".join(lines) + "\n")
+    return True
 
 
 async def main():
@@ -69,9 +92,14 @@ async def main():
     print("🧪 Testing Dataverse Integration")
     print("=" * 40)
     
+    # Both requests are independent: overlap the connection test and the table fetch
+    connected, tables = await asyncio.gather(
+        test_dataverse_connection(), get_dataverse_tables(), return_exceptions=True
+    )
+    
     # Test 1: Basic connection
     print("\n1️⃣ Testing Dataverse connection...")
-    if await test_dataverse_connection():
+    if connected is True:
         print("✅ Connection successful!")
     else:
         print("❌ Connection failed!")
@@ -79,8 +107,9 @@ async def main():
     
     # Test 2: List tables
     print("\n2️⃣ Listing Dataverse tables...")
-    await list_dataverse_tables()
+    print_dataverse_tables(tables if isinstance(tables, list) else [])
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    from utils.aio import run
+    run(main())
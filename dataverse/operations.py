@@ -6,14 +6,168 @@ Real environment read-only operations for Dynamics/Dataverse
 
 import asyncio
 import os
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, List, Optional
 import structlog
 
-from dataverse.client import get_dataverse_client
+from dataverse.client import get_dataverse_client, odata_literal
 
 logger = structlog.get_logger(__name__)
 
+COUNT_CONCURRENCY = 20  # in-flight RetrieveTotalRecordCount calls in get_table_counts_bulk
+COUNT_CHUNK_SIZE = 10  # tables per RetrieveTotalRecordCount call
+STREAM_PAGE_SIZE = 500  # rows per request behind the stream_* generators
+CLIENT_TYPE_CACHE_SIZE = 100_000  # client IDs whose table (account/contact) is remembered
+CLIENT_TYPE_TTL_S = 3600.0
+
+# $select lists: list queries fetch only the columns the CLI tables render
+ACCOUNT_LIST_FIELDS = "accountid,name,emailaddress1,telephone1,address1_city,address1_stateorprovince"
+CONTACT_LIST_FIELDS = "contactid,firstname,lastname,emailaddress1,telephone1,address1_city,address1_stateorprovince"
+ACCOUNT_DETAIL_FIELDS = f"{ACCOUNT_LIST_FIELDS},address1_line1,statuscode,createdon,modifiedon"
+CONTACT_DETAIL_FIELDS = f"{CONTACT_LIST_FIELDS},address1_line1,statuscode,createdon,modifiedon"
+SESSION_LIST_FIELDS = "appointmentid,subject,starttime,endtime,statuscode,location"
+MESSAGE_LIST_FIELDS = ("MessageID,ClientName,Email,MessageSubject,MessageType,"
+                       "MessageStatus,ScheduledTimestamp,Sent")
+MESSAGE_LOG_FIELDS = "id,message_id,message_type,recipient,subject,provider,status,created_at"
+
+# search_clients filters; @term is bound per call as a parameter alias
+ACCOUNT_SEARCH_FILTER = "contains(name,@term) or contains(emailaddress1,@term) or contains(telephone1,@term)"
+CONTACT_SEARCH_FILTER = ("contains(firstname,@term) or contains(lastname,@term)"
+                         " or contains(emailaddress1,@term) or contains(telephone1,@term)")
+
+@dataclass(slots=True)
+class ClientRow:
+    """One client (account or contact) as returned by list_clients/search_clients"""
+    id: str
+    type: str
+    name: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    
+    @classmethod
+    def from_account(cls, row: Dict[str, Any]) -> "ClientRow":
+        return cls(
+            id=row['accountid'],
+            type='account',
+            name=row.get('name') or '',
+            email=row.get('emailaddress1'),
+            phone=row.get('telephone1'),
+            city=row.get('address1_city'),
+            state=row.get('address1_stateorprovince'),
+        )
+    
+    @classmethod
+    def from_search_hit(cls, hit: Dict[str, Any]) -> "ClientRow":
+        """Map a Dataverse Search hit on account or contact"""
+        if hit['@search.entityname'] == 'account':
+            return cls.from_account({**hit, 'accountid': hit['@search.objectid']})
+        return cls.from_contact({**hit, 'contactid': hit['@search.objectid']})
+    
+    @classmethod
+    def from_contact(cls, row: Dict[str, Any]) -> "ClientRow":
+        return cls(
+            id=row['contactid'],
+            type='contact',
+            name=f"{row.get('firstname') or ''} {row.get('lastname') or ''}".strip(),
+            email=row.get('emailaddress1'),
+            phone=row.get('telephone1'),
+            city=row.get('address1_city'),
+            state=row.get('address1_stateorprovince'),
+        )
+
+def _group_count_query(attr: str) -> Dict[str, str]:
+    """OData params for per-value row counts of one column, aggregated server-side"""
+    return {"$apply": f"groupby(({attr}),aggregate($count as count))"}
+
+def _group_counts(rows: List[Dict[str, Any]], attr: str) -> Dict[Any, int]:
+    """{value: count} from the rows of a _group_count_query response"""
+    return {row[attr]: row['count'] for row in rows}
+
+# (table, params) aggregate queries behind each statistics method, in result order
+CLIENT_STATS_QUERIES = [
+    ('account', _group_count_query('statuscode')),
+    ('contact', _group_count_query('statuscode')),
+]
+SESSION_STATS_QUERIES = [
+    ('appointment', _group_count_query('statuscode')),
+    ('appointment', {"$apply": "filter(starttime ge 2024-01-01)/aggregate($count as count)"}),
+]
+MESSAGE_STATS_QUERIES = [
+    ('cre92_scheduledmessage', _group_count_query('MessageStatus')),
+    ('messages_log', _group_count_query('status')),
+]
+
+def _client_stats(account_stats: List[Dict[str, Any]], contact_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    account_statuses = _group_counts(account_stats, 'statuscode')
+    contact_statuses = _group_counts(contact_stats, 'statuscode')
+    total_accounts = sum(account_statuses.values())
+    total_contacts = sum(contact_statuses.values())
+    return {
+        'total_clients': total_accounts + total_contacts,
+        'total_accounts': total_accounts,
+        'total_contacts': total_contacts,
+        'account_statuses': account_statuses,
+        'contact_statuses': contact_statuses
+    }
+
+def _session_stats(status_stats: List[Dict[str, Any]], date_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    status_breakdown = _group_counts(status_stats, 'statuscode')
+    return {
+        'total_sessions': sum(status_breakdown.values()),
+        'status_breakdown': status_breakdown,
+        'recent_sessions': date_stats[0]['count'] if date_stats else 0
+    }
+
+def _message_stats(scheduled_stats: List[Dict[str, Any]], log_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    status_breakdown = _group_counts(scheduled_stats, 'MessageStatus')
+    log_statuses = _group_counts(log_stats, 'status')
+    return {
+        'total_scheduled': sum(status_breakdown.values()),
+        'status_breakdown': status_breakdown,
+        'total_sent': log_statuses.get('success', 0),
+        'total_failed': log_statuses.get('failed', 0)
+    }
+
+@dataclass(frozen=True, slots=True)
+class Keyset:
+    """Sort order for keyset pagination: a sort column plus the primary key to break ties"""
+    table: str
+    key: str
+    id_attr: str
+    descending: bool = False
+    quoted: bool = False  # string sort keys need quoting; date/number literals do not
+
+SESSION_KEYSET = Keyset('appointment', 'starttime', 'appointmentid', descending=True)
+ACCOUNT_KEYSET = Keyset('account', 'name', 'accountid', quoted=True)
+CONTACT_KEYSET = Keyset('contact', 'lastname', 'contactid', quoted=True)
+MESSAGE_KEYSET = Keyset('cre92_scheduledmessage', 'ScheduledTimestamp', 'cre92_scheduledmessageid', descending=True)
+
+def _keyset_query(keyset: Keyset, select: str, page_size: int,
+                  last: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """OData params for the page after `last` (the first page when None)
+
+    Rows whose sort key is null have no position in the order and are skipped.
+    """
+    direction, op = (' desc', 'lt') if keyset.descending else ('', 'gt')
+    if keyset.id_attr not in select.split(','):
+        select = f"{select},{keyset.id_attr}"
+    conditions = [f"{keyset.key} ne null"]
+    if last is not None:
+        value = odata_literal(last[keyset.key]) if keyset.quoted else last[keyset.key]
+        conditions.append(f"({keyset.key} {op} {value} or "
+                          f"({keyset.key} eq {value} and {keyset.id_attr} {op} {last[keyset.id_attr]}))")
+    return {
+        "$select": select,
+        "$filter": " and ".join(conditions),
+        "$orderby": f"{keyset.key}{direction},{keyset.id_attr}{direction}",
+        "$top": page_size,
+    }
+
 class DataverseOperations:
     """Core Dataverse operations for real environment"""
     
@@ -21,6 +175,7 @@ class DataverseOperations:
         """Initialize with real Dataverse environment"""
         self.client = get_dataverse_client()
         self.environment = os.environ.get('ENVIRONMENT', 'production')
+        self._client_types: Dict[str, tuple[float, str]] = {}  # client ID -> (expires at, 'account'|'contact')
         
         logger.info("Dataverse operations initialized", 
                    environment=self.environment)
@@ -29,36 +184,31 @@ class DataverseOperations:
     # TABLE DISCOVERY & SCHEMA
     # ============================================================================
     
-    async def list_tables(self) -> List[Dict[str, Any]]:
-        """List all available tables in the environment"""
+    async def list_tables(self, include_counts: bool = False) -> List[Dict[str, Any]]:
+        """List all available tables in the environment
+        
+        row_count is None unless include_counts is set; counting costs one
+        RetrieveTotalRecordCount call per COUNT_CHUNK_SIZE tables.
+        """
         try:
-            logger.info("Listing all tables")
+            logger.info("Listing all tables", include_counts=include_counts)
             
             # Get all tables
             tables = await self.client.list_tables()
             
-            # Get row counts for each table
+            # Row counts for all tables, ten per request
+            counts = await self.get_table_counts_bulk([table['name'] for table in tables]) if include_counts else None
+            
             table_info = []
             for table in tables:
-                try:
-                    count = await self.get_table_count(table['name'])
-                    table_info.append({
-                        'name': table['name'],
-                        'display_name': table.get('display_name', table['name']),
-                        'description': table.get('description', ''),
-                        'row_count': count,
-                        'is_custom': table.get('is_custom', False)
-                    })
-                except Exception as e:
-                    logger.warning("Could not get count for table", 
-                                 table=table['name'], error=str(e))
-                    table_info.append({
-                        'name': table['name'],
-                        'display_name': table.get('display_name', table['name']),
-                        'description': table.get('description', ''),
-                        'row_count': 'unknown',
-                        'is_custom': table.get('is_custom', False)
-                    })
+                count = counts.get(table['name'], 'unknown') if counts is not None else None
+                table_info.append({
+                    'name': table['name'],
+                    'display_name': table.get('display_name', table['name']),
+                    'description': table.get('description', ''),
+                    'row_count': count,
+                    'is_custom': table.get('is_custom', False)
+                })
             
             logger.info("Tables listed successfully", count=len(table_info))
             return table_info
@@ -84,12 +234,34 @@ class DataverseOperations:
                         table=table_name, error=str(e))
             raise
     
+    async def get_table_counts_bulk(self, table_names: List[str]) -> Dict[str, int]:
+        """Snapshot row counts via RetrieveTotalRecordCount, COUNT_CHUNK_SIZE tables per call
+        
+        Tables whose chunk fails are left out of the result.
+        """
+        chunks = [table_names[i:i + COUNT_CHUNK_SIZE] for i in range(0, len(table_names), COUNT_CHUNK_SIZE)]
+        sem = asyncio.Semaphore(COUNT_CONCURRENCY)
+        
+        async def _counts(chunk: List[str]) -> Dict[str, int]:
+            async with sem:
+                return await self.client.retrieve_total_record_count(chunk)
+        
+        results = await asyncio.gather(*(_counts(chunk) for chunk in chunks), return_exceptions=True)
+        counts: Dict[str, int] = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                logger.warning("Could not get counts for tables", tables=chunk, error=str(result))
+                continue
+            counts.update(result)
+        return counts
+    
     async def get_table_count(self, table_name: str) -> int:
         """Get row count for a specific table"""
         try:
-            # Use a simple query to get count
-            query = f"SELECT COUNT(*) as count FROM {table_name}"
-            result = await self.client.execute_query(query)
+            # Server-side aggregate: a single {"count": N} row
+            result = await self.client.execute_query(table_name, {
+                "$apply": "aggregate($count as count)"
+            })
             
             if result and len(result) > 0:
                 return result[0].get('count', 0)
@@ -100,69 +272,62 @@ class DataverseOperations:
                         table=table_name, error=str(e))
             raise
     
+    async def _iter_keyset(self, keyset: Keyset, select: str,
+                           page_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of a table in keyset order, fetching the next page while the caller consumes this one
+
+        Each page filters past the last row seen instead of re-reading and dropping
+        earlier rows, so deep pages cost the same as the first.
+        """
+        logger.info("Paging table", table=keyset.table, page_size=page_size)
+        pending: Optional[asyncio.Task] = asyncio.create_task(
+            self.client.execute_query(keyset.table, _keyset_query(keyset, select, page_size))
+        )
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+                if page and len(page) == page_size:
+                    pending = asyncio.create_task(
+                        self.client.execute_query(keyset.table, _keyset_query(keyset, select, page_size, page[-1]))
+                    )
+                if page:
+                    yield page
+        finally:
+            if pending is not None:
+                pending.cancel()
+    
     # ============================================================================
     # CLIENT/CONTACT OPERATIONS
     # ============================================================================
     
-    async def list_clients(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    async def list_clients(self, limit: int = 100, offset: int = 0) -> List[ClientRow]:
         """List all client/contact records"""
         try:
             logger.info("Listing clients", limit=limit, offset=offset)
             
-            # Query both account and contact tables
-            account_query = f"""
-            SELECT 
-                accountid, name, emailaddress1, telephone1, 
-                address1_city, address1_stateorprovince, statuscode,
-                createdon, modifiedon
-            FROM account 
-            ORDER BY name
-            LIMIT {limit} OFFSET {offset}
-            """
-            
-            contact_query = f"""
-            SELECT 
-                contactid, firstname, lastname, emailaddress1, telephone1,
-                address1_city, address1_stateorprovince, statuscode,
-                createdon, modifiedon
-            FROM contact 
-            ORDER BY lastname, firstname
-            LIMIT {limit} OFFSET {offset}
-            """
-            
-            accounts = await self.client.execute_query(account_query)
-            contacts = await self.client.execute_query(contact_query)
+            # Query both account and contact tables in one $batch (Dataverse has no $skip: fetch offset+limit, drop offset)
+            account_query = {
+                "$select": ACCOUNT_LIST_FIELDS,
+                "$orderby": "name",
+                "$top": offset + limit,
+            }
             
-            # Combine and format results
-            clients = []
-            
-            for account in accounts:
-                clients.append({
-                    'id': account['accountid'],
-                    'type': 'account',
-                    'name': account['name'],
-                    'email': account.get('emailaddress1'),
-                    'phone': account.get('telephone1'),
-                    'city': account.get('address1_city'),
-                    'state': account.get('address1_stateorprovince'),
-                    'status': account.get('statuscode'),
-                    'created': account.get('createdon'),
-                    'modified': account.get('modifiedon')
-                })
+            contact_query = {
+                "$select": CONTACT_LIST_FIELDS,
+                "$orderby": "lastname,firstname",
+                "$top": offset + limit,
+            }
             
-            for contact in contacts:
-                clients.append({
-                    'id': contact['contactid'],
-                    'type': 'contact',
-                    'name': f"{contact.get('firstname', '')} {contact.get('lastname', '')}".strip(),
-                    'email': contact.get('emailaddress1'),
-                    'phone': contact.get('telephone1'),
-                    'city': contact.get('address1_city'),
-                    'state': contact.get('address1_stateorprovince'),
-                    'status': contact.get('statuscode'),
-                    'created': contact.get('createdon'),
-                    'modified': contact.get('modifiedon')
-                })
+            accounts, contacts = await self.client.execute_batch([
+                ('account', account_query),
+                ('contact', contact_query),
+            ])
+            accounts, contacts = accounts[offset:], contacts[offset:]
+            
+            # Combine and format results
+            clients = [ClientRow.from_account(a) for a in accounts]
+            clients += [ClientRow.from_contact(c) for c in contacts]
             
             logger.info("Clients listed successfully", 
                        count=len(clients), 
@@ -174,6 +339,25 @@ class DataverseOperations:
             logger.error("Failed to list clients", error=str(e))
             raise
     
+    async def iter_accounts(self, page_size: int = 100) -> AsyncIterator[List[ClientRow]]:
+        """Yield pages of accounts ordered by name"""
+        async for page in self._iter_keyset(ACCOUNT_KEYSET, ACCOUNT_LIST_FIELDS, page_size):
+            yield [ClientRow.from_account(a) for a in page]
+    
+    async def iter_contacts(self, page_size: int = 100) -> AsyncIterator[List[ClientRow]]:
+        """Yield pages of contacts ordered by last name"""
+        async for page in self._iter_keyset(CONTACT_KEYSET, CONTACT_LIST_FIELDS, page_size):
+            yield [ClientRow.from_contact(c) for c in page]
+    
+    async def stream_clients(self, page_size: int = STREAM_PAGE_SIZE) -> AsyncIterator[ClientRow]:
+        """Yield every account, then every contact, one row at a time"""
+        async for page in self.iter_accounts(page_size):
+            for row in page:
+                yield row
+        async for page in self.iter_contacts(page_size):
+            for row in page:
+                yield row
+    
     async def get_client_details(self, client_id: str, client_type: str = 'auto') -> Optional[Dict[str, Any]]:
         """Get detailed information for a specific client"""
         try:
@@ -181,40 +365,32 @@ class DataverseOperations:
             
             # Determine table based on ID or type
             if client_type == 'auto':
-                # Try to determine from ID format or query both
-                account_query = f"SELECT * FROM account WHERE accountid eq '{client_id}'"
-                contact_query = f"SELECT * FROM contact WHERE contactid eq '{client_id}'"
-                
-                try:
-                    account_result = await self.client.execute_query(account_query)
-                    if account_result:
-                        return {
-                            'type': 'account',
-                            'data': account_result[0]
-                        }
-                except:
-                    pass
-                
-                try:
-                    contact_result = await self.client.execute_query(contact_query)
-                    if contact_result:
+                client_type = self._known_client_type(client_id)
+            if client_type == 'auto':
+                # The ID could be either; look it up in both tables at once, account first
+                account_result, contact_result = await asyncio.gather(
+                    self.client.get_record('account', client_id, select=ACCOUNT_DETAIL_FIELDS),
+                    self.client.get_record('contact', client_id, select=CONTACT_DETAIL_FIELDS),
+                    return_exceptions=True,
+                )
+                for found_type, result in (('account', account_result), ('contact', contact_result)):
+                    if result and not isinstance(result, BaseException):
+                        self._remember_client_type(client_id, found_type)
                         return {
-                            'type': 'contact',
-                            'data': contact_result[0]
+                            'type': found_type,
+                            'data': result
                         }
-                except:
-                    pass
                 
                 return None
             else:
                 table_name = 'account' if client_type == 'account' else 'contact'
-                query = f"SELECT * FROM {table_name} WHERE {table_name}id eq '{client_id}'"
-                result = await self.client.execute_query(query)
+                select = ACCOUNT_DETAIL_FIELDS if table_name == 'account' else CONTACT_DETAIL_FIELDS
+                result = await self.client.get_record(table_name, client_id, select=select)
                 
                 if result:
                     return {
                         'type': client_type,
-                        'data': result[0]
+                        'data': result
                     }
                 return None
                 
@@ -223,66 +399,53 @@ class DataverseOperations:
                         client_id=client_id, error=str(e))
             raise
     
-    async def search_clients(self, search_term: str, limit: int = 50) -> List[Dict[str, Any]]:
+    def _known_client_type(self, client_id: str) -> str:
+        """Table a client ID was last found in, or 'auto' if unknown or expired"""
+        hit = self._client_types.get(client_id.lower())
+        if hit is None or hit[0] <= time.monotonic():
+            return 'auto'
+        return hit[1]
+    
+    def _remember_client_type(self, client_id: str, client_type: str) -> None:
+        if len(self._client_types) >= CLIENT_TYPE_CACHE_SIZE:
+            del self._client_types[next(iter(self._client_types))]  # evict the oldest entry
+        self._client_types[client_id.lower()] = (time.monotonic() + CLIENT_TYPE_TTL_S, client_type)
+    
+    async def search_clients(self, search_term: str, limit: int = 50) -> List[ClientRow]:
         """Search clients by name, email, or phone"""
         try:
             logger.info("Searching clients", search_term=search_term, limit=limit)
             
-            # Search in both account and contact tables
-            account_query = f"""
-            SELECT 
-                accountid, name, emailaddress1, telephone1, 
-                address1_city, address1_stateorprovince, statuscode
-            FROM account 
-            WHERE contains(name, '{search_term}') 
-               OR contains(emailaddress1, '{search_term}')
-               OR contains(telephone1, '{search_term}')
-            ORDER BY name
-            LIMIT {limit}
-            """
-            
-            contact_query = f"""
-            SELECT 
-                contactid, firstname, lastname, emailaddress1, telephone1,
-                address1_city, address1_stateorprovince, statuscode
-            FROM contact 
-            WHERE contains(firstname, '{search_term}') 
-               OR contains(lastname, '{search_term}')
-               OR contains(emailaddress1, '{search_term}')
-               OR contains(telephone1, '{search_term}')
-            ORDER BY lastname, firstname
-            LIMIT {limit}
-            """
-            
-            accounts = await self.client.execute_query(account_query)
-            contacts = await self.client.execute_query(contact_query)
+            if os.environ.get('DATAVERSE_SEARCH_ENABLED', 'false').lower() == 'true':
+                # One indexed query over both tables instead of contains() scans
+                hits = await self.client.dataverse_search(search_term, entities=['account', 'contact'], top=limit)
+                results = [ClientRow.from_search_hit(hit) for hit in hits]
+                logger.info("Client search completed", results=len(results), source="dataverse_search")
+                return results
+            
+            # Search both tables in one $batch; the term is bound to @term, never spliced in
+            account_query = {
+                "$select": ACCOUNT_LIST_FIELDS,
+                "$filter": ACCOUNT_SEARCH_FILTER,
+                "$orderby": "name",
+                "$top": limit,
+            }
             
-            # Format results
-            results = []
-            
-            for account in accounts:
-                results.append({
-                    'id': account['accountid'],
-                    'type': 'account',
-                    'name': account['name'],
-                    'email': account.get('emailaddress1'),
-                    'phone': account.get('telephone1'),
-                    'city': account.get('address1_city'),
-                    'state': account.get('address1_stateorprovince'),
-                    'status': account.get('statuscode')
-                })
+            contact_query = {
+                "$select": CONTACT_LIST_FIELDS,
+                "$filter": CONTACT_SEARCH_FILTER,
+                "$orderby": "lastname,firstname",
+                "$top": limit,
+            }
             
-            for contact in contacts:
-                results.append({
-                    'id': contact['contactid'],
-                    'type': 'contact',
-                    'name': f"{contact.get('firstname', '')} {contact.get('lastname', '')}".strip(),
-                    'email': contact.get('emailaddress1'),
-                    'phone': contact.get('telephone1'),
-                    'city': contact.get('address1_city'),
-                    'state': contact.get('address1_stateorprovince'),
-                    'status': contact.get('statuscode')
-                })
+            accounts, contacts = await self.client.execute_batch(
+                [('account', account_query), ('contact', contact_query)],
+                aliases={"term": search_term},
+            )
+            
+            # Format results
+            results = [ClientRow.from_account(a) for a in accounts]
+            results += [ClientRow.from_contact(c) for c in contacts]
             
             logger.info("Client search completed", 
                        results=len(results), 
@@ -299,22 +462,19 @@ class DataverseOperations:
     # SESSION/APPOINTMENT OPERATIONS
     # ============================================================================
     
-    async def list_sessions(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    async def list_sessions(self, limit: int = 100, offset: int = 0,
+                            select: str = SESSION_LIST_FIELDS) -> List[Dict[str, Any]]:
         """List all session/appointment records"""
         try:
             logger.info("Listing sessions", limit=limit, offset=offset)
             
-            query = f"""
-            SELECT 
-                appointmentid, subject, starttime, endtime, 
-                _regardingobjectid_value, regardingobjectid,
-                statuscode, description, location
-            FROM appointment 
-            ORDER BY starttime DESC
-            LIMIT {limit} OFFSET {offset}
-            """
+            query = {
+                "$select": select,
+                "$orderby": "starttime desc",
+                "$top": offset + limit,
+            }
             
-            result = await self.client.execute_query(query)
+            result = (await self.client.execute_query('appointment', query))[offset:]
             
             logger.info("Sessions listed successfully", count=len(result))
             return result
@@ -323,17 +483,29 @@ class DataverseOperations:
             logger.error("Failed to list sessions", error=str(e))
             raise
     
+    async def iter_sessions(self, page_size: int = 100,
+                            select: str = SESSION_LIST_FIELDS) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of sessions, newest first"""
+        async for page in self._iter_keyset(SESSION_KEYSET, select, page_size):
+            yield page
+    
+    async def stream_sessions(self, page_size: int = STREAM_PAGE_SIZE,
+                              select: str = SESSION_LIST_FIELDS) -> AsyncIterator[Dict[str, Any]]:
+        """Yield sessions one at a time, newest first, holding at most two pages in memory"""
+        async for page in self.iter_sessions(page_size, select):
+            for row in page:
+                yield row
+    
     async def get_session_details(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information for a specific session"""
         try:
             logger.info("Getting session details", session_id=session_id)
             
-            query = f"SELECT * FROM appointment WHERE appointmentid eq '{session_id}'"
-            result = await self.client.execute_query(query)
+            result = await self.client.get_record('appointment', session_id)
             
             if result:
                 logger.info("Session details retrieved", session_id=session_id)
-                return result[0]
+                return result
             return None
             
         except Exception as e:
@@ -345,22 +517,19 @@ class DataverseOperations:
     # MESSAGE OPERATIONS
     # ============================================================================
     
-    async def list_scheduled_messages(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    async def list_scheduled_messages(self, limit: int = 100, offset: int = 0,
+                                      select: str = MESSAGE_LIST_FIELDS) -> List[Dict[str, Any]]:
         """List all scheduled messages"""
         try:
             logger.info("Listing scheduled messages", limit=limit, offset=offset)
             
-            query = f"""
-            SELECT 
-                cre92_scheduledmessageid, MessageID, ClientName, Email,
-                MessageStatus, MessageSubject, MessageText, MessageType,
-                ScheduledTimestamp, Sent, SentAt, CreatedOn, ModifiedOn
-            FROM cre92_scheduledmessage 
-            ORDER BY ScheduledTimestamp DESC
-            LIMIT {limit} OFFSET {offset}
-            """
+            query = {
+                "$select": select,
+                "$orderby": "ScheduledTimestamp desc",
+                "$top": offset + limit,
+            }
             
-            result = await self.client.execute_query(query)
+            result = (await self.client.execute_query('cre92_scheduledmessage', query))[offset:]
             
             logger.info("Scheduled messages listed successfully", count=len(result))
             return result
@@ -369,21 +538,32 @@ class DataverseOperations:
             logger.error("Failed to list scheduled messages", error=str(e))
             raise
     
-    async def get_message_logs(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    async def iter_scheduled_messages(self, page_size: int = 100,
+                                      select: str = MESSAGE_LIST_FIELDS) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of scheduled messages, latest first"""
+        async for page in self._iter_keyset(MESSAGE_KEYSET, select, page_size):
+            yield page
+    
+    async def stream_scheduled_messages(self, page_size: int = STREAM_PAGE_SIZE,
+                                        select: str = MESSAGE_LIST_FIELDS) -> AsyncIterator[Dict[str, Any]]:
+        """Yield scheduled messages one at a time, latest first, holding at most two pages in memory"""
+        async for page in self.iter_scheduled_messages(page_size, select):
+            for row in page:
+                yield row
+    
+    async def get_message_logs(self, limit: int = 100, offset: int = 0,
+                               select: str = MESSAGE_LOG_FIELDS) -> List[Dict[str, Any]]:
         """List message delivery logs"""
         try:
             logger.info("Listing message logs", limit=limit, offset=offset)
             
-            query = f"""
-            SELECT 
-                id, message_id, message_type, recipient, subject,
-                provider, external_id, status, created_at
-            FROM messages_log 
-            ORDER BY created_at DESC
-            LIMIT {limit} OFFSET {offset}
-            """
+            query = {
+                "$select": select,
+                "$orderby": "created_at desc",
+                "$top": offset + limit,
+            }
             
-            result = await self.client.execute_query(query)
+            result = (await self.client.execute_query('messages_log', query))[offset:]
             
             logger.info("Message logs listed successfully", count=len(result))
             return result
@@ -401,36 +581,8 @@ class DataverseOperations:
         try:
             logger.info("Getting client statistics")
             
-            # Account statistics
-            account_stats_query = """
-            SELECT 
-                statuscode, COUNT(*) as count
-            FROM account 
-            GROUP BY statuscode
-            """
-            
-            # Contact statistics
-            contact_stats_query = """
-            SELECT 
-                statuscode, COUNT(*) as count
-            FROM contact 
-            GROUP BY statuscode
-            """
-            
-            account_stats = await self.client.execute_query(account_stats_query)
-            contact_stats = await self.client.execute_query(contact_stats_query)
-            
-            # Total counts
-            total_accounts = sum(stat['count'] for stat in account_stats)
-            total_contacts = sum(stat['count'] for stat in contact_stats)
-            
-            stats = {
-                'total_clients': total_accounts + total_contacts,
-                'total_accounts': total_accounts,
-                'total_contacts': total_contacts,
-                'account_statuses': {stat['statuscode']: stat['count'] for stat in account_stats},
-                'contact_statuses': {stat['statuscode']: stat['count'] for stat in contact_stats}
-            }
+            # Per-status counts for accounts and contacts, in one $batch round-trip
+            stats = _client_stats(*await self.client.execute_batch(CLIENT_STATS_QUERIES))
             
             logger.info("Client statistics retrieved", stats=stats)
             return stats
@@ -444,30 +596,7 @@ class DataverseOperations:
         try:
             logger.info("Getting session statistics")
             
-            # Status statistics
-            status_stats_query = """
-            SELECT 
-                statuscode, COUNT(*) as count
-            FROM appointment 
-            GROUP BY statuscode
-            """
-            
-            # Date range statistics (last 30 days)
-            date_stats_query = """
-            SELECT 
-                COUNT(*) as count
-            FROM appointment 
-            WHERE starttime ge 2024-01-01
-            """
-            
-            status_stats = await self.client.execute_query(status_stats_query)
-            date_stats = await self.client.execute_query(date_stats_query)
-            
-            stats = {
-                'total_sessions': sum(stat['count'] for stat in status_stats),
-                'status_breakdown': {stat['statuscode']: stat['count'] for stat in status_stats},
-                'recent_sessions': date_stats[0]['count'] if date_stats else 0
-            }
+            stats = _session_stats(*await self.client.execute_batch(SESSION_STATS_QUERIES))
             
             logger.info("Session statistics retrieved", stats=stats)
             return stats
@@ -481,38 +610,37 @@ class DataverseOperations:
         try:
             logger.info("Getting message statistics")
             
-            # Scheduled message statistics
-            scheduled_stats_query = """
-            SELECT 
-                MessageStatus, COUNT(*) as count
-            FROM cre92_scheduledmessage 
-            GROUP BY MessageStatus
-            """
-            
-            # Message log statistics
-            log_stats_query = """
-            SELECT 
-                status, COUNT(*) as count
-            FROM messages_log 
-            GROUP BY status
-            """
-            
-            scheduled_stats = await self.client.execute_query(scheduled_stats_query)
-            log_stats = await self.client.execute_query(log_stats_query)
+            stats = _message_stats(*await self.client.execute_batch(MESSAGE_STATS_QUERIES))
+            
+            logger.info("Message statistics retrieved", stats=stats)
+            return stats
+            
+        except Exception as e:
+            logger.error("Failed to get message statistics", error=str(e))
+            raise
+    
+    async def get_all_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Client, session and message statistics from a single $batch round-trip"""
+        try:
+            logger.info("Getting all statistics")
             
+            rows = await self.client.execute_batch(
+                [*CLIENT_STATS_QUERIES, *SESSION_STATS_QUERIES, *MESSAGE_STATS_QUERIES]
+            )
             stats = {
-                'total_scheduled': sum(stat['count'] for stat in scheduled_stats),
-                'status_breakdown': {stat['MessageStatus']: stat['count'] for stat in scheduled_stats},
-                'total_sent': sum(stat['count'] for stat in log_stats if stat['status'] == 'success'),
-                'total_failed': sum(stat['count'] for stat in log_stats if stat['status'] == 'failed')
+                'clients': _client_stats(*rows[0:2]),
+                'sessions': _session_stats(*rows[2:4]),
+                'messages': _message_stats(*rows[4:6]),
             }
             
-            logger.info("Message statistics retrieved", stats=stats)
+            logger.info("All statistics retrieved", stats=stats)
             return stats
             
         except Exception as e:
-            logger.error("Failed to get message statistics", error=str(e))
+            logger.error("Failed to get all statistics", error=str(e))
             raise
 
-# Global instance for easy access
-dataverse_operations = DataverseOperations()
+@lru_cache(maxsize=1)
+def get_operations() -> DataverseOperations:
+    """Return the shared DataverseOperations, created on first use"""
+    return DataverseOperations()
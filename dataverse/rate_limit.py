@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Client-side rate limiting for Dataverse calls
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from typing import Any, Callable
+
+# Dataverse service protection allows 6000 requests per user per 5 minutes (20/s);
+# stay at that rate, with bursts up to the 52-concurrent-request limit
+DV_RATE_PER_S = 20.0
+DV_BURST = 50
+
+
+class TokenBucket:
+    """Async token bucket: bursts of up to `capacity` calls, refilled at `rate` per second"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until one is available"""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def __call__(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs) -> Any:
+            await self.acquire()
+            return await fn(*args, **kwargs)
+
+        return wrapper
+
+
+# Singleton limiter for Dataverse
+dataverse_limiter = TokenBucket(rate=DV_RATE_PER_S, capacity=DV_BURST)
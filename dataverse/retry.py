@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Retries with jittered exponential backoff for Dataverse calls
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable
+
+import httpx
+import structlog
+
+MAX_BACKOFF_S = 30.0  # cap for the jittered retry backoff
+
+_logger = structlog.get_logger(__name__)
+
+def retry_after_s(response: httpx.Response | None) -> float:
+    """Seconds from a Retry-After header (Dataverse sends it with 429/503), else 0"""
+    if response is None:
+        return 0.0
+    try:
+        return float(response.headers.get("Retry-After", 0))
+    except ValueError:
+        return 0.0  # HTTP-date form; fall back to our own backoff
+
+async def with_retry(fn: Callable[[], Awaitable[Any]], max_retries: int = 3, backoff_factor: float = 2.0,
+                     idempotent: bool = True) -> Any:
+    """Await fn() with full-jitter exponential backoff for transient errors (timeouts, 429, 5xx).
+
+    A non-idempotent request (a create) may already have been committed when a read
+    timeout or 5xx comes back, so it is only retried when the server cannot have run
+    it: a failed connect, or a 429 throttle.
+    """
+    last_exc: Exception | None = None
+    for attempt in range(max_retries):
+        retry_after = 0.0
+        try:
+            start = time.monotonic_ns()
+            result = await fn()
+            # Per-call success is debug-level so the default INFO config drops it early
+            _logger.debug("dv_call_success", attempt=attempt + 1,
+                          duration_ms=(time.monotonic_ns() - start) // 1_000_000)
+            return result
+        except (httpx.TimeoutException, httpx.ConnectError) as exc:
+            if not idempotent and not isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout)):
+                _logger.error("dv_call_not_retried", error=str(exc))
+                raise
+            last_exc = exc
+            _logger.warning("dv_call_transient_error", attempt=attempt + 1, error=str(exc))
+        except httpx.HTTPStatusError as exc:
+            # Retry only on throttling (429) and 5xx
+            status = exc.response.status_code if exc.response is not None else None
+            if status == 429 or (idempotent and status is not None and 500 <= status < 600):
+                last_exc = exc
+                retry_after = retry_after_s(exc.response)
+                _logger.warning("dv_call_5xx" if status != 429 else "dv_call_throttled",
+                                attempt=attempt + 1, status_code=status)
+            else:
+                _logger.error("dv_call_http_error", status_code=status)
+                raise
+        if attempt < max_retries - 1:
+            wait_s = max(random.uniform(0, min(MAX_BACKOFF_S, backoff_factor ** attempt)), retry_after)
+            _logger.info("dv_call_retry", next_backoff_s=round(wait_s, 3))
+            await asyncio.sleep(wait_s)
+    assert last_exc is not None
+    _logger.error("dv_call_failed", error=str(last_exc))
+    raise last_exc
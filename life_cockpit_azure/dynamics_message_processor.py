@@ -12,7 +12,7 @@ from datetime import datetime, timedelta
 import structlog
 from utils.guardrails import safe_operation, Classification, create_run_id
 from utils.sandbox import get_sandbox_dataverse
-from azure.messaging import MessagingFactory
+from life_cockpit_azure.messaging import MessagingFactory
 
 logger = structlog.get_logger()
 
@@ -252,10 +252,11 @@ class DynamicsMessageProcessor:
     async def _mark_dynamics_message_sent(self, message_id: str, external_id: Optional[str] = None):
         """Mark Dynamics message as sent"""
         try:
+            now = datetime.utcnow().isoformat()
             update_data = {
                 'Sent': True,
-                'SentAt': datetime.utcnow().isoformat(),
-                'ModifiedOn': datetime.utcnow().isoformat()
+                'SentAt': now,
+                'ModifiedOn': now
             }
             
             # Store external ID in a custom field or metadata
@@ -308,6 +309,7 @@ class DynamicsMessageProcessorCLI:
     async def test_processing(self) -> Dict[str, Any]:
         """Test Dynamics message processing with sample data"""
         # Create test Dynamics messages in sandbox
+        now = datetime.utcnow().isoformat()
         test_messages = [
             {
                 'MessageID': 'test-dynamics-1',
@@ -317,7 +319,7 @@ class DynamicsMessageProcessorCLI:
                 'MessageSubject': 'Test Email from Dynamics',
                 'MessageText': 'This is a test email message from Dynamics.',
                 'MessageType': 'email',
-                'ScheduledTimestamp': datetime.utcnow().isoformat(),
+                'ScheduledTimestamp': now,
                 'Sent': False
             },
             {
@@ -328,7 +330,7 @@ class DynamicsMessageProcessorCLI:
                 'MessageSubject': 'Another Test Email',
                 'MessageText': 'This is another test email from Dynamics.',
                 'MessageType': 'email',
-                'ScheduledTimestamp': datetime.utcnow().isoformat(),
+                'ScheduledTimestamp': now,
                 'Sent': False
             }
         ]
@@ -4,10 +4,10 @@ import asyncio
 import os
 import sys
 
-# Add the parent directory to the path to import our modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+# Add the repo root to the path to import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
-from azure.dynamics_message_processor import dynamics_message_processor
+from life_cockpit_azure.dynamics_message_processor import dynamics_message_processor
 
 async def main(timer: func.TimerRequest) -> None:
     """Process Dynamics messages every 5 minutes"""
@@ -5,11 +5,11 @@ import asyncio
 import os
 import sys
 
-# Add the parent directory to the path to import our modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+# Add the repo root to the path to import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
-from azure.dynamics_message_processor import dynamics_message_processor
-from azure.messaging import MessagingFactory
+from life_cockpit_azure.dynamics_message_processor import dynamics_message_processor
+from life_cockpit_azure.messaging import MessagingFactory
 
 async def main(req: func.HttpRequest, action: str) -> func.HttpResponse:
     """Handle webhook requests for various actions"""
@@ -13,7 +13,7 @@ from datetime import datetime, timedelta
 import structlog
 from utils.guardrails import safe_operation, Classification, create_run_id
 from utils.sandbox import get_sandbox_dataverse
-from azure.messaging import MessagingFactory
+from life_cockpit_azure.messaging import MessagingFactory
 
 logger = structlog.get_logger()
 
@@ -224,10 +224,11 @@ class MessageProcessor:
     async def _mark_message_sent(self, message_id: str, external_id: Optional[str] = None):
         """Mark message as sent in scheduled_messages table"""
         try:
+            now = datetime.utcnow().isoformat()
             update_data = {
                 'status': 'sent',
-                'processed_time': datetime.utcnow().isoformat(),
-                'updated_at': datetime.utcnow().isoformat()
+                'processed_time': now,
+                'updated_at': now
             }
             
             if external_id:
@@ -246,11 +247,12 @@ class MessageProcessor:
     async def _mark_message_failed(self, message_id: str, error_message: str):
         """Mark message as failed in scheduled_messages table"""
         try:
+            now = datetime.utcnow().isoformat()
             update_data = {
                 'status': 'failed',
                 'error_message': error_message,
-                'processed_time': datetime.utcnow().isoformat(),
-                'updated_at': datetime.utcnow().isoformat()
+                'processed_time': now,
+                'updated_at': now
             }
             
             await self.dataverse.update_record('scheduled_messages', message_id, update_data)
@@ -278,6 +280,7 @@ class MessageProcessorCLI:
     async def test_processing(self) -> Dict[str, Any]:
         """Test message processing with sample data"""
         # Create test messages in sandbox for all channels
+        now = datetime.utcnow().isoformat()
         test_messages = [
             {
                 'session_id': 'test-session-1',
@@ -286,7 +289,7 @@ class MessageProcessorCLI:
                 'recipient': 'test@example.com',
                 'subject': 'Test Email',
                 'body': 'This is a test email message.',
-                'send_time': datetime.utcnow().isoformat(),
+                'send_time': now,
                 'status': 'revised'
             },
             {
@@ -295,7 +298,7 @@ class MessageProcessorCLI:
                 'message_type': 'sms',
                 'recipient': '+1234567890',
                 'body': 'This is a test SMS message.',
-                'send_time': datetime.utcnow().isoformat(),
+                'send_time': now,
                 'status': 'revised'
             },
             {
@@ -304,7 +307,7 @@ class MessageProcessorCLI:
                 'message_type': 'teams',
                 'channel_id': 'test-channel-123',
                 'body': 'This is a test Teams message.',
-                'send_time': datetime.utcnow().isoformat(),
+                'send_time': now,
                 'status': 'revised'
             },
             {
@@ -313,7 +316,7 @@ class MessageProcessorCLI:
                 'message_type': 'telegram',
                 'chat_id': 'test-chat-456',
                 'body': 'This is a test Telegram message.',
-                'send_time': datetime.utcnow().isoformat(),
+                'send_time': now,
                 'status': 'revised'
             },
             {
@@ -322,7 +325,7 @@ class MessageProcessorCLI:
                 'message_type': 'whatsapp',
                 'recipient': '+1234567890',
                 'body': 'This is a test WhatsApp message.',
-                'send_time': datetime.utcnow().isoformat(),
+                'send_time': now,
                 'status': 'revised'
             }
         ]
@@ -4,7 +4,7 @@ Multi-Channel Messaging Factory
 Main entry point for the messaging system
 """
 
-from azure.messaging.factory import MessagingFactory
-from azure.messaging.base import MessageResult
+from life_cockpit_azure.messaging.factory import MessagingFactory
+from life_cockpit_azure.messaging.base import MessageResult
 
 __all__ = ['MessagingFactory', 'MessageResult']
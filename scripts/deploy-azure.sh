@@ -119,7 +119,7 @@ echo "   az keyvault secret set --vault-name $KEY_VAULT --name 'RESPOND-API-KEY'
 echo "   az keyvault secret set --vault-name $KEY_VAULT --name 'RESPOND-WORKSPACE-ID' --value 'your-workspace-id'"
 echo ""
 echo "2. Deploy the functions:"
-echo "   cd azure/functions"
+echo "   cd life_cockpit_azure/functions"
 echo "   func azure functionapp publish $FUNCTION_APP"
 echo ""
 echo "3. Test the deployment:"
@@ -0,0 +1,23 @@
+#!/bin/bash
+
+# Life Cockpit bytecode precompile
+# Compiles the CLI and its packages to .pyc so the first `blc` run skips compilation.
+# Meant for container/image builds, after copying the source tree.
+#
+# checked-hash .pyc files are validated against a hash of their source on import,
+# so later edits or pulls are always picked up (the stale .pyc is just recompiled).
+
+set -e
+
+ROOT="$(cd "$(dirname "$0")/.." && pwd)"
+
+python -m compileall -q -j0 --invalidation-mode=checked-hash \
+    "$ROOT/blc.py" \
+    "$ROOT/blc_lazy.py" \
+    "$ROOT/commands" \
+    "$ROOT/auth" \
+    "$ROOT/utils" \
+    "$ROOT/life_cockpit_azure" \
+    "$ROOT/dataverse"
+
+echo "✅ Precompiled Life Cockpit bytecode"
@@ -6,7 +6,7 @@ Test Dynamics Message Processor
 import asyncio
 import os
 from datetime import datetime
-from azure.dynamics_message_processor import dynamics_message_processor
+from life_cockpit_azure.dynamics_message_processor import dynamics_message_processor
 
 async def test_dynamics_processor():
     """Test the Dynamics message processor directly"""
@@ -14,6 +14,7 @@ async def test_dynamics_processor():
     print("🧪 Testing Dynamics Message Processor...")
     
     # Create test Dynamics messages
+    now = datetime.utcnow().isoformat()
     test_messages = [
         {
             'MessageID': 'test-dynamics-1',
@@ -23,7 +24,7 @@ async def test_dynamics_processor():
             'MessageSubject': 'Test Email from Dynamics',
             'MessageText': 'This is a test email message from Dynamics.',
             'MessageType': 'email',
-            'ScheduledTimestamp': datetime.utcnow().isoformat(),
+            'ScheduledTimestamp': now,
             'Sent': False
         },
         {
@@ -34,15 +35,15 @@ async def test_dynamics_processor():
             'MessageSubject': 'Another Test Email',
             'MessageText': 'This is another test email from Dynamics.',
             'MessageType': 'email',
-            'ScheduledTimestamp': datetime.utcnow().isoformat(),
+            'ScheduledTimestamp': now,
             'Sent': False
         }
     ]
     
     # Add test messages to sandbox
     print("📨 Creating test Dynamics messages...")
+    await dynamics_message_processor.dataverse.batch_create_records('cre92_scheduledmessage', test_messages)
     for message in test_messages:
-        await dynamics_message_processor.dataverse.create_record('cre92_scheduledmessage', message)
         print(f"✅ Created {message['MessageType']} message for {message['Email']}")
     
     # Process messages (dry run first)
@@ -7,7 +7,7 @@ import asyncio
 import os
 from datetime import datetime
 from utils.sandbox import get_sandbox_dataverse
-from azure.messaging import MessagingFactory
+from life_cockpit_azure.messaging import MessagingFactory
 
 async def test_dynamics_simple():
     """Test Dynamics message processing without guardrails"""
@@ -33,6 +33,7 @@ async def test_dynamics_simple():
     messaging_factory = MessagingFactory(messaging_config)
     
     # Create test Dynamics messages
+    now = datetime.utcnow().isoformat()
     test_messages = [
         {
             'MessageID': 'test-dynamics-1',
@@ -42,7 +43,7 @@ async def test_dynamics_simple():
             'MessageSubject': 'Test Email from Dynamics',
             'MessageText': 'This is a test email message from Dynamics.',
             'MessageType': 'email',
-            'ScheduledTimestamp': datetime.utcnow().isoformat(),
+            'ScheduledTimestamp': now,
             'Sent': False
         },
         {
@@ -53,15 +54,15 @@ async def test_dynamics_simple():
             'MessageSubject': 'Another Test Email',
             'MessageText': 'This is another test email from Dynamics.',
             'MessageType': 'email',
-            'ScheduledTimestamp': datetime.utcnow().isoformat(),
+            'ScheduledTimestamp': now,
             'Sent': False
         }
     ]
     
     # Add test messages to sandbox
     print("📨 Creating test Dynamics messages...")
+    await dataverse.batch_create_records('cre92_scheduledmessage', test_messages)
     for message in test_messages:
-        await dataverse.create_record('cre92_scheduledmessage', message)
         print(f"✅ Created {message['MessageType']} message for {message['Email']}")
     
     # Query pending messages
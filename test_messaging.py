@@ -5,8 +5,8 @@ Simple test script for messaging factory
 
 import asyncio
 import os
-from azure.messaging import MessagingFactory
-from azure.message_processor import MessageProcessor
+from life_cockpit_azure.messaging import MessagingFactory
+from life_cockpit_azure.message_processor import MessageProcessor
 
 async def test_messaging_factory():
     """Test the messaging factory directly"""
@@ -60,23 +60,27 @@ async def test_messaging_factory():
     
     print(f"📨 Testing {len(test_messages)} message types...")
     
-    results = []
-    for message in test_messages:
+    # Independent sends: run them concurrently, results come back in message order
+    results = await asyncio.gather(
+        *(factory.send_message(message) for message in test_messages),
+        return_exceptions=True,
+    )
+    
+    for message, result in zip(test_messages, results):
         print(f"\n🔍 Processing {message['message_type']} message...")
-        result = await factory.send_message(message)
-        
-        if result.success:
+        if isinstance(result, Exception):
+            print(f"❌ {message['message_type'].upper()}: Failed!")
+            print(f"   Error: {result}")
+        elif result.success:
             print(f"✅ {message['message_type'].upper()}: Success!")
             print(f"   Provider: {result.provider}")
             print(f"   External ID: {result.external_id}")
         else:
             print(f"❌ {message['message_type'].upper()}: Failed!")
             print(f"   Error: {result.error_message}")
-        
-        results.append(result)
     
     # Summary
-    success_count = len([r for r in results if r.success])
+    success_count = len([r for r in results if not isinstance(r, Exception) and r.success])
     print(f"\n📊 Summary: {success_count}/{len(results)} messages sent successfully")
     
     # Show supported message types
@@ -124,11 +128,17 @@ async def test_message_processor():
             print(f"❌ {message['message_type'].upper()}: Failed!")
             print(f"   Error: {result.error_message}")
 
+async def _main():
+    """Run both tests in order on one event loop"""
+    await test_messaging_factory()
+    await test_message_processor()
+
 if __name__ == "__main__":
+    from utils.aio import run
+    
     print("🚀 Multi-Channel Messaging Factory Test")
     print("=" * 50)
     
-    asyncio.run(test_messaging_factory())
-    asyncio.run(test_message_processor())
+    run(_main())
     
     print("\n�� Test completed!")
@@ -1,9 +1,15 @@
 """Tests for authentication modules."""
 
+import asyncio
+import json
+import time
+
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from auth.graph import GraphAuthManager
 from auth.dataverse import DataverseAuthManager
+from azure.core.credentials import AccessToken
+import dataverse.auth as dv_auth
 
 
 class TestGraphAuthManager:
@@ -24,6 +30,16 @@ class TestGraphAuthManager:
         credential = manager._create_credential()
         assert credential is not None
         mock_credential.assert_called_once()
+    
+    async def test_ensure_connected_coalesces_probes(self):
+        """Concurrent ensure_connected() calls share one connection probe."""
+        manager = GraphAuthManager()
+        manager.test_connection = AsyncMock(return_value=True)
+        
+        results = await asyncio.gather(*(manager.ensure_connected() for _ in range(5)))
+        assert results == [True] * 5
+        assert await manager.ensure_connected() is True
+        manager.test_connection.assert_awaited_once()
 
 
 class TestDataverseAuthManager:
@@ -44,3 +60,122 @@ class TestDataverseAuthManager:
         credential = manager._create_credential()
         assert credential is not None
         mock_credential.assert_called_once()
+    
+    @patch('dataverse.auth.ClientSecretCredential')
+    async def test_get_token_uses_shared_dataverse_token(self, mock_credential, monkeypatch):
+        """Managers share dataverse.auth's token; concurrent refreshes make one credential call."""
+        monkeypatch.setattr(dv_auth, '_cred', None)
+        monkeypatch.setattr(dv_auth, '_token', None)
+        get_token = mock_credential.return_value.get_token
+        get_token.return_value = AccessToken("fresh", int(time.time()) + 3600)
+        
+        tokens = await asyncio.gather(*(DataverseAuthManager().get_token() for _ in range(3)))
+        assert tokens == ["fresh"] * 3
+        assert dv_auth.dv_token() == "fresh"
+        get_token.assert_called_once()
+    
+    @patch('auth.dataverse._get_http_client')
+    async def test_iter_entity_definitions_follows_next_link(self, mock_get_client):
+        """Entity definitions are yielded across @odata.nextLink pages."""
+        pages = [
+            {'value': [{'LogicalName': 'account'}, {'LogicalName': '_system'}],
+             '@odata.nextLink': 'https://example.invalid/next'},
+            {'value': [{'LogicalName': 'new_thing', 'IsCustomEntity': True}]},
+        ]
+        client = mock_get_client.return_value
+        client.get = AsyncMock(side_effect=[Mock(status_code=200, content=json.dumps(p).encode()) for p in pages])
+        
+        manager = DataverseAuthManager()
+        manager.get_token = AsyncMock(return_value="token")
+        tables = [t async for t in manager.iter_entity_definitions()]
+        
+        assert [t.name for t in tables] == ['account', 'new_thing']
+        assert tables[1].entity_type == 'Custom'
+        assert client.get.await_count == 2
+    
+    @patch('auth.dataverse._get_http_client')
+    async def test_entity_definitions_revalidated_with_etag(self, mock_get_client, monkeypatch, tmp_path):
+        """A single-page listing is cached on disk and reused on 304 Not Modified."""
+        import auth.dataverse as auth_dv
+        monkeypatch.setattr(auth_dv, 'ENTITY_DEFINITIONS_CACHE_FILE', tmp_path / 'entitydefs.json')
+        page = {'value': [{'LogicalName': 'account'}]}
+        client = mock_get_client.return_value
+        client.get = AsyncMock(side_effect=[
+            Mock(status_code=200, content=json.dumps(page).encode(), headers={'ETag': 'W/"1"'}),
+            Mock(status_code=304, headers={}),
+        ])
+        
+        manager = DataverseAuthManager()
+        manager.get_token = AsyncMock(return_value="token")
+        first = [t async for t in manager.iter_entity_definitions()]
+        second = [t async for t in manager.iter_entity_definitions()]
+        
+        assert first == second and first[0].name == 'account'
+        assert client.get.await_args.kwargs['headers']['If-None-Match'] == 'W/"1"'
+
+    async def test_entity_definitions_memo_expires(self, monkeypatch):
+        """Memoized listings are reused inside the TTL, refetched after it and dropped on refresh."""
+        import auth.dataverse as auth_dv
+        from dataverse.dev import clear_metadata_cache
+        monkeypatch.setattr(auth_dv, '_entity_definitions', {})
+        monkeypatch.setattr('dataverse.dev.clear_schema_cache', lambda: None)
+        monkeypatch.setattr('dataverse.dev._save_entity_cache', lambda: None)
+        monkeypatch.setattr('dataverse.dev._entity_cache', None)
+        now = [100.0]
+        monkeypatch.setattr(auth_dv.time, 'monotonic', lambda: now[0])
+        fetches = []
+
+        async def fake_iter(self, impersonate_user_id=None):
+            fetches.append(impersonate_user_id)
+            yield auth_dv.TableSummary('account', 'Account', '', 'Standard')
+
+        monkeypatch.setattr(DataverseAuthManager, 'iter_entity_definitions', fake_iter)
+        manager = DataverseAuthManager()
+        monkeypatch.setattr(manager, 'get_dataverse_url', lambda: 'https://org.example')
+        await manager.get_entity_definitions()
+        await manager.get_entity_definitions()
+        assert len(fetches) == 1
+        now[0] += auth_dv.SCHEMA_TTL_S
+        await manager.get_entity_definitions()
+        assert len(fetches) == 2
+        clear_metadata_cache()
+        await manager.get_entity_definitions()
+        assert len(fetches) == 3
+
+    async def test_entity_definitions_request_compressed_responses(self, monkeypatch, tmp_path):
+        """Per-request headers keep httpx's Accept-Encoding, so the listing comes back compressed."""
+        import httpx
+        import auth.dataverse as auth_dv
+        monkeypatch.setattr(auth_dv, 'ENTITY_DEFINITIONS_CACHE_FILE', tmp_path / 'entitydefs.json')
+        seen = []
+        
+        def handler(request):
+            seen.append(request.headers.get('Accept-Encoding', ''))
+            return httpx.Response(200, json={'value': []})
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(auth_dv, '_get_http_client', lambda: client)
+        manager = DataverseAuthManager()
+        manager.get_token = AsyncMock(return_value="token")
+        assert [t async for t in manager.iter_entity_definitions()] == []
+        assert 'gzip' in seen[0]
+
+
+class TestDvToken:
+    """Test dataverse.auth.dv_token caching."""
+    
+    @patch('dataverse.auth.ClientSecretCredential')
+    def test_token_reused_until_refresh_margin(self, mock_credential, monkeypatch):
+        """One credential and one token exchange serve repeated calls until near expiry."""
+        monkeypatch.setattr(dv_auth, '_cred', None)
+        monkeypatch.setattr(dv_auth, '_token', None)
+        get_token = mock_credential.return_value.get_token
+        get_token.return_value = AccessToken("fresh", int(time.time()) + 3600)
+        
+        assert dv_auth.dv_token() == dv_auth.dv_token() == "fresh"
+        mock_credential.assert_called_once()
+        get_token.assert_called_once()
+        
+        get_token.return_value = AccessToken("renewed", int(time.time()) + 3600)
+        monkeypatch.setattr(dv_auth, '_token', AccessToken("stale", int(time.time()) + 60))
+        assert dv_auth.dv_token() == "renewed"
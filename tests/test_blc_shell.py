@@ -0,0 +1,46 @@
+"""Tests for the blc entry point and interactive shell."""
+
+import importlib
+import sys
+
+import blc
+
+
+class TestShell:
+    """Test blc.shell dispatch."""
+
+    def test_runs_commands_until_exit(self, monkeypatch, capsys):
+        """Each line is dispatched in-process; errors don't end the session."""
+        lines = iter(["", "version", "no-such-command", "'unclosed", "quit", "version"])
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(lines))
+
+        blc.shell()
+
+        out = capsys.readouterr()
+        assert out.out.count("Life Cockpit v") == 1
+        assert "No such command" in out.err
+        assert "Error:" in out.out
+        assert next(lines) == "version"  # stopped at quit
+
+    def test_eof_ends_session(self, monkeypatch):
+        """Ctrl-D leaves the shell."""
+        def eof(prompt=""):
+            raise EOFError
+        monkeypatch.setattr("builtins.input", eof)
+        blc.shell()
+
+
+class TestVersionProbe:
+    """Test the `version` fast path."""
+
+    def test_import_under_version_argv_does_not_exit(self, monkeypatch):
+        """Only a __main__ run takes the import-time fast path."""
+        monkeypatch.setattr(sys, "argv", ["tool", "version"])
+        importlib.reload(blc)
+
+    def test_entry_point_prints_shared_version(self, monkeypatch, capsys):
+        """main() answers `version` with the same value the rich command uses."""
+        monkeypatch.setenv("APP_VERSION", "9.9.9")
+        monkeypatch.setattr(sys, "argv", ["blc", "--version"])
+        blc.main()
+        assert capsys.readouterr().out == "Life Cockpit v9.9.9\n"
@@ -0,0 +1,133 @@
+"""Tests for the Dataverse $batch helpers (no network)."""
+
+import pytest
+
+from dataverse.batch import _entity_id, batch_body, parse_batch_response
+
+
+BATCH_RESPONSE = (
+    b"--batchresponse_1\r\n"
+    b"Content-Type: multipart/mixed; boundary=changesetresponse_2\r\n\r\n"
+    b"--changesetresponse_2\r\n"
+    b"Content-Type: application/http\r\nContent-Transfer-Encoding: binary\r\nContent-ID: 1\r\n\r\n"
+    b"HTTP/1.1 204 No Content\r\nOData-EntityId: https://org.example/api/data/v9.2/accounts(aaaa-1)\r\n\r\n\r\n"
+    b"--changesetresponse_2\r\n"
+    b"Content-Type: application/http\r\nContent-Transfer-Encoding: binary\r\nContent-ID: 2\r\n\r\n"
+    b"HTTP/1.1 204 No Content\r\nOData-EntityId: https://org.example/api/data/v9.2/accounts(bbbb-2)\r\n\r\n\r\n"
+    b"--changesetresponse_2--\r\n"
+    b"--batchresponse_1--\r\n"
+)
+
+
+def test_batch_body_has_one_part_per_record(monkeypatch):
+    """Consecutive writes share a single changeset."""
+    monkeypatch.setenv("DATAVERSE_URL", "https://org.example/")
+    boundary, body = batch_body([("POST", "accounts", {"name": "a"}), ("POST", "accounts", {"name": "b"})])
+
+    assert body.startswith(f"--{boundary}\r\n")
+    assert body.endswith(f"--{boundary}--\r\n")
+    assert body.count("POST https://org.example/api/data/v9.2/accounts HTTP/1.1") == 2
+    assert body.count("boundary=changeset_") == 1
+    assert "Content-ID: 2" in body
+
+
+def test_batch_body_keeps_reads_outside_changesets(monkeypatch):
+    """GETs are standalone parts; writes between them get their own changeset."""
+    monkeypatch.setenv("DATAVERSE_URL", "https://org.example/")
+    _, body = batch_body([
+        ("GET", "accounts?$top=1", None),
+        ("PATCH", "accounts(a-1)", {"name": "x"}),
+        ("GET", "contacts?$top=1", None),
+    ])
+
+    assert body.count("boundary=changeset_") == 1
+    assert body.index("GET https://org.example/api/data/v9.2/accounts?$top=1") < body.index("PATCH")
+    assert body.index("PATCH") < body.index("GET https://org.example/api/data/v9.2/contacts?$top=1")
+
+
+def test_parse_batch_response_extracts_ids():
+    """Changeset responses are split per operation in order."""
+    parts = parse_batch_response("multipart/mixed; boundary=batchresponse_1", BATCH_RESPONSE)
+
+    assert [status for status, _, _ in parts] == [204, 204]
+    assert [_entity_id(headers) for _, headers, _ in parts] == ["aaaa-1", "bbbb-2"]
+
+
+def test_dumps_encodes_naive_datetimes_as_utc(monkeypatch):
+    """Naive datetimes serialize as UTC 'Z' strings with or without orjson."""
+    from datetime import datetime
+
+    import dataverse._json as dv_json
+
+    payload = {"sent_at": datetime(2025, 1, 2, 3, 4, 5)}
+    expected = '"2025-01-02T03:04:05Z"'
+    assert expected in dv_json.dumps(payload)
+    monkeypatch.setattr(dv_json, "orjson", None)
+    assert expected in dv_json.dumps(payload)
+
+
+async def test_batch_create_records_posts_one_changeset(monkeypatch):
+    """Creates go out as one $batch POST and return the new record ids."""
+    import httpx
+
+    import dataverse.client as client_module
+    from dataverse.batch import batch_create_records
+
+    monkeypatch.setenv("DATAVERSE_URL", "https://org.example/")
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return httpx.Response(200, content=BATCH_RESPONSE,
+                              headers={"Content-Type": "multipart/mixed; boundary=batchresponse_1"})
+
+    client = httpx.AsyncClient(base_url="https://org.example/api/data/v9.2", transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(client_module, "_pools", {})
+    monkeypatch.setattr(client_module, "dv_client", lambda impersonate_user_id=None: client)
+
+    created = await batch_create_records("accounts", [{"name": "a"}, {"name": "b"}])
+    assert created == [{"id": "aaaa-1"}, {"id": "bbbb-2"}]
+    assert seen == ["/api/data/v9.2/$batch"]
+
+
+async def test_create_changeset_retried_only_when_not_committed(monkeypatch):
+    """A create $batch is retried after a 429 but not after a 503, which may follow a commit."""
+    import httpx
+
+    import dataverse.client as client_module
+    import dataverse.retry as retry
+    from dataverse.batch import batch_create_records
+
+    monkeypatch.setenv("DATAVERSE_URL", "https://org.example/")
+    monkeypatch.setattr(retry.asyncio, "sleep", _no_sleep)
+    statuses = [429, 503]
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request.url.path)
+        return httpx.Response(statuses.pop(0))
+
+    client = httpx.AsyncClient(base_url="https://org.example/api/data/v9.2", transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(client_module, "_pools", {})
+    monkeypatch.setattr(client_module, "dv_client", lambda impersonate_user_id=None: client)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await batch_create_records("accounts", [{"name": "a"}])
+    assert len(sent) == 2
+
+
+async def _no_sleep(seconds):
+    return None
+
+
+def test_dumps_encodes_dataclasses(monkeypatch):
+    """Dataclass rows (e.g. ClientRow) serialize as objects with or without orjson."""
+    import json
+
+    import dataverse._json as dv_json
+    from dataverse.operations import ClientRow
+
+    row = ClientRow(id="a-1", type="account", name="Alpha")
+    assert json.loads(dv_json.dumps([row]))[0]["name"] == "Alpha"
+    monkeypatch.setattr(dv_json, "orjson", None)
+    assert json.loads(dv_json.dumps([row]))[0]["name"] == "Alpha"
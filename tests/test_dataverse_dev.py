@@ -23,40 +23,40 @@ def _load_env_once():
     load_config()
 
 
-def test_whoami():
+async def test_whoami():
     """Test WhoAmI operation"""
-    result = whoami()
+    result = await whoami()
     assert result is not None
     assert 'UserId' in result
     assert 'BusinessUnitId' in result
     assert 'OrganizationId' in result
 
 
-def test_entity_def_and_set():
+async def test_entity_def_and_set():
     """Test entity definition retrieval and caching via entity_set"""
-    result = entity_def("account")
+    result = await entity_def("account")
     assert result.get('EntitySetName') == 'accounts'
     assert result.get('PrimaryIdAttribute') == 'accountid'
 
     t0 = time.time()
-    s1 = entity_set("contact")  # first call, likely API hit
+    s1 = await entity_set("contact")  # first call, likely API hit
     t1 = time.time() - t0
-    s2 = entity_set("contact")  # cached
+    s2 = await entity_set("contact")  # cached
     t2 = time.time() - t0
     assert s1 == 'contacts' and s2 == 'contacts'
     assert t2 >= 0
 
 
-def test_query_accounts():
+async def test_query_accounts():
     """Test basic query (non-failing even if empty)"""
-    result = query("accounts", top=3)
+    result = await query("accounts", top=3)
     assert result is not None
     assert 'value' in result
 
 
-def test_probe():
+async def test_probe():
     """Test connection probe"""
-    results = probe()
+    results = await probe()
     assert results is not None
     assert 'token' in results
     assert 'whoami' in results
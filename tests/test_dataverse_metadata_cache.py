@@ -0,0 +1,153 @@
+"""Tests for the Dataverse dev-layer metadata caches (no network)."""
+
+import json
+
+import dataverse.dev as dev
+
+
+async def test_entity_set_persists_and_reloads(monkeypatch, tmp_path):
+    """Entity sets resolved once are served from the on-disk cache afterwards."""
+    monkeypatch.setenv("DATAVERSE_URL", "https://org.example/")
+    cache_file = tmp_path / "entity_sets.json"
+    monkeypatch.setattr(dev, "ENTITY_SET_CACHE_FILE", cache_file)
+    monkeypatch.setattr(dev, "_entity_cache", None)
+    calls = []
+
+    async def fake_entity_def(logical_name):
+        calls.append(logical_name)
+        return {"EntitySetName": f"{logical_name}s"}
+
+    monkeypatch.setattr(dev, "entity_def", fake_entity_def)
+
+    assert await dev.entity_set("account") == "accounts"
+    assert json.loads(cache_file.read_text()) == {"https://org.example": {"account": "accounts"}}
+
+    monkeypatch.setattr(dev, "_entity_cache", None)  # simulate a new process
+    assert await dev.entity_set("account") == "accounts"
+    assert calls == ["account"]
+
+
+async def test_ttl_cache_expires(monkeypatch):
+    """Results are reused inside the TTL and refetched after it."""
+    now = [100.0]
+    monkeypatch.setattr(dev.time, "monotonic", lambda: now[0])
+    calls = []
+
+    @dev._ttl_cache(10)
+    async def lookup(key):
+        calls.append(key)
+        return key
+
+    await lookup("a")
+    await lookup("a")
+    now[0] += 11
+    await lookup("a")
+    assert calls == ["a", "a"]
+
+
+async def test_warmup_resolves_missing_sets_in_one_request(monkeypatch, tmp_path):
+    """Only uncached names are requested, all in a single $filter."""
+    import httpx
+
+    import dataverse.client as client_module
+
+    monkeypatch.setenv("DATAVERSE_URL", "https://org.example/")
+    monkeypatch.setattr(dev, "ENTITY_SET_CACHE_FILE", tmp_path / "entity_sets.json")
+    monkeypatch.setattr(dev, "_entity_cache", {"account": "accounts"})
+    filters = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        filters.append(request.url.params["$filter"])
+        return httpx.Response(200, json={"value": [
+            {"LogicalName": "contact", "EntitySetName": "contacts"},
+            {"LogicalName": "annotation", "EntitySetName": "annotations"},
+        ]})
+
+    client = httpx.AsyncClient(base_url="https://org.example/api/data/v9.2", transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(client_module, "_pools", {})
+    monkeypatch.setattr(client_module, "dv_client", lambda impersonate_user_id=None: client)
+
+    await dev.warmup_entity_sets(["account", "contact", "annotation"])
+    await dev.warmup_entity_sets(["account", "contact", "annotation"])
+    assert filters == ["LogicalName eq 'annotation' or LogicalName eq 'contact'"]
+    assert await dev.entity_set("contact") == "contacts"
+
+    await dev.warmup_entity_sets(["o'typo"])
+    await dev.warmup_entity_sets(["o'typo"])
+    assert filters[1:] == ["LogicalName eq 'o''typo'"]
+
+
+async def test_table_schema_served_stale_while_revalidating(monkeypatch, tmp_path):
+    """Fresh hits skip the fetch; stale hits return at once and refresh in the background."""
+    import asyncio
+
+    import dataverse.client as client_module
+
+    monkeypatch.setenv("DATAVERSE_URL", "https://org.example/")
+    cache_file = tmp_path / "dataverse_schema.json"
+    monkeypatch.setattr(client_module, "SCHEMA_CACHE_FILE", cache_file)
+    monkeypatch.setattr(client_module, "_schema_cache", None)
+    now = [1000.0]
+    monkeypatch.setattr(client_module.time, "time", lambda: now[0])
+    calls = []
+
+    class FakeClient:
+        @client_module._stale_while_revalidate
+        async def get_table_schema(self, table_name):
+            calls.append(table_name)
+            return {"name": table_name, "version": len(calls)}
+
+    client = FakeClient()
+    assert (await client.get_table_schema("account"))["version"] == 1
+    assert (await client.get_table_schema("account"))["version"] == 1
+    assert calls == ["account"]
+
+    now[0] += client_module.SCHEMA_TTL_S + 1
+    assert (await client.get_table_schema("account"))["version"] == 1  # stale, refresh scheduled
+    await asyncio.sleep(0)
+    assert calls == ["account", "account"]
+    assert (await client.get_table_schema("account"))["version"] == 2
+
+    monkeypatch.setattr(client_module, "_schema_cache", None)  # simulate a new process
+    assert (await client.get_table_schema("account"))["version"] == 2
+    assert json.loads(cache_file.read_text())
+
+    now[0] += client_module.SCHEMA_TTL_S + client_module.SCHEMA_GRACE_S
+    assert (await client.get_table_schema("account"))["version"] == 3  # hard-expired, fetched inline
+
+
+async def test_pending_schema_refresh_drained_at_shutdown(monkeypatch, tmp_path):
+    """A refresh scheduled by a stale hit is awaited by the shutdown hook instead of being dropped."""
+    import asyncio
+
+    import dataverse.client as client_module
+
+    monkeypatch.setenv("DATAVERSE_URL", "https://org.example/")
+    monkeypatch.setattr(client_module, "SCHEMA_CACHE_FILE", tmp_path / "dataverse_schema.json")
+    monkeypatch.setattr(client_module, "_schema_cache", None)
+    monkeypatch.setattr(client_module, "_refresh_drain_registered", False)
+    hooks = []
+    monkeypatch.setattr("utils.aio.on_shutdown", hooks.append)
+    monkeypatch.setattr(client_module, "get_dv_client", lambda: None)
+    now = [1000.0]
+    monkeypatch.setattr(client_module.time, "time", lambda: now[0])
+
+    class FakeClient:
+        version = 0
+
+        @client_module._stale_while_revalidate
+        async def get_table_schema(self, table_name):
+            await asyncio.sleep(0.01)
+            self.version += 1
+            return {"version": self.version}
+
+    client = FakeClient()
+    await client.get_table_schema("account")
+    now[0] += client_module.SCHEMA_TTL_S + 1
+    assert (await client.get_table_schema("account"))["version"] == 1
+    assert hooks == [client_module.drain_schema_refreshes]
+
+    await hooks[0]()
+    assert not client_module._schema_refreshes
+    assert json.loads((tmp_path / "dataverse_schema.json").read_text())
+    assert (await client.get_table_schema("account"))["version"] == 2
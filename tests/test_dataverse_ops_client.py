@@ -0,0 +1,347 @@
+"""Tests for dataverse.operations against a mocked Dataverse Web API (no network)."""
+
+import json
+
+import httpx
+import pytest
+
+import dataverse._client as dv_client_module
+import dataverse.client as client_module
+from dataverse.client import DataverseClient
+from dataverse.operations import (
+    CLIENT_STATS_QUERIES,
+    MESSAGE_STATS_QUERIES,
+    SESSION_STATS_QUERIES,
+    ClientRow,
+    DataverseOperations,
+    get_operations,
+)
+
+
+def _batch_handler(request: httpx.Request, handler=None) -> httpx.Response:
+    """Answer each GET part of a $batch request through handler (default _handler)."""
+    parts = []
+    for line in request.content.decode().split("\r\n"):
+        if line.startswith("GET "):
+            response = (handler or _handler)(httpx.Request("GET", line.split()[1]))
+            parts.append(
+                "--batchresponse_1\r\nContent-Type: application/http\r\n"
+                "Content-Transfer-Encoding: binary\r\n\r\n"
+                f"HTTP/1.1 {response.status_code} OK\r\nContent-Type: application/json\r\n\r\n"
+                f"{response.text}\r\n"
+            )
+    body = "".join(parts) + "--batchresponse_1--\r\n"
+    return httpx.Response(200, content=body.encode(),
+                          headers={"Content-Type": "multipart/mixed; boundary=batchresponse_1"})
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    """Minimal Dataverse Web API stand-in."""
+    path, params = request.url.path, dict(request.url.params)
+    if path.endswith("/$batch"):
+        return _batch_handler(request)
+    if "EntityDefinitions" in path:
+        logical_name = path.split("'")[1]
+        return httpx.Response(200, json={"EntitySetName": f"{logical_name}s"})
+    if "groupby" in params.get("$apply", ""):
+        return httpx.Response(200, json={"value": [{"statuscode": 1, "count": 3}, {"statuscode": 2, "count": 4}]})
+    if "$apply" in params:
+        return httpx.Response(200, json={"value": [{"count": 9}]})
+    if path.endswith(")"):
+        return httpx.Response(404, json={})
+    return httpx.Response(200, json={"value": [
+        {"accountid": "a-1", "name": "Alpha", "contactid": "c-1", "firstname": "Ada", "lastname": "Lovelace"},
+        {"accountid": "a-2", "name": "Beta", "contactid": "c-2", "firstname": "Alan", "lastname": "Turing"},
+    ]})
+
+
+@pytest.fixture(autouse=True)
+def _schema_cache(monkeypatch, tmp_path):
+    """Keep table metadata caching off the real ~/.cache."""
+    monkeypatch.setattr(client_module, "SCHEMA_CACHE_FILE", tmp_path / "dataverse_schema.json")
+    monkeypatch.setattr(client_module, "_schema_cache", None)
+
+
+@pytest.fixture
+def make_ops(monkeypatch):
+    """Factory for DataverseOperations wired to a mock transport that answers with handler."""
+    def factory(handler=_handler) -> DataverseOperations:
+        monkeypatch.setenv("DATAVERSE_URL", "https://org.example")
+        client = httpx.AsyncClient(base_url="https://org.example/api/data/v9.2", transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(dv_client_module, "_client", client)
+        operations = DataverseOperations()
+        operations.client = DataverseClient()
+        return operations
+    return factory
+
+
+@pytest.fixture
+def ops(make_ops):
+    """DataverseOperations wired to the default mock Web API."""
+    return make_ops()
+
+
+async def test_table_count_uses_aggregate(ops):
+    """Row counts come from a server-side $apply aggregate."""
+    assert await ops.get_table_count("account") == 9
+
+
+async def test_client_statistics(ops):
+    """Status breakdowns are summed into totals."""
+    stats = await ops.get_client_statistics()
+    assert stats["total_accounts"] == 7
+    assert stats["total_clients"] == 14
+    assert stats["account_statuses"] == {1: 3, 2: 4}
+
+
+async def test_list_clients_applies_offset(ops):
+    """Offset rows are dropped client-side from each table."""
+    clients = await ops.list_clients(limit=1, offset=1)
+    assert [(c.type, c.id) for c in clients] == [("account", "a-2"), ("contact", "c-2")]
+
+
+async def test_missing_client_details_returns_none(ops):
+    """A 404 from both tables means no client."""
+    assert await ops.get_client_details("00000000-0000-0000-0000-000000000000") is None
+
+
+async def test_search_binds_term_as_alias(make_ops):
+    """Both tables are searched in one $batch; the term goes into a quoted @term alias, never into $filter."""
+    filters, terms, batches = [], [], []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/$batch"):
+            batches.append(request)
+            return _batch_handler(request, handler)
+        if "EntityDefinitions" in request.url.path:
+            return _handler(request)
+        filters.append(request.url.params["$filter"])
+        terms.append(request.url.params["@term"])
+        return httpx.Response(200, json={"value": []})
+
+    operations = make_ops(handler)
+
+    assert await operations.search_clients("O'Brien") == []
+    assert len(batches) == 1
+    assert terms == ["'O''Brien'", "'O''Brien'"]
+    assert all("Brien" not in f and "@term" in f for f in filters)
+
+
+async def test_malformed_record_id_never_reaches_url(ops):
+    """Record ids are parsed as GUIDs before they are put in a URL path."""
+    assert await ops.get_client_details("x)?$select=name") is None
+    with pytest.raises(ValueError):
+        await ops.get_session_details("x)?$select=name")
+
+
+async def test_entity_definition_names_are_quoted(make_ops):
+    """A logical name with a quote is sent as a doubled-quote OData literal, never spliced in raw."""
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        return httpx.Response(200, json={"EntitySetName": "obriens", "Attributes": []})
+
+    dv = make_ops(handler).client
+
+    assert await dv.entity_set("o'brien") == "obriens"
+    await dv.get_table_schema("o'brien")
+    assert paths == ["/api/data/v9.2/EntityDefinitions(LogicalName='o''brien')"] * 2
+
+
+async def test_list_tables_counts_in_chunks_and_marks_failures(make_ops):
+    """Counts come from RetrieveTotalRecordCount, ten tables per call; a failed chunk reads 'unknown'."""
+    names = [f"t{i:02}" for i in range(12)]
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/EntityDefinitions"):
+            return httpx.Response(200, json={"value": [{"LogicalName": n, "EntitySetName": f"{n}s"} for n in names]})
+        requested = json.loads(request.url.params["@p1"])
+        calls.append(requested)
+        if "t11" in requested:
+            return httpx.Response(500, json={})
+        return httpx.Response(200, json={"EntityRecordCountCollection": {
+            "Count": len(requested), "Keys": requested, "Values": [5] * len(requested),
+        }})
+
+    operations = make_ops(handler)
+
+    tables = await operations.list_tables(include_counts=True)
+    assert sorted(len(c) for c in calls) == [2, 10]
+    assert [t["row_count"] for t in tables] == [5] * 10 + ["unknown"] * 2
+
+    calls.clear()
+    tables = await operations.list_tables()
+    assert calls == []
+    assert {t["row_count"] for t in tables} == {None}
+
+
+async def test_all_statistics_share_one_batch(ops, monkeypatch):
+    """All six statistics queries go out in one execute_batch call."""
+    calls = []
+
+    async def fake_batch(queries):
+        calls.append(queries)
+        rows = []
+        for _, params in queries:
+            attr = params["$apply"].partition("groupby((")[2].partition(")")[0]
+            rows.append([{attr: "success", "count": 2}] if attr else [{"count": 9}])
+        return rows
+
+    monkeypatch.setattr(ops.client, "execute_batch", fake_batch)
+    stats = await ops.get_all_statistics()
+
+    assert len(calls) == 1 and len(calls[0]) == 6
+    assert stats["clients"]["total_clients"] == 4
+    assert stats["sessions"] == {"total_sessions": 2, "status_breakdown": {"success": 2}, "recent_sessions": 9}
+    assert stats["messages"]["total_scheduled"] == 2
+    assert stats["messages"]["total_sent"] == 2
+
+
+async def test_iter_sessions_pages_by_keyset(ops, monkeypatch):
+    """Each page after the first filters past the last row instead of re-reading it."""
+    rows = [{"appointmentid": f"g-{i}", "starttime": f"2024-01-0{9 - i}T00:00:00Z"} for i in range(5)]
+    queries = []
+
+    async def fake_query(table, params):
+        queries.append(params)
+        start = 2 * (len(queries) - 1)
+        return rows[start:start + params["$top"]]
+
+    monkeypatch.setattr(ops.client, "execute_query", fake_query)
+    pages = [page async for page in ops.iter_sessions(page_size=2)]
+
+    assert [len(p) for p in pages] == [2, 2, 1]
+    assert queries[0]["$filter"] == "starttime ne null"
+    assert queries[0]["$orderby"] == "starttime desc,appointmentid desc"
+    assert queries[1]["$filter"] == (
+        "starttime ne null and (starttime lt 2024-01-08T00:00:00Z or "
+        "(starttime eq 2024-01-08T00:00:00Z and appointmentid lt g-1))"
+    )
+    assert all("$skip" not in q for q in queries)
+
+
+async def test_search_uses_dataverse_search_when_enabled(make_ops, monkeypatch):
+    """With DATAVERSE_SEARCH_ENABLED both tables are searched in one indexed query."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"value": [
+            {"@search.entityname": "contact", "@search.objectid": "c-1", "firstname": "Ada", "lastname": "Lovelace"},
+            {"@search.entityname": "account", "@search.objectid": "a-1", "name": "Alpha"},
+        ]})
+
+    monkeypatch.setenv("DATAVERSE_SEARCH_ENABLED", "true")
+    operations = make_ops(handler)
+
+    results = await operations.search_clients("a", limit=5)
+    assert [(c.type, c.id, c.name) for c in results] == [("contact", "c-1", "Ada Lovelace"), ("account", "a-1", "Alpha")]
+    assert [str(r.url) for r in requests] == ["https://org.example/api/search/v1.0/query"]
+    assert json.loads(requests[0].content) == {"search": "a", "entities": ["account", "contact"], "top": 5}
+
+
+async def test_stream_sessions_yields_rows_across_pages(ops, monkeypatch):
+    """Rows come out one at a time across keyset pages."""
+    rows = [{"appointmentid": f"g-{i}", "starttime": f"2024-01-0{9 - i}T00:00:00Z"} for i in range(5)]
+    calls = []
+
+    async def fake_query(table, params):
+        calls.append(params)
+        start = 2 * (len(calls) - 1)
+        return rows[start:start + params["$top"]]
+
+    monkeypatch.setattr(ops.client, "execute_query", fake_query)
+    assert [r async for r in ops.stream_sessions(page_size=2)] == rows
+    assert len(calls) == 3
+
+
+def test_statistics_group_counts_server_side():
+    """Every per-status breakdown is an OData groupby aggregate; no rows are fetched to count."""
+    queries = CLIENT_STATS_QUERIES + SESSION_STATS_QUERIES + MESSAGE_STATS_QUERIES
+    assert all(set(params) == {"$apply"} for _, params in queries)
+    assert [(table, params["$apply"]) for table, params in queries if "groupby" in params["$apply"]] == [
+        ("account", "groupby((statuscode),aggregate($count as count))"),
+        ("contact", "groupby((statuscode),aggregate($count as count))"),
+        ("appointment", "groupby((statuscode),aggregate($count as count))"),
+        ("cre92_scheduledmessage", "groupby((MessageStatus),aggregate($count as count))"),
+        ("messages_log", "groupby((status),aggregate($count as count))"),
+    ]
+
+
+def test_get_operations_is_lazy_and_shared(monkeypatch):
+    """The shared instance is built on first call, not at import, and then reused."""
+    get_operations.cache_clear()
+    monkeypatch.setattr(client_module, "_dataverse_client", None)
+    assert client_module._dataverse_client is None
+    assert get_operations() is get_operations()
+    get_operations.cache_clear()
+
+
+async def test_queries_share_one_keepalive_client(make_ops, monkeypatch, tmp_path):
+    """DataverseClient queries and DataverseAuthManager calls all go through the one shared client."""
+    from unittest.mock import AsyncMock
+
+    import auth.dataverse as auth_dv
+
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path.endswith("/EntityDefinitions"):
+            return httpx.Response(200, json={"value": [{"LogicalName": "account", "IsCustomEntity": False}]})
+        return _handler(request)
+
+    dv = make_ops(handler).client
+    monkeypatch.setattr(auth_dv, "ENTITY_DEFINITIONS_CACHE_FILE", tmp_path / "entitydefs.json")
+    monkeypatch.setattr(auth_dv, "_entity_definitions", {})
+    manager = auth_dv.DataverseAuthManager()
+    monkeypatch.setattr(manager, "get_dataverse_url", lambda: "https://org.example")
+    monkeypatch.setattr(manager, "get_token", AsyncMock(return_value="token"))
+
+    assert auth_dv._get_http_client() is dv_client_module.get_dv_client()
+    await dv.execute_query("account", {"$top": 1})
+    assert [t.name for t in await manager.get_entity_definitions()] == ["account"]
+    assert seen == [
+        "/api/data/v9.2/EntityDefinitions(LogicalName='account')",
+        "/api/data/v9.2/accounts",
+        "/api/data/v9.2/EntityDefinitions",
+    ]
+
+
+async def test_client_details_remembers_which_table_an_id_is_in(ops, monkeypatch):
+    """After an auto lookup finds a contact, the next lookup only queries contact."""
+    tables = []
+
+    async def fake_get_record(table_name, record_id, select=None):
+        tables.append(table_name)
+        return {"contactid": record_id} if table_name == "contact" else None
+
+    monkeypatch.setattr(ops.client, "get_record", fake_get_record)
+    client_id = "11111111-1111-1111-1111-111111111111"
+    assert (await ops.get_client_details(client_id))["type"] == "contact"
+    assert (await ops.get_client_details(client_id.upper()))["type"] == "contact"
+    assert sorted(tables[:2]) == ["account", "contact"] and tables[2:] == ["contact"]
+
+
+async def test_search_filter_text_is_the_same_for_every_term(ops, monkeypatch):
+    """Only the @term alias varies between searches, so the server sees one query shape."""
+    sent = []
+
+    async def fake_batch(queries, aliases=None):
+        sent.append(([params["$filter"] for _, params in queries], aliases))
+        return [[], []]
+
+    monkeypatch.setattr(ops.client, "execute_batch", fake_batch)
+    await ops.search_clients("alice")
+    await ops.search_clients("bob")
+    assert sent[0][0] == sent[1][0]
+    assert [aliases for _, aliases in sent] == [{"term": "alice"}, {"term": "bob"}]
+
+
+def test_client_rows_tolerate_missing_columns():
+    """Rows without some selected columns (e.g. Dataverse Search hits) still map; absent values are None."""
+    row = ClientRow.from_contact({"contactid": "c-1", "lastname": "Hopper"})
+    assert row == ClientRow(id="c-1", type="contact", name="Hopper")
+    assert ClientRow.from_account({"accountid": "a-1"}).name == ""
@@ -0,0 +1,30 @@
+"""Tests for the per-impersonation DVPool in dataverse.client."""
+
+import asyncio
+
+import dataverse.client as client_module
+from dataverse.client import DVPool, get_pool
+
+
+async def test_pool_reuses_released_clients_and_caps_size(monkeypatch):
+    """Clients are created lazily up to max_size, then callers wait for a release."""
+    monkeypatch.setenv("DATAVERSE_URL", "https://org.example/")
+    pool = DVPool(max_size=2)
+    assert pool._clients == []
+
+    async with pool.acquire() as first:
+        async with pool.acquire() as second:
+            assert first is not second
+            waiter = asyncio.ensure_future(pool._get())
+            await asyncio.sleep(0)
+            assert not waiter.done()
+        assert await waiter is second
+    assert len(pool._clients) == 2
+    await pool.aclose()
+
+
+async def test_get_pool_is_keyed_by_impersonation(monkeypatch):
+    """One pool per impersonation id on the running loop."""
+    monkeypatch.setattr(client_module, "_pools", {})
+    assert get_pool() is get_pool()
+    assert get_pool("user-1") is not get_pool()
@@ -0,0 +1,33 @@
+"""Tests for the Dataverse client-side token bucket (no network)."""
+
+import dataverse.rate_limit as rate_limit
+from dataverse.rate_limit import TokenBucket
+
+
+async def test_bucket_allows_burst_then_waits_for_refill(monkeypatch):
+    """Up to capacity calls pass at once; the next one sleeps for one token's refill time."""
+    now = [0.0]
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", fake_sleep)
+    bucket = TokenBucket(rate=10.0, capacity=3)
+
+    calls = []
+
+    @bucket
+    async def call(n):
+        calls.append(n)
+        return n
+
+    for n in range(3):
+        assert await call(n) == n
+    assert sleeps == []
+
+    await call(3)
+    assert sleeps == [0.1]
+    assert calls == [0, 1, 2, 3]
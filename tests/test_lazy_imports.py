@@ -0,0 +1,55 @@
+"""Tests for lazy module loading helpers."""
+
+import sys
+from types import ModuleType
+
+import pytest
+
+import utils
+from blc_lazy import lazy_module
+
+
+class TestLazyModule:
+    """Test blc_lazy.lazy_module behaviour."""
+
+    def test_defers_execution_until_attribute_access(self, monkeypatch):
+        """Module body runs only when an attribute is first read."""
+        monkeypatch.delenv("BLC_LAZY_EAGER", raising=False)
+        monkeypatch.delitem(sys.modules, "utils.rollback", raising=False)
+
+        module = lazy_module("utils.rollback")
+        assert type(module) is not ModuleType  # still a lazy placeholder
+
+        assert module.RollbackManager is not None
+        assert type(module) is ModuleType
+        assert sys.modules["utils.rollback"] is module
+
+    def test_eager_mode_imports_immediately(self, monkeypatch):
+        """BLC_LAZY_EAGER=1 falls back to a regular import."""
+        monkeypatch.setenv("BLC_LAZY_EAGER", "1")
+        monkeypatch.delitem(sys.modules, "utils.rollback", raising=False)
+
+        module = lazy_module("utils.rollback")
+        assert "RollbackManager" in module.__dict__
+
+    def test_missing_module_raises(self, monkeypatch):
+        """Unknown modules fail at lookup time, not on first access."""
+        monkeypatch.delenv("BLC_LAZY_EAGER", raising=False)
+        with pytest.raises(ModuleNotFoundError):
+            lazy_module("utils.does_not_exist")
+
+
+class TestUtilsPackageReexports:
+    """Test PEP 562 re-exports on the utils package."""
+
+    def test_resolves_and_caches(self):
+        """Lazy names resolve to the submodule attribute and are cached."""
+        from utils.guardrails import create_run_id
+
+        assert utils.create_run_id is create_run_id
+        assert "create_run_id" in vars(utils)
+
+    def test_unknown_name_raises_attribute_error(self):
+        """Names outside the lazy table raise AttributeError."""
+        with pytest.raises(AttributeError):
+            utils.not_a_real_helper
@@ -0,0 +1,16 @@
+"""Tests that the blc CLI registers each command exactly once."""
+
+import blc
+
+
+class TestCommandRegistration:
+    """Test blc.py command manifest registration."""
+
+    def test_no_duplicate_commands(self):
+        """Registering the manifest (even repeatedly) never duplicates a command."""
+        blc.register_all()
+        blc.register_all()
+
+        names = [info.name for info in blc.app.registered_commands]
+        assert len(set(names)) == len(names)
+        assert set(names) == set(blc.COMMANDS)
@@ -14,8 +14,8 @@ from typing import Dict, Any, List
 # Add the parent directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from azure.dynamics_message_processor import dynamics_message_processor
-from azure.messaging import MessagingFactory
+from life_cockpit_azure.dynamics_message_processor import dynamics_message_processor
+from life_cockpit_azure.messaging import MessagingFactory
 from utils.sandbox import get_sandbox_dataverse
 from utils.logger import get_logger
 
@@ -297,9 +297,9 @@ class ProductionValidationTester:
         try:
             # Check for hardcoded secrets
             code_files = [
-                'azure/dynamics_message_processor.py',
-                'azure/messaging.py',
-                'azure/message_processor.py'
+                'life_cockpit_azure/dynamics_message_processor.py',
+                'life_cockpit_azure/messaging.py',
+                'life_cockpit_azure/message_processor.py'
             ]
             
             for file_path in code_files:
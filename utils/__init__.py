@@ -0,0 +1,49 @@
+"""
+Shared utilities for Life Cockpit.
+
+Commonly used helpers are re-exported lazily (PEP 562): `from utils import
+create_run_id` only imports `utils.guardrails` on first access. Set
+BLC_LAZY_EAGER=1 to resolve everything at import time instead.
+"""
+
+import importlib
+import os
+
+# attribute name -> submodule that defines it
+_LAZY = {
+    # guardrails
+    "Classification": "utils.guardrails",
+    "guardrail_manager": "utils.guardrails",
+    "safe_operation": "utils.guardrails",
+    "create_run_id": "utils.guardrails",
+    "approve_run": "utils.guardrails",
+    "get_run_status": "utils.guardrails",
+    "list_runs": "utils.guardrails",
+    # sandbox
+    "sandbox_manager": "utils.sandbox",
+    "get_sandbox_dataverse": "utils.sandbox",
+    # rollback
+    "get_rollback_manager": "utils.rollback",
+    # templates
+    "discover_templates": "utils.templates",
+    "load_template_by_name": "utils.templates",
+    "render_template": "utils.templates",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # cache so the hook only runs once per name
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+if os.getenv("BLC_LAZY_EAGER", "").lower() in ("1", "true", "yes"):
+    for _name in _LAZY:
+        __getattr__(_name)
@@ -0,0 +1,62 @@
+"""
+Shared asyncio event loop for Life Cockpit commands.
+
+Commands hand their coroutines to `run()` instead of calling `asyncio.run()`, so
+one loop (uvloop when installed) serves the whole process and pooled async
+clients stay usable across calls. Cleanup callbacks registered with
+`on_shutdown()` run on that loop at interpreter exit, before it is closed.
+"""
+
+import asyncio
+import atexit
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_shutdown_callbacks: List[Callable[[], Awaitable[Any]]] = []
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create a uvloop loop if uvloop is installed, else the default asyncio loop."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Get or create the process-wide event loop."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = _new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on the shared loop."""
+    return get_loop().run_until_complete(coro)
+
+
+def on_shutdown(callback: Callable[[], Awaitable[Any]]) -> None:
+    """Register an async cleanup (e.g. `client.aclose`) to run on the shared loop at exit."""
+    _shutdown_callbacks.append(callback)
+
+
+@atexit.register
+def _shutdown() -> None:
+    """Run cleanup callbacks and close the shared loop, if one was created."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        return
+    for callback in reversed(_shutdown_callbacks):
+        try:
+            _loop.run_until_complete(callback())
+        except Exception:
+            pass  # best effort: the process is exiting anyway
+    _shutdown_callbacks.clear()
+    _loop.run_until_complete(_loop.shutdown_asyncgens())
+    _loop.close()
+    _loop = None
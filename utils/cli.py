@@ -0,0 +1,22 @@
+"""
+Shared helpers for command-line front ends.
+
+Used by the top-level `blc.py` commands and by package CLIs such as
+`dataverse.cli`, so neither has to import the other.
+"""
+
+from typing import Iterable, NoReturn
+
+from rich.console import Console
+
+# Shared console for rich output
+console = Console()
+
+
+def unknown_action(action: str, available: Iterable[str], kind: str = "action") -> NoReturn:
+    """Report an unknown action (listing the valid ones) and exit with status 1."""
+    import typer
+    
+    console.print(f"❌ [red]Unknown {kind}: {action}[/red]")
+    console.print(f"Available {kind}s: {', '.join(available)}")
+    raise typer.Exit(1)
@@ -12,6 +12,8 @@ from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
+from utils.version import app_version as _app_version
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -36,7 +38,7 @@ class Settings(BaseSettings):
     
     # Application Configuration
     app_name: str = Field(default="life-cockpit", env="APP_NAME")
-    app_version: str = Field(default="1.0.0", env="APP_VERSION")
+    app_version: str = Field(default_factory=_app_version, env="APP_VERSION")
     
     # Optional: Azure Logic Apps
     logic_apps_workflow_url: Optional[str] = Field(None, env="LOGIC_APPS_WORKFLOW_URL")
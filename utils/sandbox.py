@@ -9,10 +9,25 @@ import json
 import asyncio
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from pathlib import Path
 import structlog
 
 logger = structlog.get_logger()
 
+# Written by `blc.py sandbox enable|disable`
+SANDBOX_ENV_FILE = Path.home() / ".blc" / "sandbox.env"
+
+
+def _sandbox_flag() -> str:
+    """BLC_LOCAL_SANDBOX from the environment, else the persisted sandbox.env value"""
+    value = os.getenv("BLC_LOCAL_SANDBOX")
+    if value is None and SANDBOX_ENV_FILE.exists():
+        for line in SANDBOX_ENV_FILE.read_text().splitlines():
+            key, _, raw = line.partition("=")
+            if key.strip() == "BLC_LOCAL_SANDBOX":
+                value = raw.strip()
+    return value or "false"
+
 class MockDataverse:
     """Mock Dataverse service for local development"""
     
@@ -43,6 +58,10 @@ class MockDataverse:
         logger.info("Created mock record", table=table_name, id=record_id)
         return record
     
+    async def batch_create_records(self, table_name: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create several mock records in one call (mirrors dataverse.batch.batch_create_records)"""
+        return [await self.create_record(table_name, data) for data in records]
+    
     async def query_records(self, table_name: str, filter: str = None, orderby: str = None, top: int = None) -> List[Dict[str, Any]]:
         """Query mock records"""
         records = self.data.get(table_name, [])
@@ -197,7 +216,7 @@ class SandboxManager:
     """Manages local sandbox mode"""
     
     def __init__(self):
-        self.enabled = os.getenv("BLC_LOCAL_SANDBOX", "false").lower() == "true"
+        self.enabled = _sandbox_flag().lower() == "true"
         self.dataverse = MockDataverse()
         self.graph_api = MockGraphAPI()
         self.llm = MockLLM()
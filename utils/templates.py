@@ -14,7 +14,7 @@ from typing import Any, Dict, Optional
 import yaml
 from jinja2 import Environment, FileSystemLoader, StrictUndefined, meta
 
-TEMPLATES_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+TEMPLATES_ROOT = os.path.join(os.path.dirname(__file__), "templates_data")
 
 
 @dataclass
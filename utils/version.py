@@ -0,0 +1,21 @@
+"""
+Life Cockpit version lookup.
+
+One source for every place that reports the version: the `blc version` fast
+path, the rich `version` command and the `app_version` config default.
+Kept free of heavy imports so the fast path stays fast.
+"""
+
+import os
+
+
+def app_version() -> str:
+    """APP_VERSION if set, else the installed package version, else 1.0.0 (uninstalled checkout)."""
+    override = os.getenv("APP_VERSION")
+    if override:
+        return override
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version("life-cockpit")
+    except PackageNotFoundError:
+        return "1.0.0"
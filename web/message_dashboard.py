@@ -23,7 +23,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from azure.messaging import MessagingFactory
+from life_cockpit_azure.messaging import MessagingFactory
 from utils.sandbox import get_sandbox_dataverse
 
 logger = structlog.get_logger()
@@ -276,10 +276,11 @@ async def log_message_sent(message: Dict[str, Any], result) -> None:
 async def update_message_status(message_id: str, status: str, external_id: str = None, error_message: str = None) -> None:
     """Update message status"""
     try:
+        now = datetime.utcnow().isoformat()
         update_data = {
             'status': status,
-            'processed_time': datetime.utcnow().isoformat(),
-            'updated_at': datetime.utcnow().isoformat()
+            'processed_time': now,
+            'updated_at': now
         }
         
         if external_id: